@@ -1,6 +1,7 @@
 from agents.clinical_meta_agent.extraction_agent import run_extraction
 from agents.clinical_meta_agent.summarizer_agent import run_summarization
 from graph.state import AgentState
+from observability.metrics import CLINICAL_SECONDS, CLINICAL_FAILURES, FINDINGS_EXTRACTED
 
 
 def extract_findings(state: AgentState) -> AgentState:
@@ -21,15 +22,21 @@ def extract_findings(state: AgentState) -> AgentState:
         if not metadata:
             raise ValueError("No report metadata found")
         
-        result = run_extraction(metadata)
+        # The text is already in state for fresh ingests; no need to re-read the chunks
+        content = state.get("extracted_text") or None
+        
+        with CLINICAL_SECONDS.time(step="extract"):
+            result = run_extraction(metadata, content=content)
         
         state["findings"] = result.get("findings", [])
         state["values"] = result.get("values", {})
         
+        FINDINGS_EXTRACTED.inc(len(state["findings"]))
         print(f"Extracted {len(state['findings'])} findings")
         state["next_step"] = "summarize"
         
     except Exception as e:
+        CLINICAL_FAILURES.inc(step="extract")
         print(f"Error extracting findings: {e}")
         state["error"] = str(e)
         state["next_step"] = "error"
@@ -52,7 +59,10 @@ def summarize_report(state: AgentState) -> AgentState:
     try:
         patient_id = state.get("patient_id", "pt-1")
         
-        summary_result = run_summarization(patient_id)
+        report_id = (state.get("report_metadata") or {}).get("report_id")
+        
+        with CLINICAL_SECONDS.time(step="summarize"):
+            summary_result = run_summarization(patient_id, report_id=report_id)
         
         state["summary"] = summary_result.get("summary", "")
         state["key_changes"] = summary_result.get("key_changes", "")
@@ -77,6 +87,7 @@ CURRENT VALUES:
         print("Summary generated successfully")
         
     except Exception as e:
+        CLINICAL_FAILURES.inc(step="summarize")
         print(f"Error generating summary: {e}")
         state["error"] = str(e)
         state["next_step"] = "error"
@@ -1,22 +1,157 @@
+import ast
+import json
+from typing import Any, Dict, List
+from pydantic import BaseModel, Field, ValidationError
 from langchain.agents import initialize_agent, Tool
-from langchain_google_genai import ChatGoogleGenerativeAI
+from langchain.prompts import PromptTemplate
+from agents.clinical_meta_agent.summarizer_agent import clean_json_response
 from tools.extraction_tools import get_content, save_findings
-from config.settings import GOOGLE_API_KEY, LLM_MODEL
+from agents.llm import get_llm
+from tools.llm_cache import track_cached_answers, discard_cached_answers
+from config.settings import (
+    EXTRACTION_MODE,
+    EXTRACTION_MAX_ATTEMPTS
+)
 
 
-def create_extraction_agent():
+class ExtractionResult(BaseModel):
+    """Schema the extraction LLM call must return"""
+    findings: List[str] = Field(
+        description="Only the important details from the text about the patient's condition"
+    )
+    values: Dict[str, Any] = Field(
+        description="Key value pairs of critical data with their mentioned values and units"
+    )
+
+
+EXTRACTION_PROMPT = PromptTemplate(
+    input_variables=["schema", "content", "feedback"],
+    template="""
+You are a medical information extraction agent. Read the report text and extract the important information about the patient's condition.
+
+Report text:
+{content}
+
+IMPORTANT: You must respond with ONLY a valid JSON object matching this JSON schema. Do not include markdown code blocks, explanations, or any text outside the JSON.
+
+{schema}
+{feedback}
+"""
+)
+
+
+def create_extraction_llm():
+    """
+    Creates the LLM used for single-call structured extraction
+    
+    Returns:
+        Chat model
+    """
+    return get_llm(temperature=0, purpose="extraction")
+
+
+def parse_extraction(content: str) -> ExtractionResult:
+    """
+    Parses and validates an extraction response locally
+    
+    Accepts plain JSON, JSON wrapped in markdown, or a Python dict literal.
+    
+    Args:
+        content: Raw LLM response text
+        
+    Returns:
+        Validated ExtractionResult
+        
+    Raises:
+        ValueError: If the response cannot be parsed into the schema
+    """
+    cleaned = clean_json_response(content)
+    
+    try:
+        return ExtractionResult.model_validate_json(cleaned)
+    except ValidationError as json_error:
+        try:
+            data = ast.literal_eval(cleaned)
+        except Exception:
+            raise ValueError(f"Response does not match the schema: {json_error}")
+    
+    try:
+        return ExtractionResult.model_validate(data)
+    except ValidationError as e:
+        raise ValueError(f"Response does not match the schema: {e}")
+
+
+def run_structured_extraction(
+    metadata: dict, 
+    content: str = None, 
+    llm=None, 
+    max_attempts: int = EXTRACTION_MAX_ATTEMPTS
+) -> dict:
+    """
+    Extracts findings with one schema-constrained LLM call and saves them in code
+    
+    A response that fails validation is evicted from the LLM response cache
+    and retried with the validation error fed back; if every attempt fails
+    an error is raised instead of returning empty findings.
+    
+    Args:
+        metadata: Report metadata containing report_id
+        content: Report text (re-read from ChromaDB when None)
+        llm: Optional chat model (defaults to Gemini)
+        max_attempts: LLM calls allowed before giving up
+        
+    Returns:
+        Dictionary with 'findings' and 'values'
+    """
+    if content is None:
+        content = get_content(str(metadata))
+    
+    chain = EXTRACTION_PROMPT | (llm or create_extraction_llm())
+    schema = json.dumps(ExtractionResult.model_json_schema(), indent=2)
+    feedback = ""
+    
+    for attempt in range(1, max(1, max_attempts) + 1):
+        with track_cached_answers() as cached:
+            response = chain.invoke({
+                "schema": schema,
+                "content": content,
+                "feedback": feedback
+            })
+        raw = response.content if hasattr(response, "content") else str(response)
+        
+        try:
+            result = parse_extraction(raw)
+            break
+        except ValueError as e:
+            print(f"Extraction attempt {attempt} failed validation: {e}")
+            # Don't answer the same prompt with the rejected response next time
+            discard_cached_answers(cached)
+            feedback = (
+                f"Your previous answer was rejected: {e}\n"
+                "Return ONLY the corrected JSON object."
+            )
+    else:
+        raise ValueError(f"Extraction failed validation after {max_attempts} attempts")
+    
+    output = result.model_dump()
+    save_findings({**output, "metadata": metadata})
+    
+    return output
+
+
+def create_extraction_agent(include_get_content: bool = True, llm=None):
     """
     Creates an extraction agent for extracting medical findings
     
+    Args:
+        include_get_content: Give the agent the getContent tool (only needed
+            when the report text is not passed in the prompt)
+        llm: Optional language model to drive the agent (defaults to get_llm())
+    
     Returns:
         LangChain agent
     """
     tools = [
-        Tool(
-            name="getContent",
-            func=get_content,
-            description="Fetch and return all report page contents as a string. Input: Metadata"
-        ),
         Tool(
             name="saveFindings",
             func=save_findings,
@@ -24,10 +159,15 @@ def create_extraction_agent():
         )
     ]
     
-    llm = ChatGoogleGenerativeAI(
-        model=LLM_MODEL,
-        google_api_key=GOOGLE_API_KEY
-    )
+    if include_get_content:
+        tools.insert(0, Tool(
+            name="getContent",
+            func=get_content,
+            description="Fetch and return all report page contents as a string. Input: Metadata"
+        ))
+    
+    if llm is None:
+        llm = get_llm(purpose="extraction_agent")
     
     agent = initialize_agent(
         tools=tools,
@@ -40,19 +180,23 @@ def create_extraction_agent():
     return agent
 
 
-def run_extraction(metadata: dict) -> dict:
+def run_extraction_agent(metadata: dict, content: str = None, llm=None) -> dict:
     """
     Runs the extraction agent to extract findings from a report
     
     Args:
         metadata: Report metadata containing report_id
+        content: Report text already in hand; when None the text is
+            re-read from ChromaDB (re-extraction of historical reports)
+        llm: Optional language model to drive the agent
         
     Returns:
         Dictionary with 'findings' and 'values'
     """
-    agent = create_extraction_agent()
+    agent = create_extraction_agent(include_get_content=content is None, llm=llm)
     
-    prompt = f"""
+    if content is None:
+        prompt = f"""
     You are an information extraction agent. You will perform the following tasks:
     1. Pass the entire metadata to the getContent tool and get the complete report text.
     2. Analyse the report text and look for important information
@@ -62,6 +206,19 @@ def run_extraction(metadata: dict) -> dict:
     4. Once the output is extracted, save it using the saveFindings by passing the output and the metadata strictly inside a dict to the saveFindings Tool.
     metadata: {metadata}
     """
+    else:
+        prompt = f"""
+    You are an information extraction agent. You will perform the following tasks:
+    1. Analyse the report text below and look for important information
+    2. Return the output in strictly the following way:
+    {{findings: list of only the important details from the text about the patient's condition
+    values: key value pairs of critical data with their mentioned values}}
+    3. Once the output is extracted, save it using the saveFindings by passing the output and the metadata strictly inside a dict to the saveFindings Tool.
+    metadata: {metadata}
+    
+    Report text:
+    {content}
+    """
     
     response = agent.invoke({"input": prompt})
     
@@ -72,4 +229,23 @@ def run_extraction(metadata: dict) -> dict:
         result = ast.literal_eval(output)
         return result
     except:
-        return {"findings": [], "values": {}}
\ No newline at end of file
+        return {"findings": [], "values": {}}
+
+
+def run_extraction(metadata: dict, content: str = None, mode: str = EXTRACTION_MODE) -> dict:
+    """
+    Extracts findings from a report
+    
+    Args:
+        metadata: Report metadata containing report_id
+        content: Report text already in hand; when None the text is
+            re-read from ChromaDB (re-extraction of historical reports)
+        mode: "structured" for a single validated LLM call, "agent" for the ReAct agent
+        
+    Returns:
+        Dictionary with 'findings' and 'values'
+    """
+    if mode == "agent":
+        return run_extraction_agent(metadata, content=content)
+    
+    return run_structured_extraction(metadata, content=content)
@@ -1,9 +1,12 @@
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain.prompts import PromptTemplate
-from tools.summarizer_tools import get_all_findings, store_summaries
-from config.settings import GOOGLE_API_KEY, LLM_MODEL
+from tools.summarizer_tools import get_findings_window, iter_findings_batches, store_summaries
+from tools.report_index import get_running_summary, save_running_summary
+from agents.llm import get_llm
+from tools.llm_cache import track_cached_answers, discard_cached_answers
+from config.settings import SUMMARY_HISTORY_MAX_CHARS, SUMMARY_WINDOW_REPORTS, SUMMARY_BACKFILL_BATCHES_PER_RUN
 import json
 import re
+import argparse
 
 
 import re
@@ -35,77 +38,210 @@ def clean_json_response(content: str) -> str:
     return content
 
 
-def create_summarizer_agent():
-    """
-    Creates a summarizer chain for generating medical summaries
-    
-    Returns:
-        LangChain chain
-    """
-    llm = ChatGoogleGenerativeAI(
-        model=LLM_MODEL,
-        google_api_key=GOOGLE_API_KEY,
-        temperature=0.3
-    )
-    
-    prompt = PromptTemplate(
-        input_variables=["latest", "history"],
-        template="""
-You are a medical summarization agent. Analyze the patient's medical reports and provide a comprehensive summary.
+SUMMARY_PROMPT = PromptTemplate(
+    input_variables=["running_summary", "reports_covered", "recent", "latest"],
+    template="""
+You are a medical summarization agent. Update the patient's summary with their newest report.
+
+Running summary of the patient's history ({reports_covered} earlier reports):
+{running_summary}
+
+Most recent earlier reports, oldest first (findings and values):
+{recent}
 
 Latest findings and values:
 {latest}
 
-Past reports (for context):
-{history}
-
 IMPORTANT: You must respond with ONLY a valid JSON object. Do not include markdown code blocks, explanations, or any text outside the JSON.
 
 Return this exact JSON structure:
 {{
   "summary": "A clear, concise summary of the patient's current medical condition based on the latest report. Include key findings and any notable observations.",
-  "key_changes": "Comparison with previous reports. Mention improvements, deteriorations, or stable conditions. If this is the first report, state 'This is the first report on file.'",
+  "key_changes": "Comparison with the earlier reports and the running summary. Mention improvements, deteriorations, or stable conditions. If there are no earlier reports, state 'This is the first report on file.'",
   "current_values": {{
     "parameter_name": "value with unit",
     "another_parameter": "value with unit"
-  }}
+  }},
+  "history_summary": "The running summary updated with the latest report, in at most 200 words: ongoing conditions, trends in key values with dates, and notable events. It replaces the running summary above, so keep everything from it that still matters."
 }}
 
 Make sure current_values contains ALL important medical values from the latest report with their units.
 """
-    )
+)
+
+
+HISTORY_PROMPT = PromptTemplate(
+    input_variables=["running_summary", "reports_covered", "reports"],
+    template="""
+You are a medical summarization agent. Fold older reports into the patient's running history summary.
+
+Running summary so far ({reports_covered} reports):
+{running_summary}
+
+Next reports, oldest first (findings and values):
+{reports}
+
+IMPORTANT: You must respond with ONLY a valid JSON object. Do not include markdown code blocks, explanations, or any text outside the JSON.
+
+Return this exact JSON structure:
+{{
+  "history_summary": "The running summary updated with these reports, in at most 200 words: ongoing conditions, trends in key values with dates, and notable events. It replaces the running summary above, so keep everything from it that still matters."
+}}
+"""
+)
+
+
+def create_summarizer_agent():
+    """
+    Creates a summarizer chain for generating medical summaries
     
-    summarizer_chain = prompt | llm
+    Returns:
+        LangChain chain
+    """
+    llm = get_llm(temperature=0.3, purpose="summarizer")
+    
+    summarizer_chain = SUMMARY_PROMPT | llm
     return summarizer_chain
 
 
-def run_summarization(patient_id: str) -> dict:
+def build_summary_inputs(latest: dict, recent: list, running_summary: str = None, reports_covered: int = 0) -> dict:
+    """
+    Builds the summarizer prompt variables
+    
+    The prompt holds the latest report, a bounded window of earlier ones and
+    the running summary of everything before, so its size does not grow
+    with the length of the patient's history.
+    
+    Args:
+        latest: Findings of the report being summarized
+        recent: Findings of the reports just before it, oldest first
+        running_summary: Running history summary from the previous run
+        reports_covered: Number of reports the running summary covers
+        
+    Returns:
+        Dictionary of prompt variables
+    """
+    if running_summary:
+        running_summary = running_summary[:SUMMARY_HISTORY_MAX_CHARS]
+    elif recent:
+        running_summary = "None yet; rely on the earlier reports below."
+    else:
+        running_summary = "None; this is the patient's first report."
+    
+    return {
+        "running_summary": running_summary,
+        "reports_covered": reports_covered,
+        "recent": json.dumps(recent, ensure_ascii=False) if recent else "None",
+        "latest": json.dumps(latest, ensure_ascii=False)
+    }
+
+
+def _history_before(running: dict, report_id: str) -> tuple:
+    """
+    Picks the running summary that does not yet include report_id
+    """
+    if not running:
+        return None, 0
+    if running["last_report_id"] == report_id:
+        # Summarizing the same report again: start from the history before it
+        return running["previous_summary"], running["previous_reports_covered"]
+    return running["summary"], running["reports_covered"]
+
+
+def backfill_history(patient_id: str, running_summary: str, reports_covered: int, up_to: int, max_batches: int = None) -> tuple:
+    """
+    Folds reports the running summary does not cover yet into it, a window at a time
+    
+    Runs when a patient's history predates the running summary (or a
+    report was skipped), so the summary really covers every earlier report.
+    Progress is saved after each batch; if a batch fails or max_batches is
+    reached, the summary covers the reports folded so far and the rest are
+    folded next time.
+    
+    Args:
+        patient_id: Patient identifier
+        running_summary: Current running summary (None if there is none)
+        reports_covered: Number of oldest reports it covers
+        up_to: Number of oldest reports it should cover
+        max_batches: LLM calls allowed for this run (None = no limit)
+        
+    Returns:
+        Tuple of (running summary, number of reports it now covers)
+    """
+    if reports_covered >= up_to or max_batches == 0:
+        return running_summary, reports_covered
+    
+    print(f"Folding reports {reports_covered + 1}-{up_to} into the running summary for patient {patient_id}")
+    chain = HISTORY_PROMPT | get_llm(temperature=0.3, purpose="history_summarizer")
+    
+    try:
+        batches = iter_findings_batches(patient_id, reports_covered, up_to, batch_size=SUMMARY_WINDOW_REPORTS)
+        for count, batch in enumerate(batches, start=1):
+            folded = min(up_to, reports_covered + max(1, SUMMARY_WINDOW_REPORTS))
+            if batch:
+                with track_cached_answers() as cached:
+                    response = chain.invoke({
+                        "running_summary": (running_summary or "None yet.")[:SUMMARY_HISTORY_MAX_CHARS],
+                        "reports_covered": reports_covered,
+                        "reports": json.dumps(batch, ensure_ascii=False)
+                    })
+                content = response.content if hasattr(response, 'content') else str(response)
+                try:
+                    history_summary = json.loads(clean_json_response(content)).get("history_summary")
+                    if not history_summary:
+                        raise ValueError("No history_summary in the response")
+                except ValueError:
+                    discard_cached_answers(cached)
+                    raise
+                running_summary = str(history_summary)[:SUMMARY_HISTORY_MAX_CHARS]
+                save_running_summary(patient_id, batch[-1]["report_id"], running_summary, reports_covered=folded)
+            reports_covered = folded
+            if max_batches is not None and count >= max_batches and reports_covered < up_to:
+                print(f"Folded {reports_covered} of {up_to} reports; the rest are folded on later runs")
+                break
+    except Exception as e:
+        print(f"Stopped folding history after {reports_covered} reports: {e}")
+    
+    return running_summary, reports_covered
+
+
+def run_summarization(patient_id: str, report_id: str = None) -> dict:
     """
-    Runs the summarizer to generate a patient summary
+    Runs the summarizer to generate a patient summary and fold the report
+    into the patient's running history summary
     
     Args:
         patient_id: Patient identifier
+        report_id: Report that triggered the summary, stored with it
         
     Returns:
         Dictionary with summary, key_changes, and current_values
     """
-    reports = get_all_findings(patient_id)
+    latest, recent, report_count = get_findings_window(patient_id, report_id=report_id)
     
-    if not reports:
+    if not latest:
         return {
             "summary": "No stored findings for this patient.",
             "key_changes": "N/A",
             "current_values": {}
         }
     
-    latest = reports[-1]
-    history = reports[:-1] if len(reports) > 1 else []
+    latest_report_id = latest.get("report_id") or report_id
+    running_summary, reports_covered = _history_before(get_running_summary(patient_id), latest_report_id)
+    
+    # Every report before the latest should be in the running summary; fold
+    # in any that are not (history from before the rolling summary existed)
+    running_summary, reports_covered = backfill_history(
+        patient_id,
+        running_summary,
+        reports_covered,
+        report_count - 1,
+        max_batches=SUMMARY_BACKFILL_BATCHES_PER_RUN
+    )
     
     summarizer = create_summarizer_agent()
-    response = summarizer.invoke({
-        "latest": json.dumps(latest),
-        "history": json.dumps(history)
-    })
+    with track_cached_answers() as cached:
+        response = summarizer.invoke(build_summary_inputs(latest, recent, running_summary, reports_covered))
     
     try:
         content = response.content if hasattr(response, 'content') else str(response)
@@ -128,7 +264,18 @@ def run_summarization(patient_id: str) -> dict:
         """
         
         # Pass the formatted string instead of the dict
-        store_summaries(summary_text, patient_id)
+        store_summaries(summary_text, patient_id, report_id=report_id)
+        
+        history_summary = result.get("history_summary") or result.get("summary")
+        if latest_report_id and history_summary:
+            save_running_summary(
+                patient_id,
+                latest_report_id,
+                str(history_summary)[:SUMMARY_HISTORY_MAX_CHARS],
+                # The oldest reports folded in order; if the backfill stopped
+                # early, the latest report is not counted so the gap is refilled
+                reports_covered=reports_covered + 1 if reports_covered == report_count - 1 else reports_covered
+            )
         
         return {
             "summary": result.get("summary", "No summary available"),
@@ -136,6 +283,7 @@ def run_summarization(patient_id: str) -> dict:
             "current_values": result.get("current_values", {})
         }
     except json.JSONDecodeError as e:
+        discard_cached_answers(cached)
         print(f"JSON Parse Error: {e}")
         print(f"Attempted to parse: {content[:500]}")
         return {
@@ -144,10 +292,53 @@ def run_summarization(patient_id: str) -> dict:
             "current_values": {}
         }
     except Exception as e:
+        discard_cached_answers(cached)
         print(f"Error parsing summarizer response: {e}")
         print(f"Raw response type: {type(response)}")
         return {
             "summary": str(response),
             "key_changes": "Unable to extract changes",
             "current_values": {}
-        }
\ No newline at end of file
+        }
+
+
+def backfill_patient(patient_id: str) -> int:
+    """
+    Folds all of a patient's reports into their running summary
+    
+    For histories that predate the running summary, so ingestion does not
+    have to catch up a few batches at a time.
+    
+    Args:
+        patient_id: Patient identifier
+        
+    Returns:
+        Number of reports the running summary covers
+    """
+    latest, _, report_count = get_findings_window(patient_id, window=0)
+    running = get_running_summary(patient_id)
+    running_summary, reports_covered = (running["summary"], running["reports_covered"]) if running else (None, 0)
+    
+    # A summary saved for the newest report already describes it; fold in
+    # only the older reports it is missing so that one is not added twice
+    up_to = report_count
+    if running and latest and running["last_report_id"] == latest.get("report_id"):
+        up_to = report_count - 1
+    
+    _, reports_covered = backfill_history(patient_id, running_summary, reports_covered, up_to)
+    print(f"Running summary for patient {patient_id} covers {reports_covered} of {report_count} reports")
+    return reports_covered
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fold older reports into patients' running summaries")
+    parser.add_argument("command", choices=["backfill"])
+    parser.add_argument("patient_ids", nargs="+")
+    args = parser.parse_args()
+    
+    for patient_id in args.patient_ids:
+        backfill_patient(patient_id)
+
+
+if __name__ == "__main__":
+    main()
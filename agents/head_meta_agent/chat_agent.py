@@ -1,7 +1,6 @@
 from langchain.agents import initialize_agent, Tool
-from langchain_google_genai import ChatGoogleGenerativeAI
+from agents.llm import get_llm
 from tools.chat_tools import query_findings, get_patient_history
-from config.settings import GOOGLE_API_KEY, LLM_MODEL
 
 
 def create_chat_agent():
@@ -24,11 +23,8 @@ def create_chat_agent():
         )
     ]
     
-    llm = ChatGoogleGenerativeAI(
-        model=LLM_MODEL,
-        google_api_key=GOOGLE_API_KEY,
-        temperature=0.7
-    )
+    # Sampled answers: a repeated question should not get the same reply from the cache
+    llm = get_llm(temperature=0.7, purpose="chat", cache=False)
     
     agent = initialize_agent(
         tools=tools,
@@ -1,7 +1,6 @@
 from langchain.agents import initialize_agent, Tool
-from langchain_google_genai import ChatGoogleGenerativeAI
+from agents.llm import get_llm
 from tools.document_tools import store_content
-from config.settings import GOOGLE_API_KEY, LLM_MODEL
 
 
 def create_document_save_agent():
@@ -19,10 +18,7 @@ def create_document_save_agent():
         )
     ]
     
-    llm = ChatGoogleGenerativeAI(
-        model=LLM_MODEL,
-        google_api_key=GOOGLE_API_KEY
-    )
+    llm = get_llm(purpose="document_save")
     
     agent = initialize_agent(
         tools=tools,
@@ -1,8 +1,17 @@
-from agents.head_meta_agent.ocr_agent import run_ocr_extraction
-from agents.head_meta_agent.stt_agent import run_stt_extraction
-from agents.head_meta_agent.document_save_agent import run_document_save
-from agents.head_meta_agent.chat_agent import run_chat
+import time
+from tools.report_index import (
+    hash_text,
+    find_report_by_file,
+    find_report_by_text,
+    find_incomplete_reports,
+    forget_report,
+    record_report
+)
 from graph.state import AgentState
+from observability.metrics import INPUT_SECONDS, DUPLICATE_REPORTS
+
+# OCR, STT, chat and storage subsystems are imported on first use so that a
+# text-only session never loads EasyOCR or Whisper.
 
 
 def determine_intent(text_input: str) -> str:
@@ -55,9 +64,12 @@ def process_input(state: AgentState) -> AgentState:
     input_type = state.get("input_type")
     file_path = state.get("file_path")
     text_input = state.get("text_input")
+    started = time.perf_counter()
     
     try:
         if input_type in ["pdf", "image"]:
+            from agents.head_meta_agent.ocr_agent import run_ocr_extraction
+            
             print(f"Processing {input_type} file: {file_path}")
             result = run_ocr_extraction(file_path)
             state["extracted_text"] = result.get("content", "")
@@ -65,16 +77,21 @@ def process_input(state: AgentState) -> AgentState:
             state["next_step"] = "save_document"
             
         elif input_type == "audio":
+            from agents.head_meta_agent.stt_agent import run_stt_extraction
+            
             print(f"Processing audio file: {file_path}")
-            transcribed_text = run_stt_extraction(file_path)
-            state["extracted_text"] = transcribed_text
-            state["confidence"] = 1.0
+            result = run_stt_extraction(file_path)
+            state["extracted_text"] = result.get("content", "")
+            state["confidence"] = result.get("confidence", 0.0)
+            state["transcript_segments"] = result.get("segments")
             state["next_step"] = "save_document"
             
         elif input_type == "text":
             intent = determine_intent(text_input)
             
             if intent == "chat":
+                from agents.head_meta_agent.chat_agent import run_chat
+                
                 print("Processing as conversational query")
                 patient_id = state.get("patient_id", "pt-001")
                 chat_response = run_chat(text_input, patient_id)
@@ -94,9 +111,70 @@ def process_input(state: AgentState) -> AgentState:
         state["error"] = str(e)
         state["next_step"] = "error"
     
+    INPUT_SECONDS.observe(time.perf_counter() - started, input_type=input_type or "unknown")
+    return state
+
+
+def load_existing_report(state: AgentState, report_id: str) -> AgentState:
+    """
+    Fills the state from a report that was already ingested, skipping all further work
+    
+    Args:
+        state: Current agent state
+        report_id: Report ID of the earlier ingest
+        
+    Returns:
+        Updated state with the stored findings and summary
+    """
+    from tools.extraction_tools import get_report_findings
+    from tools.summarizer_tools import get_report_summary
+    
+    print(f"Duplicate report detected, reusing {report_id}")
+    
+    # A new file with the same text as a finished report: remember its bytes
+    # too, so uploading it again skips OCR / STT
+    file_hash = state.get("file_hash")
+    patient_id = state.get("patient_id")
+    if file_hash and find_report_by_file(patient_id, file_hash) is None:
+        record_report(patient_id, report_id, file_sha256=file_hash, completed=True)
+    
+    stored = get_report_findings(report_id)
+    summary = get_report_summary(report_id) or "No stored summary for this report."
+    
+    state["duplicate_of"] = report_id
+    state["report_metadata"] = {"report_id": report_id, "patient_id": state.get("patient_id")}
+    state["findings"] = stored.get("findings", [])
+    state["values"] = stored.get("values", {})
+    state["summary"] = summary
+    state["final_response"] = f"""
+DUPLICATE REPORT
+{'='*50}
+
+This report was already processed as {report_id}.
+
+{summary}
+"""
+    state["next_step"] = "end"
     return state
 
 
+def discard_incomplete_reports(patient_id: str, file_hash: str, text_hash: str):
+    """
+    Deletes the documents and index rows of unfinished ingests of the same file or text
+    
+    Args:
+        patient_id: Patient identifier
+        file_hash: SHA-256 of the source file, if any
+        text_hash: SHA-256 of the normalized extracted text
+    """
+    from tools.document_tools import delete_report_documents
+    
+    for report_id in find_incomplete_reports(patient_id, file_sha256=file_hash, text_sha256=text_hash):
+        deleted = delete_report_documents(report_id)
+        forget_report(patient_id, report_id)
+        print(f"Discarded unfinished report {report_id} ({deleted} documents)")
+
+
 def save_document(state: AgentState) -> AgentState:
     """
     Saves the extracted document to ChromaDB
@@ -110,6 +188,8 @@ def save_document(state: AgentState) -> AgentState:
     print("\n=== HEAD META AGENT: Saving Document ===")
     
     try:
+        from agents.head_meta_agent.document_save_agent import run_document_save
+        
         text_data = {
             "content": state.get("extracted_text", ""),
             "confidence": state.get("confidence", 0.0)
@@ -117,9 +197,26 @@ def save_document(state: AgentState) -> AgentState:
         
         patient_id = state.get("patient_id", "pt-1")
         
+        text_hash = hash_text(text_data["content"])
+        existing_id = find_report_by_text(patient_id, text_hash)
+        if existing_id:
+            DUPLICATE_REPORTS.inc(match="text")
+            return load_existing_report(state, existing_id)
+        
+        # A failed earlier ingest of the same file or text left documents behind;
+        # remove them so the report is not in the patient's history twice
+        discard_incomplete_reports(patient_id, state.get("file_hash"), text_hash)
+        
         metadata = run_document_save(text_data, patient_id)
         state["report_metadata"] = metadata
         
+        record_report(
+            patient_id,
+            metadata["report_id"],
+            file_sha256=state.get("file_hash"),
+            text_sha256=text_hash
+        )
+        
         print(f"Document saved with metadata: {metadata}")
         state["next_step"] = "extract_findings"
         
@@ -1,13 +1,17 @@
 from langchain.agents import initialize_agent, Tool
-from langchain_google_genai import ChatGoogleGenerativeAI
-from tools.ocr_tools import get_file_type, convert_to_jpg, get_ocr
-from config.settings import GOOGLE_API_KEY, LLM_MODEL
+from agents.llm import get_llm
+from tools.ocr_tools import get_file_type, convert_to_jpg, get_ocr, ocr_pdf
+from tools.workspace import job_workspace
+from config.settings import OCR_USE_AGENT
 
 
-def create_ocr_agent():
+def create_ocr_agent(llm=None):
     """
     Creates an OCR agent with file type detection, PDF conversion, and OCR tools
     
+    Args:
+        llm: Optional language model to drive the agent (defaults to get_llm())
+        
     Returns:
         LangChain agent
     """
@@ -29,10 +33,8 @@ def create_ocr_agent():
         )
     ]
     
-    llm = ChatGoogleGenerativeAI(
-        model=LLM_MODEL,
-        google_api_key=GOOGLE_API_KEY
-    )
+    if llm is None:
+        llm = get_llm(purpose="ocr")
     
     agent = initialize_agent(
         tools=tools,
@@ -45,17 +47,36 @@ def create_ocr_agent():
     return agent
 
 
-def run_ocr_extraction(file_path: str) -> dict:
+def run_ocr_pipeline(file_path: str) -> dict:
+    """
+    Runs file type detection, page-by-page PDF rendering and OCR directly, without an LLM
+    
+    Args:
+        file_path: Path to file (PDF or image)
+        
+    Returns:
+        Dictionary with 'content' and 'confidence' as returned by get_ocr
+    """
+    file_type = get_file_type(file_path)
+    
+    if file_type == "pdf":
+        return ocr_pdf(file_path)
+    
+    return get_ocr([file_path])
+
+
+def run_ocr_agent(file_path: str, llm=None) -> dict:
     """
     Runs the OCR agent on a file
     
     Args:
         file_path: Path to file (PDF or image)
+        llm: Optional language model to drive the agent
         
     Returns:
         Dictionary with 'content' and 'confidence'
     """
-    agent = create_ocr_agent()
+    agent = create_ocr_agent(llm=llm)
     
     prompt = f"""
     You are an OCR extraction assistant.
@@ -67,7 +88,10 @@ def run_ocr_extraction(file_path: str) -> dict:
     File: {file_path}
     """
     
-    response = agent.invoke({"input": prompt})
+    # The PDFtoImage tool renders pages into this workspace, which is removed
+    # afterwards even when the agent is run outside the report workflow
+    with job_workspace():
+        response = agent.invoke({"input": prompt})
     
     output = response.get("output", "")
     
@@ -76,4 +100,24 @@ def run_ocr_extraction(file_path: str) -> dict:
         result = ast.literal_eval(output)
         return result
     except:
-        return {"content": output, "confidence": 0.0}
\ No newline at end of file
+        return {"content": output, "confidence": 0.0}
+
+
+def run_ocr_extraction(file_path: str, use_agent: bool = OCR_USE_AGENT) -> dict:
+    """
+    Extracts text from a PDF or image
+    
+    Uses the direct pipeline by default; the ReAct agent is only used
+    when explicitly requested.
+    
+    Args:
+        file_path: Path to file (PDF or image)
+        use_agent: Route OCR through the LLM agent instead of calling the tools directly
+        
+    Returns:
+        Dictionary with 'content' and 'confidence'
+    """
+    if use_agent:
+        return run_ocr_agent(file_path)
+    
+    return run_ocr_pipeline(file_path)
@@ -1,13 +1,16 @@
 from langchain.agents import initialize_agent, Tool
-from langchain_google_genai import ChatGoogleGenerativeAI
-from tools.stt_tools import transcribe
-from config.settings import GOOGLE_API_KEY, LLM_MODEL
+from agents.llm import get_llm
+from tools.stt_tools import transcribe, transcribe_segments, transcript_confidence
+from config.settings import STT_USE_AGENT
 
 
-def create_stt_agent():
+def create_stt_agent(llm=None):
     """
     Creates an STT agent with transcription capability
     
+    Args:
+        llm: Optional language model to drive the agent (defaults to get_llm())
+        
     Returns:
         LangChain agent
     """
@@ -19,10 +22,8 @@ def create_stt_agent():
         )
     ]
     
-    llm = ChatGoogleGenerativeAI(
-        model=LLM_MODEL,
-        google_api_key=GOOGLE_API_KEY
-    )
+    if llm is None:
+        llm = get_llm(purpose="stt")
     
     agent = initialize_agent(
         tools=tools,
@@ -35,17 +36,40 @@ def create_stt_agent():
     return agent
 
 
-def run_stt_extraction(file_path: str) -> str:
+def run_stt_pipeline(file_path: str) -> dict:
+    """
+    Transcribes an audio file directly, without an LLM
+    
+    Args:
+        file_path: Path to audio file
+        
+    Returns:
+        Dictionary with 'content', 'confidence', 'segments' and 'duration'
+    """
+    result = transcribe_segments(file_path)
+    
+    return {
+        "content": result["text"],
+        "confidence": transcript_confidence(result["segments"]),
+        "segments": result["segments"],
+        "duration": result["duration"]
+    }
+
+
+def run_stt_agent(file_path: str, llm=None) -> dict:
     """
     Runs the STT agent on an audio file
     
+    Note that the agent's final answer may paraphrase or truncate the transcript.
+    
     Args:
         file_path: Path to audio file
+        llm: Optional language model to drive the agent
         
     Returns:
-        Transcribed text
+        Dictionary with 'content' and 'confidence'
     """
-    agent = create_stt_agent()
+    agent = create_stt_agent(llm=llm)
     
     prompt = f"""
     You are a text extraction agent. You will perform text transcription on the audio file and return the text content.
@@ -56,4 +80,24 @@ def run_stt_extraction(file_path: str) -> str:
     
     output = response.get("output", "")
     
-    return output
\ No newline at end of file
+    return {"content": output, "confidence": 1.0, "segments": None}
+
+
+def run_stt_extraction(file_path: str, use_agent: bool = STT_USE_AGENT) -> dict:
+    """
+    Transcribes an audio file
+    
+    Uses the direct transcriber by default; the ReAct agent is only used
+    when explicitly requested.
+    
+    Args:
+        file_path: Path to audio file
+        use_agent: Route transcription through the LLM agent
+        
+    Returns:
+        Dictionary with 'content', 'confidence' and 'segments'
+    """
+    if use_agent:
+        return run_stt_agent(file_path)
+    
+    return run_stt_pipeline(file_path)
@@ -0,0 +1,104 @@
+"""
+Single place where the agents' chat models are built
+
+Every create_* factory asks get_llm() for its model instead of building a
+ChatGoogleGenerativeAI itself. Benchmarks and replay tooling can swap the
+model for the whole process with set_llm_factory(). When a cassette is
+active (tools.cassettes) the model is wrapped so its calls are recorded,
+or answered from the cassette without building a client at all.
+
+Each model is wrapped in a RateLimitedChatModel, so all LLM calls in the
+process share one rate limiter, concurrency cap and retry policy
+(agents.llm_limiter). Repeated prompts are answered from the disk cache in
+tools.llm_cache, in front of the limiter, unless the caller opts out with
+cache=False. Models from an override factory skip both, unless it was
+installed with limited=True.
+"""
+import threading
+from config.settings import GOOGLE_API_KEY, LLM_MODEL, LLM_CACHE_ENABLED, LLM_TIMEOUT_SECONDS
+from agents.llm_limiter import RateLimitedChatModel
+from tools.cassettes import get_cassette, CassetteChatModel
+
+
+_factory = None
+_factory_limited = False
+_factory_lock = threading.Lock()
+
+
+def set_llm_factory(factory, limited: bool = False):
+    """
+    Overrides how chat models are built, for every agent in the process
+    
+    Args:
+        factory: Callable (temperature, purpose) -> chat model, or None to
+            restore the default Gemini client
+        limited: Still send the factory's models through the response cache
+            and the shared limiter (by default a stand-in model is called
+            directly, so benchmarks time it rather than cache hits or waits)
+            
+    Returns:
+        The previous factory, so callers can restore it
+    """
+    global _factory, _factory_limited
+    
+    with _factory_lock:
+        previous, _factory, _factory_limited = _factory, factory, limited
+    return previous
+
+
+def get_llm(temperature: float = None, purpose: str = "default", cache: bool = True):
+    """
+    Returns the chat model for an agent
+    
+    Args:
+        temperature: Sampling temperature (None keeps the provider default)
+        purpose: Which agent is asking (e.g. "summarizer", "chat"); lets an
+            override factory answer each agent appropriately
+        cache: Answer identical prompts from the LLM response cache; pass
+            False where a fresh sample is wanted each time
+            
+    Returns:
+        LangChain chat model
+    """
+    cassette = get_cassette()
+    if cassette is not None and cassette.replaying:
+        return CassetteChatModel(purpose=purpose, temperature=temperature)
+    
+    with _factory_lock:
+        factory, limited = _factory, _factory_limited
+    
+    if factory is not None and not limited:
+        llm = factory(temperature=temperature, purpose=purpose)
+    else:
+        llm = RateLimitedChatModel(inner=_build_llm(temperature, purpose, factory), cache=_response_cache(cache))
+    if cassette is not None:
+        # The cassette calls the limited model directly, so every recorded
+        # answer comes from the provider rather than the cache
+        return CassetteChatModel(inner=llm, purpose=purpose, temperature=temperature)
+    return llm
+
+
+def _response_cache(cache: bool):
+    if cache and LLM_CACHE_ENABLED:
+        from tools.llm_cache import get_llm_cache
+        return get_llm_cache()
+    return False
+
+
+def _build_llm(temperature: float, purpose: str, factory=None):
+    if factory is not None:
+        return factory(temperature=temperature, purpose=purpose)
+    
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    
+    # Retries are left to the shared limiter; the client makes a single attempt
+    kwargs = {
+        "model": LLM_MODEL,
+        "google_api_key": GOOGLE_API_KEY,
+        "timeout": LLM_TIMEOUT_SECONDS,
+        "max_retries": 1,
+        "cache": False
+    }
+    if temperature is not None:
+        kwargs["temperature"] = temperature
+    return ChatGoogleGenerativeAI(**kwargs)
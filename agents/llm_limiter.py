@@ -0,0 +1,328 @@
+"""
+Process-wide limits for LLM calls
+
+Every chat model returned by agents.llm.get_llm() is wrapped in a
+RateLimitedChatModel, and all of them share one LLMLimiter:
+
+    token bucket    - LLM_REQUESTS_PER_MINUTE, bursts of up to LLM_BURST
+    in-flight cap   - at most LLM_MAX_IN_FLIGHT provider calls at once
+    retries         - throttling (429 / RESOURCE_EXHAUSTED), 500/502/503/504 and timeouts
+                      are retried up to LLM_MAX_RETRIES times with full-jitter
+                      exponential backoff
+    timeouts        - LLM_TIMEOUT_SECONDS per provider call (set on the client)
+
+A throttled call pauses the bucket for every caller, so parallel ingests
+back off together instead of each hammering the provider on its own
+schedule. The limiter's state is exported as metrics and, in daemon mode,
+at GET /limiter.
+"""
+import re
+import time
+import random
+import threading
+from typing import Any, List, Mapping, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatResult
+
+from config.settings import (
+    LLM_REQUESTS_PER_MINUTE,
+    LLM_BURST,
+    LLM_MAX_IN_FLIGHT,
+    LLM_MAX_RETRIES,
+    LLM_BACKOFF_BASE_SECONDS,
+    LLM_BACKOFF_MAX_SECONDS
+)
+from observability.metrics import (
+    LLM_IN_FLIGHT,
+    LLM_LIMITER_WAITING,
+    LLM_LIMITER_WAIT_SECONDS,
+    LLM_RETRIES,
+    LLM_GIVEUPS
+)
+
+
+RETRYABLE_STATUS = {429: "throttled", 408: "timeout", 500: "unavailable", 502: "unavailable", 503: "unavailable", 504: "unavailable"}
+
+# Fallbacks for errors that carry no status code; a bare number such as
+# "max tokens 500" must not make a bad request look retryable
+THROTTLED = re.compile(
+    r"\b429\s+(?:too many requests|resource.?exhausted)|status(?: code)?[:= ]+429\b"
+    r"|resource.?exhausted|rate.?limit(?:ed| exceeded)|too many requests|quota exceeded|exceeded (?:your )?(?:current )?quota",
+    re.IGNORECASE
+)
+UNAVAILABLE = re.compile(
+    r"\b50[0234]\s+(?:service unavailable|unavailable|internal server error|internal|bad gateway|gateway timeout)\b"
+    r"|status(?: code)?[:= ]+50[0234]\b|service unavailable|internal server error|bad gateway|overloaded",
+    re.IGNORECASE
+)
+TIMED_OUT = re.compile(r"timed?[ _-]?out|deadline", re.IGNORECASE)
+RETRY_HINT = re.compile(r"retry (?:in|after) ([\d.]+)\s*s", re.IGNORECASE)
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def classify_error(error: BaseException) -> tuple:
+    """
+    Decides whether a failed provider call is worth retrying
+
+    Args:
+        error: Exception raised by the chat model
+
+    Returns:
+        Tuple of (reason, retry_after): reason is "throttled", "unavailable",
+        "timeout" or None (not retryable); retry_after is the provider's
+        suggested delay in seconds, if it gave one
+    """
+    status = getattr(error, "status_code", None)
+    if status is None and isinstance(getattr(error, "code", None), int):
+        status = error.code
+    text = f"{type(error).__name__}: {error}"
+
+    if isinstance(status, int):
+        # The provider said what went wrong; other 4xx/5xx are not retried
+        reason = RETRYABLE_STATUS.get(status)
+    elif THROTTLED.search(text):
+        reason = "throttled"
+    elif UNAVAILABLE.search(text):
+        reason = "unavailable"
+    elif isinstance(error, TimeoutError) or TIMED_OUT.search(text):
+        reason = "timeout"
+    else:
+        reason = None
+
+    retry_after = getattr(error, "retry_after", None)
+    if retry_after is None:
+        match = RETRY_HINT.search(text)
+        retry_after = float(match.group(1)) if match else None
+
+    return reason, retry_after
+
+
+class LLMLimiter:
+    """
+    Token bucket plus in-flight cap, with retry/backoff around each call
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = LLM_REQUESTS_PER_MINUTE,
+        burst: int = LLM_BURST,
+        max_in_flight: int = LLM_MAX_IN_FLIGHT,
+        max_retries: int = LLM_MAX_RETRIES,
+        backoff_base: float = LLM_BACKOFF_BASE_SECONDS,
+        backoff_max: float = LLM_BACKOFF_MAX_SECONDS
+    ):
+        """
+        Args:
+            requests_per_minute: Sustained call rate (0 = no rate limit)
+            burst: Calls that may start back to back after an idle period
+            max_in_flight: Concurrent provider calls
+            max_retries: Retries per call on throttling / unavailability / timeouts
+            backoff_base: First backoff ceiling in seconds (doubles per retry)
+            backoff_max: Largest backoff ceiling in seconds
+        """
+        self.rate = requests_per_minute / 60.0
+        self.burst = max(1, burst)
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self._cond = threading.Condition()
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._in_flight = 0
+        self._waiting = 0
+        self._counts = {"calls": 0, "succeeded": 0, "retries": 0, "throttled": 0, "gave_up": 0}
+
+    def _refill(self, now: float):
+        if now > self._updated:
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+    def acquire(self) -> float:
+        """
+        Blocks until a token and an in-flight slot are free, then takes both
+
+        Returns:
+            Seconds spent waiting
+        """
+        started = time.monotonic()
+
+        with self._cond:
+            self._waiting += 1
+            LLM_LIMITER_WAITING.inc()
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    if self._paused_until > now:
+                        wait = self._paused_until - now
+                    elif self._in_flight >= self.max_in_flight:
+                        wait = None
+                    elif self.rate > 0 and self._tokens < 1:
+                        wait = (1 - self._tokens) / self.rate
+                    else:
+                        if self.rate > 0:
+                            self._tokens -= 1
+                        self._in_flight += 1
+                        break
+                    self._cond.wait(wait)
+            finally:
+                self._waiting -= 1
+                LLM_LIMITER_WAITING.dec()
+
+        waited = time.monotonic() - started
+        LLM_IN_FLIGHT.inc()
+        LLM_LIMITER_WAIT_SECONDS.observe(waited)
+        return waited
+
+    def release(self):
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+        LLM_IN_FLIGHT.dec()
+
+    def pause(self, seconds: float):
+        """
+        Stops every caller from starting a call for the given time, and
+        empties the bucket so calls resume at the sustained rate, not in a burst
+        """
+        with self._cond:
+            until = time.monotonic() + seconds
+            if until > self._paused_until:
+                self._paused_until = until
+                self._tokens = 0.0
+                self._updated = until
+            self._cond.notify_all()
+
+    def backoff(self, attempt: int, retry_after: float = None) -> float:
+        """
+        Full-jitter exponential backoff, never shorter than the provider's hint
+        """
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        delay = random.uniform(0, ceiling)
+        if retry_after:
+            delay = max(delay, min(retry_after, self.backoff_max))
+        return delay
+
+    def call(self, fn):
+        """
+        Runs fn() under the limits, retrying throttled / unavailable / timed out calls
+
+        Args:
+            fn: Makes one provider call
+
+        Returns:
+            fn's result
+
+        Raises:
+            The last error, once retries are exhausted or the error is not retryable
+        """
+        with self._cond:
+            self._counts["calls"] += 1
+
+        attempt = 0
+        while True:
+            self.acquire()
+            try:
+                result = fn()
+            except Exception as e:
+                reason, retry_after = classify_error(e)
+                if reason is None or attempt >= self.max_retries:
+                    with self._cond:
+                        self._counts["gave_up"] += 1
+                    LLM_GIVEUPS.inc(reason=reason or "error")
+                    raise
+                delay = self.backoff(attempt, retry_after)
+            else:
+                with self._cond:
+                    self._counts["succeeded"] += 1
+                return result
+            finally:
+                self.release()
+
+            attempt += 1
+            LLM_RETRIES.inc(reason=reason)
+            with self._cond:
+                self._counts["retries"] += 1
+                if reason == "throttled":
+                    self._counts["throttled"] += 1
+            print(f"LLM call {reason}; retry {attempt}/{self.max_retries} in {delay:.1f}s")
+
+            if reason == "throttled":
+                # Everyone waits out the throttle, not just this caller
+                self.pause(delay)
+            else:
+                time.sleep(delay)
+
+    def snapshot(self) -> dict:
+        """
+        Returns the limiter's configuration, current state and counters
+        """
+        with self._cond:
+            now = time.monotonic()
+            self._refill(now)
+            return {
+                "requests_per_minute": round(self.rate * 60, 2),
+                "burst": self.burst,
+                "tokens": round(self._tokens, 2) if self.rate > 0 else None,
+                "max_in_flight": self.max_in_flight,
+                "in_flight": self._in_flight,
+                "waiting": self._waiting,
+                "paused_for_seconds": round(max(0.0, self._paused_until - now), 2),
+                **self._counts
+            }
+
+
+def get_limiter() -> LLMLimiter:
+    """
+    Returns the process-wide limiter, configured from settings
+    """
+    global _limiter
+
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = LLMLimiter()
+    return _limiter
+
+
+def set_limiter(limiter: LLMLimiter) -> Optional[LLMLimiter]:
+    """
+    Replaces the process-wide limiter (e.g. with different limits in a benchmark)
+
+    Returns:
+        The previous limiter
+    """
+    global _limiter
+
+    with _limiter_lock:
+        previous, _limiter = _limiter, limiter
+    return previous
+
+
+class RateLimitedChatModel(BaseChatModel):
+    """
+    Chat model that sends each call to the wrapped model through the shared limiter
+
+    It identifies as the wrapped model, so callbacks and the response
+    cache see the real model name and parameters.
+    """
+
+    inner: Any
+
+    @property
+    def _llm_type(self) -> str:
+        return self.inner._llm_type
+
+    @property
+    def _identifying_params(self) -> Mapping[str, Any]:
+        return dict(getattr(self.inner, "_identifying_params", {}) or {})
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager=None, **kwargs: Any) -> ChatResult:
+        return get_limiter().call(lambda: self.inner._generate(messages, stop=stop, **kwargs))
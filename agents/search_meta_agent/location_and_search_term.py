@@ -1,10 +1,10 @@
 from langchain.agents import initialize_agent, Tool
-from langchain_google_genai import ChatGoogleGenerativeAI
+from agents.llm import get_llm
 from tools.search_and_location import get_user_location, get_user_summaries
 import os
 import json
 from dotenv import load_dotenv
-from config.settings import IPGEOLOCATION_API_KEY, GOOGLE_API_KEY, LLM_MODEL
+from config.settings import IPGEOLOCATION_API_KEY
 
 load_dotenv()
 
@@ -32,10 +32,7 @@ def create_location_search_agent():
         )
     ]
     
-    llm = ChatGoogleGenerativeAI(
-        model=LLM_MODEL,
-        google_api_key=GOOGLE_API_KEY
-    )
+    llm = get_llm(purpose="location_search")
     
     agent = initialize_agent(
         tools=tools,
@@ -1,11 +1,10 @@
 from langchain.agents import initialize_agent, Tool
-from langchain_google_genai import ChatGoogleGenerativeAI
+from agents.llm import get_llm
 from tools.search import scrape_google_maps, perform_ranking
 import os
 from dotenv import load_dotenv
 import json
 import traceback
-from config.settings import GOOGLE_API_KEY, LLM_MODEL
 
 
 load_dotenv()
@@ -58,10 +57,7 @@ def create_search_agent():
         )
     ]
 
-    llm = ChatGoogleGenerativeAI(
-        model=LLM_MODEL,
-        google_api_key=GOOGLE_API_KEY
-    )
+    llm = get_llm(purpose="search")
     
     agent = initialize_agent(
         tools=tools,
@@ -1,6 +1,7 @@
 from agents.search_meta_agent.location_and_search_term import run_search_term_and_location
 from agents.search_meta_agent.search_agent import search_doctors
 from graph.state import AgentState
+from observability.metrics import DOCTOR_SEARCHES
 import json
 
 
@@ -46,6 +47,7 @@ def get_search_parameters(state: AgentState) -> AgentState:
         state["next_step"] = "search_doctors"
         
     except Exception as e:
+        DOCTOR_SEARCHES.inc(outcome="no_parameters")
         print(f"❌ Error getting search parameters: {e}")
         state["error"] = str(e)
         state["next_step"] = "error"
@@ -124,6 +126,7 @@ def find_doctors(state: AgentState) -> AgentState:
         
         state["top_doctors"] = top_results
         state["total_results"] = total_results
+        DOCTOR_SEARCHES.inc(outcome="found" if top_results else "empty")
         
         print(f"✅ Found {total_results} doctors, returning top {len(top_results)}")
         
@@ -138,6 +141,7 @@ def find_doctors(state: AgentState) -> AgentState:
         state["next_step"] = "end"
         
     except Exception as e:
+        DOCTOR_SEARCHES.inc(outcome="error")
         print(f"❌ Error searching for doctors: {e}")
         import traceback
         traceback.print_exc()
@@ -0,0 +1,295 @@
+"""
+Non-interactive bulk ingest for backfilling an archive of reports
+
+Runs every file in a directory (or listed in a manifest) through the report
+workflow and appends one JSON line per file to the output file. Reruns skip
+files that the output file or the report index already record as finished,
+so an interrupted backfill picks up where it stopped.
+
+Usage:
+    python batch_ingest.py archive/ --patient pt-001 --workers 4
+    python batch_ingest.py manifest.csv --output backfill.jsonl
+
+Manifests are CSV (columns: file, patient_id) or JSONL
+({"file": ..., "patient_id": ...}); relative paths are resolved against
+the manifest's directory.
+"""
+import os
+import csv
+import sys
+import json
+import time
+import argparse
+import threading
+from pathlib import Path
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Bulk-ingest a directory or manifest of medical reports"
+    )
+    parser.add_argument("source", help="Directory of reports, or a .csv / .jsonl manifest")
+    parser.add_argument("--patient", default=None, help="Patient ID for directory ingests (default: pt-001)")
+    parser.add_argument("--output", default="batch_results.jsonl", help="JSONL results file (appended to)")
+    parser.add_argument("--workers", type=int, default=None, help="Reports processed at once")
+    parser.add_argument("--ocr-workers", type=int, default=None, help="OCR processes per PDF")
+    parser.add_argument("--stt-workers", type=int, default=None, help="Whisper processes per recording")
+    parser.add_argument("--no-recursive", action="store_true", help="Do not descend into subdirectories")
+    return parser.parse_args(argv)
+
+
+def collect_directory(directory: Path, patient_id: str, recursive: bool = True) -> list:
+    """
+    Lists the supported files in a directory
+
+    Args:
+        directory: Directory to scan
+        patient_id: Patient the files belong to
+        recursive: Descend into subdirectories
+
+    Returns:
+        List of (file path, patient_id) tuples in a stable order
+    """
+    from main import detect_input_type
+
+    pattern = "**/*" if recursive else "*"
+    files = sorted(p for p in directory.glob(pattern) if p.is_file() and detect_input_type(str(p)))
+    return [(str(p.resolve()), patient_id) for p in files]
+
+
+def collect_manifest(manifest: Path, default_patient: str) -> list:
+    """
+    Reads a CSV or JSONL manifest of files and patient IDs
+
+    Args:
+        manifest: Path to the manifest
+        default_patient: Patient ID for rows that do not name one
+
+    Returns:
+        List of (file path, patient_id) tuples in manifest order
+    """
+    rows = []
+
+    with open(manifest, newline="", encoding="utf-8") as f:
+        if manifest.suffix.lower() == ".jsonl":
+            rows = [json.loads(line) for line in f if line.strip()]
+        else:
+            rows = list(csv.DictReader(f))
+
+    entries = []
+    for row in rows:
+        file_path = Path(row["file"]).expanduser()
+        if not file_path.is_absolute():
+            file_path = manifest.parent / file_path
+        entries.append((str(file_path.resolve()), row.get("patient_id") or default_patient))
+
+    return entries
+
+
+def load_completed(output_path: Path) -> set:
+    """
+    Reads the (file, patient_id) pairs already finished in a previous run
+
+    Failed rows are not counted, so they are retried. Neither are skipped
+    rows: those are checked against the report index again, which only
+    lists reports that finished.
+    """
+    completed = set()
+
+    if not output_path.exists():
+        return completed
+
+    with open(output_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:
+                # A run killed mid-write can leave a partial last line
+                continue
+            if row.get("status") in ["done", "duplicate"]:
+                completed.add((row.get("file"), row.get("patient_id")))
+
+    return completed
+
+
+def format_eta(seconds: float) -> str:
+    if seconds is None:
+        return "--:--:--"
+    seconds = int(seconds)
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+class ResultWriter:
+    """
+    Appends result lines to the output file and prints progress
+
+    Every line is flushed as soon as it is written, so a crash loses at
+    most the reports that were still in flight.
+    """
+
+    def __init__(self, output_path: Path, total: int):
+        self.total = total
+        self.finished = 0
+        self.failed = 0
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._file = open(output_path, "a", encoding="utf-8")
+
+    def write(self, row: dict):
+        with self._lock:
+            if self._closed:
+                # A worker finishing after an interrupt; a finished report is
+                # in the report index, so the rerun records it as skipped
+                return
+            self._file.write(json.dumps(row, ensure_ascii=False) + "\n")
+            self._file.flush()
+
+            self.finished += 1
+            if row["status"] == "failed":
+                self.failed += 1
+
+            elapsed = time.perf_counter() - self.started
+            rate = self.finished / elapsed if elapsed > 0 else 0
+            eta = (self.total - self.finished) / rate if rate > 0 else None
+
+            print(
+                f"[{self.finished}/{self.total}] {row['status']:<9} {Path(row['file']).name}  "
+                f"{row['patient_id']}  {row.get('report_id') or ''}  "
+                f"| {rate * 60:.1f} reports/min, ETA {format_eta(eta)}"
+            )
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            self._file.close()
+
+
+def ingest_file(cmd_dict: dict) -> dict:
+    """
+    Runs one file through the report workflow
+
+    Args:
+        cmd_dict: Dictionary with file_path, patient_id and input_type
+
+    Returns:
+        Result row for the JSONL output
+    """
+    from graph.workflow import run_report_workflow
+
+    start = time.perf_counter()
+    row = {
+        "file": cmd_dict["file_path"],
+        "patient_id": cmd_dict["patient_id"],
+        "input_type": cmd_dict["input_type"]
+    }
+
+    try:
+        result = run_report_workflow(
+            input_type=cmd_dict["input_type"],
+            file_path=cmd_dict["file_path"],
+            patient_id=cmd_dict["patient_id"]
+        )
+
+        if result.get("error"):
+            row.update(status="failed", error=result["error"])
+        else:
+            row.update(
+                status="duplicate" if result.get("duplicate_of") else "done",
+                report_id=(result.get("report_metadata") or {}).get("report_id"),
+                file_sha256=result.get("file_hash"),
+                summary=result.get("summary")
+            )
+    except Exception as e:
+        row.update(status="failed", error=str(e))
+
+    row["elapsed_seconds"] = round(time.perf_counter() - start, 3)
+    return row
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    # Stage parallelism is read from the environment when config.settings is imported
+    if args.ocr_workers is not None:
+        os.environ["OCR_WORKERS"] = str(args.ocr_workers)
+    if args.stt_workers is not None:
+        os.environ["STT_WORKERS"] = str(args.stt_workers)
+
+    from config.settings import DEFAULT_PATIENT_ID, INGEST_WORKERS, require_google_api_key
+    from main import detect_input_type
+    from service.job_queue import IngestQueue
+    from observability.metrics import dump_metrics
+    from tools.report_index import hash_file, find_report_by_file
+
+    require_google_api_key()
+
+    source = Path(args.source).expanduser()
+    patient_id = args.patient or DEFAULT_PATIENT_ID
+
+    if source.is_dir():
+        entries = collect_directory(source, patient_id, recursive=not args.no_recursive)
+    elif source.is_file():
+        entries = collect_manifest(source, patient_id)
+    else:
+        print(f"ERROR: Not a directory or manifest: {source}")
+        sys.exit(1)
+
+    output_path = Path(args.output)
+    completed = load_completed(output_path)
+    pending = [entry for entry in entries if entry not in completed]
+
+    print(f"📦 {len(entries)} files, {len(entries) - len(pending)} already done, {len(pending)} to ingest")
+
+    workers = args.workers or INGEST_WORKERS
+    writer = ResultWriter(output_path, total=len(pending))
+    queue = IngestQueue(
+        runner=lambda cmd_dict: writer.write(ingest_file(cmd_dict)),
+        workers=workers,
+        max_pending=workers * 2
+    )
+
+    try:
+        for file_path, file_patient in pending:
+            row = {"file": file_path, "patient_id": file_patient}
+            input_type = detect_input_type(file_path)
+
+            if not Path(file_path).exists() or input_type is None:
+                reason = "File not found" if not Path(file_path).exists() else "Unsupported file type"
+                writer.write(dict(row, status="failed", error=reason))
+                continue
+
+            # Files ingested by an earlier run (or from another source) are in the report
+            # index; reports an interrupted run left unfinished are not, and run again
+            existing_id = find_report_by_file(file_patient, hash_file(file_path))
+            if existing_id:
+                writer.write(dict(row, status="skipped", report_id=existing_id))
+                continue
+
+            # Blocks while `workers * 2` reports are queued or running
+            queue.submit({"file_path": file_path, "patient_id": file_patient, "input_type": input_type})
+
+        queue.shutdown(wait=True)
+
+    except KeyboardInterrupt:
+        print("\n⏹️  Interrupted; finished reports are saved. Rerun the same command to resume.")
+        queue.shutdown(wait=False)
+        writer.close()
+        dump_metrics()
+        sys.exit(130)
+
+    writer.close()
+    dump_metrics()
+
+    elapsed = time.perf_counter() - writer.started
+    print(
+        f"\n✅ Ingested {writer.finished} files in {format_eta(elapsed)} "
+        f"({writer.failed} failed). Results: {output_path}"
+    )
+
+    if writer.failed:
+        sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+"""
+Benchmark: end-to-end workflows, offline and reproducible
+
+Runs the real report and search graphs against a scratch storage directory
+with the network dependencies replaced:
+
+    LLM             - benchmarks.fake_llm (scripted, optional fixed latency)
+    embeddings      - deterministic hash embeddings (--real-embeddings to
+                      load the sentence-transformers model instead)
+    IP geolocation  - fixed location
+    Google Maps     - fixed list of doctors
+
+OCR (EasyOCR), STT (Whisper), Chroma and the report index are the real
+ones. Scenarios:
+
+    text    - typed lab report
+    pdf     - scanned multi-page PDF (--pdf-pages)
+    image   - scanned PNG
+    audio   - dictation WAV (--audio-seconds)
+    chat    - question about the stored history
+    search  - doctor search for the patient
+
+Each scenario runs --iterations times with fresh content (so duplicate
+detection never short-circuits). The first iteration is reported as cold;
+p50/p95 are over the warm ones. Per-stage latency comes from the trace
+spans of each run.
+
+Usage:
+    python -m benchmarks.bench_e2e --iterations 5 --output e2e.json
+    python -m benchmarks.bench_e2e --save-baseline benchmarks/e2e_baseline.json
+    python -m benchmarks.bench_e2e --baseline benchmarks/e2e_baseline.json --tolerance 0.2
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import resource
+import tempfile
+from pathlib import Path
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+
+SCENARIOS = ["text", "pdf", "image", "audio", "chat", "search"]
+PATIENT_ID = "pt-bench"
+
+FAKE_LOCATION = {
+    "ip": "203.0.113.10",
+    "city": "Kolkata",
+    "state_prov": "West Bengal",
+    "country": "India",
+    "latitude": "22.57",
+    "longitude": "88.36"
+}
+
+
+def fake_doctors(doc_type, location):
+    """Fixed scraper results, shaped like tools.search.scrape_google_maps output"""
+    return [
+        {
+            "name": f"Dr. {name} ({doc_type})",
+            "address": f"{10 + i} Park Street, {location}",
+            "phone": f"+91 33 4000 {1000 + i}",
+            "rating": rating,
+            "reviews": reviews
+        }
+        for i, (name, rating, reviews) in enumerate([
+            ("Banerjee", 4.8, 320), ("Chatterjee", 4.5, 1200), ("Das", 4.9, 45),
+            ("Ghosh", 4.1, 610), ("Mukherjee", 4.6, 88), ("Roy", 3.9, 2100)
+        ])
+    ]
+
+
+def percentile(values: list, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def latency_stats(seconds: list) -> dict:
+    """Cold (first) latency plus p50/p95/mean over the warm runs, in ms"""
+    warm = seconds[1:] or seconds
+    return {
+        "runs": len(seconds),
+        "cold_ms": round(seconds[0] * 1000, 1) if seconds else 0.0,
+        "p50_ms": round(percentile(warm, 50) * 1000, 1),
+        "p95_ms": round(percentile(warm, 95) * 1000, 1),
+        "mean_ms": round(sum(warm) / len(warm) * 1000, 1) if warm else 0.0
+    }
+
+
+def peak_rss_mb() -> dict:
+    """Peak resident set size of this process and of its (OCR / STT) workers"""
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    scale = 1 / (1024 * 1024) if platform.system() == "Darwin" else 1 / 1024
+    return {
+        "self": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale, 1),
+        "children": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale, 1)
+    }
+
+
+def install_fakes(llm_latency: float, real_embeddings: bool):
+    """Swaps the LLM, embeddings, geolocation and scraper for offline stand-ins"""
+    from benchmarks.fake_llm import install_fake_llm
+    install_fake_llm(latency=llm_latency)
+
+    if not real_embeddings:
+        from langchain_core.embeddings import DeterministicFakeEmbedding
+        from tools.vector_store import set_embeddings
+        set_embeddings(DeterministicFakeEmbedding(size=384))
+
+    import agents.search_meta_agent.location_and_search_term as location_module
+    import agents.search_meta_agent.search_agent as search_module
+    location_module.get_user_location = lambda api_key: dict(FAKE_LOCATION)
+    search_module.scrape_google_maps = fake_doctors
+
+
+def make_input(scenario: str, iteration: int, work_dir: Path, args) -> dict:
+    """Builds the run_report_workflow arguments for one iteration"""
+    from benchmarks import synthetic
+
+    seed = 1000 * SCENARIOS.index(scenario) + iteration
+    if scenario == "text":
+        return {"input_type": "text", "text_input": synthetic.report_text(seed)}
+    if scenario == "chat":
+        return {"input_type": "text", "text_input": f"What was my last hemoglobin value? ({iteration})"}
+
+    if scenario == "pdf":
+        path = work_dir / f"report_{seed}.pdf"
+        synthetic.make_report_pdf(path, seed, pages=args.pdf_pages)
+    elif scenario == "image":
+        path = work_dir / f"report_{seed}.png"
+        synthetic.make_report_image(path, seed)
+    else:
+        path = work_dir / f"dictation_{seed}.wav"
+        synthetic.make_dictation_audio(path, seed, seconds=args.audio_seconds)
+    return {"input_type": scenario, "file_path": str(path)}
+
+
+def stage_breakdown(runs: list) -> dict:
+    """
+    Per-stage latency across runs, from their trace spans
+
+    Args:
+        runs: One span list per run
+
+    Returns:
+        Dictionary of "category:name" -> latency stats
+    """
+    per_stage = {}
+    for spans in runs:
+        totals = {}
+        for record in spans:
+            if record["category"] == "run":
+                continue
+            key = f"{record['category']}:{record['name']}"
+            totals[key] = totals.get(key, 0) + record["duration_us"] / 1e6
+        for key, seconds in totals.items():
+            per_stage.setdefault(key, []).append(seconds)
+    return {key: latency_stats(seconds) for key, seconds in sorted(per_stage.items())}
+
+
+def run_scenario(scenario: str, args, work_dir: Path) -> dict:
+    from graph.workflow import run_report_workflow, run_search_workflow
+    from observability.tracing import load_runs
+
+    seen = set(load_runs())
+    seconds, errors = [], 0
+
+    for iteration in range(args.iterations):
+        if scenario == "search":
+            start = time.perf_counter()
+            result = run_search_workflow(PATIENT_ID)
+        else:
+            kwargs = make_input(scenario, iteration, work_dir, args)
+            start = time.perf_counter()
+            result = run_report_workflow(patient_id=PATIENT_ID, **kwargs)
+        seconds.append(time.perf_counter() - start)
+        if result.get("error"):
+            errors += 1
+            print(f"  {scenario} #{iteration}: {result['error']}")
+
+    runs = load_runs()
+    new_runs = [spans for run_id, spans in runs.items() if run_id not in seen]
+
+    stats = latency_stats(seconds)
+    stats["errors"] = errors
+    stats["throughput_per_min"] = round(60 * len(seconds) / sum(seconds), 2) if sum(seconds) else 0.0
+    stats["stages"] = stage_breakdown(new_runs)
+    return stats
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list:
+    """
+    Lists warm p50 latencies and peak RSS that regressed beyond tolerance
+
+    Returns:
+        List of human-readable regressions (empty when within tolerance)
+    """
+    regressions = []
+    for scenario, stats in report["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(scenario)
+        if not previous or not previous.get("p50_ms"):
+            continue
+        if stats["p50_ms"] > previous["p50_ms"] * (1 + tolerance):
+            regressions.append(f"{scenario}: p50 {previous['p50_ms']} ms -> {stats['p50_ms']} ms")
+        if stats.get("errors", 0) > previous.get("errors", 0):
+            regressions.append(f"{scenario}: errors {previous.get('errors', 0)} -> {stats['errors']}")
+
+    for kind in ("self", "children"):
+        previous = baseline.get("peak_rss_mb", {}).get(kind)
+        current = report["peak_rss_mb"][kind]
+        if previous and current > previous * (1 + tolerance):
+            regressions.append(f"peak RSS ({kind}): {previous} MB -> {current} MB")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline end-to-end workflow benchmark")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--pdf-pages", type=int, default=3)
+    parser.add_argument("--audio-seconds", type=float, default=30)
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Seconds added to every fake LLM call")
+    parser.add_argument("--real-embeddings", action="store_true", help="Use the configured sentence-transformers model")
+    parser.add_argument("--output", help="Write the JSON report here")
+    parser.add_argument("--save-baseline", help="Write the JSON report here as the new baseline")
+    parser.add_argument("--baseline", help="Compare against this baseline; exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown vs. baseline (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    # Storage, traces and scratch files go to a throwaway directory; must be
+    # set before config.settings is imported
+    scratch = Path(tempfile.mkdtemp(prefix="medagent-e2e-"))
+    os.environ["STORAGE_DIR"] = str(scratch / "storage")
+    os.environ["TEMP_DIR"] = str(scratch / "temp")
+    os.environ["TRACE_ENABLED"] = "1"
+    os.environ["TRACE_FORMAT"] = "jsonl"
+    work_dir = scratch / "inputs"
+    work_dir.mkdir()
+
+    install_fakes(args.llm_latency, args.real_embeddings)
+
+    from observability.tracing import SPANS_FILE
+    print(f"Scratch storage: {scratch}")
+
+    # The search and chat scenarios read the history the report scenarios
+    # wrote; seed one report when they run on their own
+    if not set(args.scenarios) & {"text", "pdf", "image", "audio"}:
+        from benchmarks.synthetic import report_text
+        from graph.workflow import run_report_workflow
+        run_report_workflow(input_type="text", text_input=report_text(1), patient_id=PATIENT_ID)
+
+    started = time.perf_counter()
+    scenarios = {}
+    for scenario in args.scenarios:
+        print(f"\n=== {scenario} x{args.iterations} ===")
+        scenarios[scenario] = run_scenario(scenario, args, work_dir)
+        stats = scenarios[scenario]
+        print(f"  cold {stats['cold_ms']:.0f} ms | p50 {stats['p50_ms']:.0f} ms | p95 {stats['p95_ms']:.0f} ms | {stats['throughput_per_min']:.1f}/min | errors {stats['errors']}")
+
+    report = {
+        "config": {
+            "iterations": args.iterations,
+            "pdf_pages": args.pdf_pages,
+            "audio_seconds": args.audio_seconds,
+            "llm_latency": args.llm_latency,
+            "real_embeddings": args.real_embeddings,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cpus": os.cpu_count()
+        },
+        "wall_seconds": round(time.perf_counter() - started, 2),
+        "peak_rss_mb": peak_rss_mb(),
+        "trace_file": str(SPANS_FILE),
+        "scenarios": scenarios
+    }
+
+    print(f"\n{'scenario':<10}{'cold ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'per min':>10}{'errors':>8}")
+    print("-" * 58)
+    for scenario, stats in scenarios.items():
+        print(f"{scenario:<10}{stats['cold_ms']:>10.0f}{stats['p50_ms']:>10.0f}{stats['p95_ms']:>10.0f}{stats['throughput_per_min']:>10.1f}{stats['errors']:>8}")
+    print(f"\nPeak RSS: {report['peak_rss_mb']['self']} MB (process), {report['peak_rss_mb']['children']} MB (largest worker)")
+
+    for path in filter(None, [args.output, args.save_baseline]):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {path}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            print(f"\nRegressions beyond {args.tolerance:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.tolerance:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
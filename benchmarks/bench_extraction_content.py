@@ -0,0 +1,77 @@
+"""
+Benchmark: report text from AgentState vs. re-reading the chunks from Chroma
+
+Stores synthetic reports in a throwaway Chroma directory, then times the
+old extraction input path (tools.extraction_tools.get_content, which
+looks the chunks up again and re-joins them) against reading the text
+already held in state. Also reports how much text the 300-char chunk
+overlap duplicates in the rebuilt version.
+
+Usage:
+    python -m benchmarks.bench_extraction_content --reports 20 --chars 12000
+"""
+import os
+import time
+import random
+import argparse
+import statistics
+import tempfile
+from pathlib import Path
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+
+import tools.vector_store as vector_store
+import tools.report_index as report_index
+
+
+def synthetic_report(chars: int, rng: random.Random) -> str:
+    tests = ["Hemoglobin", "Glucose", "Creatinine", "Cholesterol", "TSH", "Platelets", "WBC", "ALT"]
+    lines = ["LAB REPORT 2024-03-14", "Patient: pt-bench"]
+    while sum(len(line) + 1 for line in lines) < chars:
+        test = rng.choice(tests)
+        lines.append(f"{test}: {rng.uniform(1, 300):.1f} units (ref 10-200) - remarks for {test.lower()} within range.")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--reports", type=int, default=20)
+    parser.add_argument("--chars", type=int, default=12000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        vector_store.CHROMA_DIR = Path(tmp) / "chroma"
+        report_index.REPORT_INDEX_DB = Path(tmp) / "report_index.db"
+
+        from tools.document_tools import store_content
+        from tools.extraction_tools import get_content
+
+        rng = random.Random(7)
+        stored = []
+        for _ in range(args.reports):
+            text = synthetic_report(args.chars, rng)
+            metadata = store_content(text, patient_id="pt-bench")
+            stored.append((metadata, text))
+
+        chroma_times, state_times, inflation = [], [], []
+        for metadata, text in stored:
+            start = time.perf_counter()
+            rebuilt = get_content(str(metadata))
+            chroma_times.append(time.perf_counter() - start)
+
+            state = {"extracted_text": text}
+            start = time.perf_counter()
+            content = state.get("extracted_text") or None
+            state_times.append(time.perf_counter() - start)
+
+            inflation.append(len(rebuilt) / len(content) - 1)
+
+    print(f"\nReports: {args.reports} x ~{args.chars} chars")
+    print(f"Chroma re-read : mean {statistics.mean(chroma_times) * 1000:8.2f} ms  p50 {statistics.median(chroma_times) * 1000:8.2f} ms")
+    print(f"State read     : mean {statistics.mean(state_times) * 1000:8.4f} ms")
+    print(f"Saved per ingest: {(statistics.mean(chroma_times) - statistics.mean(state_times)) * 1000:.2f} ms")
+    print(f"Text duplicated by chunk overlap in the re-read: {statistics.mean(inflation) * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Benchmark: LangGraph orchestration overhead per request
+
+Replaces the agent modules with trivial stubs so only graph work is timed,
+then compares, per invocation:
+
+    rebuild  - create_report_workflow() + invoke (the old per-request path)
+    cached   - get_report_workflow() + invoke (compiled once, reused)
+    direct   - calling the four stub agents by hand (no graph at all)
+
+The same is done for the search workflow.
+
+Usage:
+    python -m benchmarks.bench_graph_overhead --iterations 500
+"""
+import os
+import sys
+import time
+import types
+import argparse
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+
+
+def _step(next_step: str, **fields):
+    def node(state):
+        state.update(fields)
+        state["next_step"] = next_step
+        return state
+    return node
+
+
+STUBS = {
+    "agents.head_meta_agent.head_agent": {
+        "process_input": _step("save_document", extracted_text="stub report"),
+        "save_document": _step("extract_findings", report_metadata={"report_id": "RPT-1"}),
+    },
+    "agents.clinical_meta_agent.clinical_agent": {
+        "extract_findings": _step("summarize", findings={"findings": []}),
+        "summarize_report": _step("end", summary="stub summary", final_response="done"),
+    },
+    "agents.search_meta_agent.search_meta_agent": {
+        "get_search_parameters": _step("search_doctors", search_params={"doctor_type": "GP"}),
+        "find_doctors": _step("end", final_response="doctors"),
+        "handle_search_error": _step("end"),
+    },
+}
+
+
+def install_stubs():
+    """Registers stub agent modules so graph nodes import them instead of the real agents"""
+    for name, functions in STUBS.items():
+        module = types.ModuleType(name)
+        for attr, fn in functions.items():
+            setattr(module, attr, fn)
+        sys.modules[name] = module
+
+
+def time_per_call(fn, iterations: int) -> float:
+    """Returns mean microseconds per call"""
+    fn()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    install_stubs()
+    from graph.state import create_initial_state
+    from graph import workflow
+
+    head = sys.modules["agents.head_meta_agent.head_agent"]
+    clinical = sys.modules["agents.clinical_meta_agent.clinical_agent"]
+    search = sys.modules["agents.search_meta_agent.search_meta_agent"]
+
+    def report_state():
+        return create_initial_state(input_type="text", text_input="stub", patient_id="pt-bench")
+
+    def direct_report():
+        state = report_state()
+        for fn in (head.process_input, head.save_document, clinical.extract_findings, clinical.summarize_report):
+            state = fn(state)
+
+    def direct_search():
+        state = create_initial_state(patient_id="pt-bench")
+        for fn in (search.get_search_parameters, search.find_doctors):
+            state = fn(state)
+
+    scenarios = [
+        ("report", "rebuild", lambda: workflow.create_report_workflow().invoke(report_state())),
+        ("report", "cached", lambda: workflow.get_report_workflow().invoke(report_state())),
+        ("report", "direct", direct_report),
+        ("search", "rebuild", lambda: workflow.create_search_workflow().invoke(create_initial_state(patient_id="pt-bench"))),
+        ("search", "cached", lambda: workflow.get_search_workflow().invoke(create_initial_state(patient_id="pt-bench"))),
+        ("search", "direct", direct_search),
+    ]
+
+    print(f"\n{'workflow':<10}{'mode':<10}{'us/call':>12}{'overhead us':>14}")
+    print("-" * 46)
+    results = {}
+    for graph_name, mode, fn in scenarios:
+        results[(graph_name, mode)] = time_per_call(fn, args.iterations)
+
+    for graph_name, mode, _ in scenarios:
+        us = results[(graph_name, mode)]
+        overhead = us - results[(graph_name, "direct")]
+        print(f"{graph_name:<10}{mode:<10}{us:>12.1f}{overhead:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+"""
+Benchmark: shared LLM limiter against a throttling fake provider
+
+Starts a local HTTP endpoint that behaves like a rate-limited LLM API:
+- It enforces a requests-per-minute quota and a concurrency cap.
+- Calls over either limit get 429 RESOURCE_EXHAUSTED with a "retry in Ns" hint.
+
+Many worker threads then call it through agents.llm.get_llm(), under three
+limiter configurations:
+
+    unprotected  - no rate limit, no retries (what the agents did before)
+    retry-only   - no rate limit, jittered exponential backoff on 429
+    limited      - token bucket and in-flight cap matched to the quota, plus backoff
+
+Reports successful and failed calls, 429s served, wall time and per-call
+latency, and the limiter's counters.
+
+Usage:
+    python -m benchmarks.bench_llm_limiter --workers 8 --calls 10 --server-rpm 120
+"""
+import os
+import json
+import time
+import argparse
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, List, Optional
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+os.environ.setdefault("LLM_CACHE_ENABLED", "0")
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+
+class FakeProvider:
+    """
+    Quota-enforcing fake LLM endpoint (token bucket plus concurrency cap)
+    """
+
+    def __init__(self, rpm: float, burst: int, concurrency: int, latency: float):
+        self.rate = rpm / 60.0
+        self.burst = burst
+        self.concurrency = concurrency
+        self.latency = latency
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.active = 0
+        self.served = 0
+        self.throttled = 0
+        self.lock = threading.Lock()
+
+    def admit(self) -> Optional[float]:
+        """Returns None when the call is admitted, else the suggested retry delay"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens < 1 or self.active >= self.concurrency:
+                self.throttled += 1
+                return max(0.1, (1 - self.tokens) / self.rate)
+            self.tokens -= 1
+            self.active += 1
+            return None
+
+    def done(self):
+        with self.lock:
+            self.active -= 1
+            self.served += 1
+
+    def reset_counts(self):
+        with self.lock:
+            self.served = 0
+            self.throttled = 0
+
+    def serve(self) -> ThreadingHTTPServer:
+        provider = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                prompt = json.loads(self.rfile.read(length) or b"{}").get("prompt", "")
+                retry_after = provider.admit()
+
+                if retry_after is not None:
+                    status, payload = 429, {"error": {
+                        "code": 429,
+                        "status": "RESOURCE_EXHAUSTED",
+                        "message": f"Quota exceeded. Please retry in {retry_after:.1f}s"
+                    }}
+                else:
+                    time.sleep(provider.latency)
+                    provider.done()
+                    status, payload = 200, {"text": f"ok: {prompt[:40]}"}
+
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+class ProviderError(Exception):
+    def __init__(self, status_code: int, message: str):
+        super().__init__(f"{status_code} {message}")
+        self.status_code = status_code
+
+
+class HttpChatModel(BaseChatModel):
+    """
+    Chat model that posts the prompt to the fake provider
+    """
+
+    url: str
+    timeout: float = 30.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-http"
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager=None, **kwargs: Any) -> ChatResult:
+        prompt = "\n".join(str(message.content) for message in messages)
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps({"prompt": prompt}).encode("utf-8"),
+            headers={"Content-Type": "application/json"}
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                text = json.loads(response.read())["text"]
+        except urllib.error.HTTPError as e:
+            error = json.loads(e.read() or b"{}").get("error", {})
+            raise ProviderError(e.code, f"{error.get('status', '')}: {error.get('message', '')}")
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text))])
+
+
+def percentile(values: list, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))]
+
+
+def run_scenario(name: str, limiter, provider: FakeProvider, workers: int, calls: int) -> dict:
+    from agents.llm import get_llm
+    from agents.llm_limiter import set_limiter
+
+    set_limiter(limiter)
+    provider.reset_counts()
+    llm = get_llm(purpose="bench", cache=False)
+    latencies, failures = [], []
+
+    def one_call(i: int):
+        started = time.perf_counter()
+        try:
+            llm.invoke(f"{name} call {i}")
+            latencies.append(time.perf_counter() - started)
+        except Exception as e:
+            failures.append(str(e)[:80])
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(one_call, range(workers * calls)))
+    wall = time.perf_counter() - started
+
+    return {
+        "scenario": name,
+        "ok": len(latencies),
+        "failed": len(failures),
+        "served_429": provider.throttled,
+        "wall_s": round(wall, 2),
+        "p50_s": round(percentile(latencies, 50), 2),
+        "p95_s": round(percentile(latencies, 95), 2),
+        "limiter": limiter.snapshot()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared LLM limiter vs. a throttling fake provider")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--calls", type=int, default=10, help="Calls per worker")
+    parser.add_argument("--server-rpm", type=float, default=120)
+    parser.add_argument("--server-burst", type=int, default=4)
+    parser.add_argument("--server-concurrency", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.2, help="Seconds per admitted call")
+    parser.add_argument("--retries", type=int, default=6)
+    args = parser.parse_args()
+
+    from agents.llm import set_llm_factory
+    from agents.llm_limiter import LLMLimiter
+
+    provider = FakeProvider(args.server_rpm, args.server_burst, args.server_concurrency, args.latency)
+    server = provider.serve()
+    url = f"http://127.0.0.1:{server.server_address[1]}/generate"
+    set_llm_factory(lambda temperature=None, purpose="default", **kwargs: HttpChatModel(url=url), limited=True)
+
+    print(f"Fake provider: {args.server_rpm:.0f} rpm, burst {args.server_burst}, {args.server_concurrency} concurrent, {args.latency}s per call")
+    print(f"Load: {args.workers} workers x {args.calls} calls\n")
+
+    scenarios = [
+        ("unprotected", LLMLimiter(requests_per_minute=0, max_in_flight=args.workers, max_retries=0)),
+        ("retry-only", LLMLimiter(requests_per_minute=0, max_in_flight=args.workers, max_retries=args.retries, backoff_base=0.5)),
+        ("limited", LLMLimiter(
+            requests_per_minute=args.server_rpm,
+            burst=args.server_burst,
+            max_in_flight=args.server_concurrency,
+            max_retries=args.retries,
+            backoff_base=0.5
+        )),
+    ]
+
+    results = []
+    for name, limiter in scenarios:
+        print(f"=== {name} ===")
+        results.append(run_scenario(name, limiter, provider, args.workers, args.calls))
+        # Let the provider's bucket refill between scenarios
+        time.sleep(args.server_burst / max(provider.rate, 1e-6))
+
+    server.shutdown()
+
+    print(f"\n{'scenario':<14}{'ok':>6}{'failed':>8}{'429s':>7}{'retries':>9}{'wall s':>9}{'p50 s':>8}{'p95 s':>8}")
+    print("-" * 69)
+    for row in results:
+        print(
+            f"{row['scenario']:<14}{row['ok']:>6}{row['failed']:>8}{row['served_429']:>7}"
+            f"{row['limiter']['retries']:>9}{row['wall_s']:>9.2f}{row['p50_s']:>8.2f}{row['p95_s']:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark: direct OCR pipeline vs. ReAct OCR agent
+
+The LLM is replaced by a scripted FakeListLLM with a fixed per-call latency
+and the OCR tools are stubbed, so the numbers isolate the orchestration cost.
+
+Usage:
+    python -m benchmarks.bench_ocr_modes --runs 20 --llm-latency 0.8
+"""
+import os
+import time
+import argparse
+import statistics
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+
+from langchain_core.language_models.fake import FakeListLLM
+import agents.head_meta_agent.ocr_agent as ocr_agent
+
+
+PAGES = ["page_0.png", "page_1.png", "page_2.png"]
+OCR_RESULT = {"content": "Hemoglobin 13.5 g/dL\nGlucose 98 mg/dL", "confidence": 0.93}
+
+
+def stub_tools(ocr_latency: float):
+    """Replaces the OCR tools with deterministic stubs"""
+    def get_file_type(path):
+        return "pdf"
+
+    def convert_to_jpg(path):
+        return list(PAGES)
+
+    def get_ocr(imgs):
+        time.sleep(ocr_latency)
+        return dict(OCR_RESULT)
+
+    ocr_agent.get_file_type = get_file_type
+    ocr_agent.convert_to_jpg = convert_to_jpg
+    ocr_agent.get_ocr = get_ocr
+
+
+def scripted_llm(file_path: str, latency: float) -> FakeListLLM:
+    """Builds a fake LLM that replays a well-behaved ReAct trajectory"""
+    responses = [
+        f"I should detect the file type.\nAction: FileTypeDetector\nAction Input: {file_path}",
+        f"It is a PDF.\nAction: PDFtoImage\nAction Input: {file_path}",
+        f"Now run OCR.\nAction: OCRTool\nAction Input: {PAGES}",
+        f"I now know the final answer.\nFinal Answer: {OCR_RESULT}",
+    ]
+    return FakeListLLM(responses=responses, sleep=latency)
+
+
+def time_mode(fn, runs: int) -> list:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+        assert result["content"] == OCR_RESULT["content"], result
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="seconds per fake LLM call")
+    parser.add_argument("--ocr-latency", type=float, default=0.05, help="seconds per stubbed OCR call")
+    args = parser.parse_args()
+
+    stub_tools(args.ocr_latency)
+    file_path = "report.pdf"
+
+    direct = time_mode(lambda: ocr_agent.run_ocr_pipeline(file_path), args.runs)
+    agent = time_mode(
+        lambda: ocr_agent.run_ocr_agent(file_path, llm=scripted_llm(file_path, args.llm_latency)),
+        args.runs
+    )
+
+    print(f"\n{'mode':<10}{'mean (s)':>12}{'p50 (s)':>12}{'llm calls':>12}")
+    print("-" * 46)
+    print(f"{'direct':<10}{statistics.mean(direct):>12.4f}{statistics.median(direct):>12.4f}{0:>12}")
+    print(f"{'agent':<10}{statistics.mean(agent):>12.4f}{statistics.median(agent):>12.4f}{4:>12}")
+    print(f"\nSpeed-up: {statistics.mean(agent) / statistics.mean(direct):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
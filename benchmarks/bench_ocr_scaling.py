@@ -0,0 +1,63 @@
+"""
+Benchmark: multi-page OCR scaling across worker processes
+
+OCRs a synthetic PDF with 1/2/4/8 workers. Each pool is warmed with one
+untimed pass first so model loading is excluded, then the timed pass is
+checked against the single-worker output (same text, same confidence).
+
+Usage:
+    python -m benchmarks.bench_ocr_scaling --pages 30 --workers 1 2 4 8
+"""
+import os
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+
+from benchmarks.bench_pdf_memory import make_pdf
+from tools.ocr_tools import ocr_pdf, shutdown_ocr_workers
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=30)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--dpi", type=int, default=150)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = Path(tmp) / "scan.pdf"
+        make_pdf(pdf_path, args.pages)
+
+        baseline = None
+        baseline_time = None
+
+        print(f"\n{'workers':>8}{'seconds':>10}{'pages/s':>10}{'speed-up':>10}{'matches':>9}")
+        print("-" * 47)
+
+        for workers in args.workers:
+            ocr_pdf(str(pdf_path), dpi=args.dpi, workers=workers)
+
+            start = time.perf_counter()
+            result = ocr_pdf(str(pdf_path), dpi=args.dpi, workers=workers)
+            elapsed = time.perf_counter() - start
+
+            if baseline is None:
+                baseline, baseline_time = result, elapsed
+
+            matches = (
+                result["content"] == baseline["content"]
+                and abs(result["confidence"] - baseline["confidence"]) < 1e-9
+            )
+            print(
+                f"{workers:>8}{elapsed:>10.2f}{args.pages / elapsed:>10.2f}"
+                f"{baseline_time / elapsed:>9.2f}x{str(matches):>9}"
+            )
+
+        shutdown_ocr_workers()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark: peak memory of eager vs. streaming PDF rasterization
+
+Generates synthetic multi-page PDFs and renders them in a fresh child
+process per measurement, reporting the child's peak RSS. The eager mode
+reproduces the old behaviour (convert_from_path on the whole file); the
+streaming mode uses tools.ocr_tools.iter_pdf_arrays. OCR itself is not run.
+
+Usage:
+    python -m benchmarks.bench_pdf_memory --pages 10 40 80
+"""
+import os
+import sys
+import json
+import argparse
+import resource
+import subprocess
+import tempfile
+from pathlib import Path
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+
+
+def make_pdf(path: Path, pages: int, label: str = "Page"):
+    """Writes a synthetic A4 PDF with `pages` text pages"""
+    from PIL import Image, ImageDraw
+
+    images = []
+    for i in range(pages):
+        img = Image.new("RGB", (1240, 1754), "white")
+        draw = ImageDraw.Draw(img)
+        for line in range(40):
+            draw.text((80, 80 + line * 40), f"{label} {i + 1} line {line}: Hemoglobin 13.{line % 10} g/dL", fill="black")
+        images.append(img)
+
+    images[0].save(str(path), "PDF", save_all=True, append_images=images[1:], resolution=150)
+
+
+def render(mode: str, pdf_path: str, dpi: int) -> int:
+    """Renders every page in the requested mode, returns the number of pages seen"""
+    import numpy as np
+    # Imported in both modes so the baseline RSS is the same
+    from tools.ocr_tools import iter_pdf_arrays
+
+    if mode == "eager":
+        from pdf2image import convert_from_path
+        pages = convert_from_path(pdf_path, dpi=dpi)
+        arrays = [np.asarray(p.convert("RGB")) for p in pages]
+        return len(arrays)
+
+    count = 0
+    for array in iter_pdf_arrays(pdf_path, dpi=dpi):
+        count += 1
+        del array
+    return count
+
+
+def measure(mode: str, pdf_path: Path, dpi: int) -> dict:
+    """Runs one rendering pass in a child process and returns its peak RSS"""
+    cmd = [sys.executable, "-m", "benchmarks.bench_pdf_memory", "--child", mode, str(pdf_path), "--dpi", str(dpi)]
+    out = subprocess.run(cmd, check=True, capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, nargs="+", default=[10, 40, 80])
+    parser.add_argument("--dpi", type=int, default=200)
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "PDF"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        mode, pdf_path = args.child
+        pages = render(mode, pdf_path, args.dpi)
+        peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        print(json.dumps({"mode": mode, "pages": pages, "peak_rss_mb": round(peak_kb / 1024, 1)}))
+        return
+
+    print(f"\n{'pages':>6}{'eager peak (MB)':>18}{'streaming peak (MB)':>22}")
+    print("-" * 46)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for pages in args.pages:
+            pdf_path = Path(tmp) / f"synthetic_{pages}.pdf"
+            make_pdf(pdf_path, pages)
+
+            eager = measure("eager", pdf_path, args.dpi)
+            streaming = measure("streaming", pdf_path, args.dpi)
+            print(f"{pages:>6}{eager['peak_rss_mb']:>18.1f}{streaming['peak_rss_mb']:>22.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark: CLI startup import cost, with a regression budget
+
+Runs each scenario in a fresh interpreter under `python -X importtime`,
+sums the cumulative import time of the top-level imports, and checks that
+heavy subsystems were not pulled in:
+
+    cli   - `import main` (what `python main.py --help` pays)
+    chat  - the modules a text-only chat session imports
+
+Exits non-zero if the CLI import exceeds --budget-ms or any scenario
+imports a forbidden module.
+
+Usage:
+    python -m benchmarks.bench_startup --budget-ms 150
+"""
+import sys
+import argparse
+import subprocess
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SCENARIOS = {
+    "cli": {
+        "code": "import main",
+        "forbidden": ["torch", "easyocr", "whisper", "selenium", "langchain", "langgraph", "chromadb", "numpy"],
+    },
+    "chat": {
+        "code": (
+            "import main, graph.workflow, agents.head_meta_agent.head_agent, "
+            "agents.head_meta_agent.chat_agent"
+        ),
+        "forbidden": ["easyocr", "whisper", "selenium", "pdf2image", "tools.ocr_tools", "tools.stt_tools"],
+    },
+}
+
+
+def import_profile(code: str) -> tuple:
+    """
+    Runs `code` under -X importtime
+
+    Returns:
+        Tuple of (total cumulative microseconds, set of imported module names)
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=str(ROOT),
+        capture_output=True,
+        text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Import failed for {code!r}:\n{proc.stderr[-2000:]}")
+
+    total_us = 0
+    modules = set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative, raw_name = line[len("import time:"):].split("|")
+        modules.add(raw_name.strip())
+        # Top-level entries are not indented; their cumulative time covers their children
+        if not raw_name.startswith("  "):
+            total_us += int(cumulative)
+
+    return total_us, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--budget-ms", type=float, default=150.0, help="max import time for `import main`")
+    parser.add_argument("--runs", type=int, default=3, help="best of N runs")
+    args = parser.parse_args()
+
+    failed = False
+    print(f"\n{'scenario':<10}{'import ms':>12}  forbidden modules loaded")
+    print("-" * 60)
+
+    for name, scenario in SCENARIOS.items():
+        timings = []
+        modules = set()
+        for _ in range(args.runs):
+            total_us, modules = import_profile(scenario["code"])
+            timings.append(total_us / 1000)
+
+        loaded = sorted(
+            mod for mod in modules
+            if any(mod == bad or mod.startswith(bad + ".") for bad in scenario["forbidden"])
+        )
+        best = min(timings)
+        print(f"{name:<10}{best:>12.1f}  {', '.join(loaded) if loaded else '-'}")
+
+        if loaded:
+            failed = True
+        if name == "cli" and best > args.budget_ms:
+            print(f"  CLI import {best:.1f} ms exceeds budget of {args.budget_ms:.1f} ms")
+            failed = True
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
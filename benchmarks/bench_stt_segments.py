@@ -0,0 +1,85 @@
+"""
+Benchmark: in-process vs. segment-parallel Whisper transcription
+
+Writes a synthetic dictation (voiced tone bursts separated by short pauses)
+to a WAV file and transcribes it with 1/2/4 workers. Worker pools and the
+in-process model are warmed with a short clip first so model loading is
+excluded. Also checks that segment timestamps are monotonic.
+
+Usage:
+    python -m benchmarks.bench_stt_segments --minutes 20 --workers 1 2 4
+"""
+import os
+import time
+import wave
+import argparse
+import tempfile
+from pathlib import Path
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+
+import numpy as np
+from tools.stt_tools import SAMPLE_RATE, split_on_silence, transcribe_segments, shutdown_stt_workers
+
+
+def make_dictation(path: Path, seconds: float, seed: int = 3):
+    """Writes a 16 kHz mono WAV of 'utterances' (modulated tones) split by pauses"""
+    rng = np.random.default_rng(seed)
+    chunks = []
+    elapsed = 0.0
+    while elapsed < seconds:
+        talk = rng.uniform(2.0, 8.0)
+        pause = rng.uniform(0.3, 1.2)
+        t = np.arange(int(talk * SAMPLE_RATE)) / SAMPLE_RATE
+        pitch = rng.uniform(120, 220)
+        voiced = 0.3 * np.sin(2 * np.pi * pitch * t) * (0.6 + 0.4 * np.sin(2 * np.pi * 3 * t))
+        chunks.append(voiced + 0.01 * rng.standard_normal(len(t)))
+        chunks.append(0.001 * rng.standard_normal(int(pause * SAMPLE_RATE)))
+        elapsed += talk + pause
+
+    audio = np.concatenate(chunks)[: int(seconds * SAMPLE_RATE)]
+    pcm = (np.clip(audio, -1, 1) * 32767).astype(np.int16)
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        f.writeframes(pcm.tobytes())
+    return audio.astype(np.float32)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--minutes", type=float, default=20)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        clip = Path(tmp) / "dictation.wav"
+        warmup = Path(tmp) / "warmup.wav"
+        audio = make_dictation(clip, args.minutes * 60)
+        make_dictation(warmup, 300)
+
+        ranges = split_on_silence(audio)
+        print(f"\n{args.minutes:.0f} min clip -> {len(ranges)} segments")
+
+        print(f"\n{'workers':>8}{'seconds':>10}{'x realtime':>12}{'segments':>10}{'monotonic':>11}")
+        print("-" * 51)
+        for workers in args.workers:
+            transcribe_segments(str(warmup), workers=workers)
+
+            start = time.perf_counter()
+            result = transcribe_segments(str(clip), workers=workers)
+            elapsed = time.perf_counter() - start
+
+            starts = [seg["start"] for seg in result["segments"]]
+            monotonic = all(a <= b for a, b in zip(starts, starts[1:]))
+            print(
+                f"{workers:>8}{elapsed:>10.1f}{result['duration'] / elapsed:>12.1f}"
+                f"{len(result['segments']):>10}{str(monotonic):>11}"
+            )
+
+        shutdown_stt_workers()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Benchmark: summarization prompt size and latency as patient history grows
+
+For each history size N, the benchmark writes N synthetic finding documents
+for one patient to a scratch Chroma store. It then summarizes the newest
+report two ways:
+
+    full     - every earlier report in the prompt (what run_summarization
+               did before the rolling summary)
+    rolling  - the running history summary plus the last
+               SUMMARY_WINDOW_REPORTS reports (run_summarization now)
+
+Prompt tokens are estimated at about four characters per token. The
+scripted LLM sleeps --latency plus --token-latency per 1000 prompt tokens,
+which approximates provider prefill time. Each rolling run is given a
+running summary of typical size covering the earlier reports, as if they
+had been summarized one by one.
+
+Usage:
+    python -m benchmarks.bench_summary_history --sizes 1 10 100 1000
+"""
+import os
+import json
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+
+PATIENT_ID = "pt-history"
+TYPICAL_HISTORY = (
+    "Type 2 diabetes since 2021 with HbA1c trending from 8.1% down to 6.9% on metformin; "
+    "LDL persistently above 130 mg/dL despite statin since 2022; mild normocytic anemia "
+    "(Hb 11-12 g/dL) on and off; creatinine stable at 0.9-1.1 mg/dL; TSH normal. "
+) * 3
+
+
+def add_reports(store, start: int, end: int):
+    """Writes findings documents for reports start+1..end"""
+    from benchmarks.synthetic import lab_values
+
+    texts, metadatas = [], []
+    for n in range(start + 1, end + 1):
+        values = lab_values(n)
+        texts.append(json.dumps({
+            "findings": [f"{name} is {'elevated' if flag == 'HIGH' else 'low'} at {value} {unit}" for name, value, unit, flag in values if flag],
+            "values": {name: f"{value} {unit}" for name, value, unit, flag in values}
+        }))
+        metadatas.append({"patient_id": PATIENT_ID, "report_id": f"RPT-{n}", "report_date": f"2024-{1 + n % 12:02d}-{1 + n % 28:02d}"})
+    for i in range(0, len(texts), 500):
+        store.add_texts(texts=texts[i:i + 500], metadatas=metadatas[i:i + 500])
+
+
+def summarize_full(patient_id: str) -> str:
+    """The pre-rolling path: all findings, every earlier report in the prompt"""
+    from tools.summarizer_tools import get_all_findings
+    from agents.clinical_meta_agent.summarizer_agent import SUMMARY_PROMPT, build_summary_inputs, create_summarizer_agent
+
+    reports = get_all_findings(patient_id)
+    inputs = build_summary_inputs(reports[-1], reports[:-1])
+    create_summarizer_agent().invoke(inputs)
+    return SUMMARY_PROMPT.format(**inputs)
+
+
+def summarize_rolling(patient_id: str, size: int) -> str:
+    from tools.report_index import save_running_summary
+    from tools.summarizer_tools import get_findings_window
+    from agents.clinical_meta_agent.summarizer_agent import SUMMARY_PROMPT, build_summary_inputs, run_summarization
+
+    if size > 1:
+        save_running_summary(patient_id, f"RPT-{size - 1}", TYPICAL_HISTORY, reports_covered=size - 1)
+    run_summarization(patient_id, report_id=f"RPT-{size}")
+
+    # The same inputs run_summarization built, for the token count
+    latest, recent, _ = get_findings_window(patient_id, report_id=f"RPT-{size}")
+    history = TYPICAL_HISTORY if size > 1 else None
+    return SUMMARY_PROMPT.format(**build_summary_inputs(latest, recent, history, size - 1))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarization prompt size vs. history length")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 50, 100, 250, 500, 1000])
+    parser.add_argument("--latency", type=float, default=0.3, help="Fixed seconds per LLM call")
+    parser.add_argument("--token-latency", type=float, default=0.05, help="Seconds per 1000 prompt tokens")
+    parser.add_argument("--context-window", type=int, default=1_000_000, help="Model context window, in tokens")
+    args = parser.parse_args()
+
+    scratch = Path(tempfile.mkdtemp(prefix="medagent-summary-"))
+    os.environ["STORAGE_DIR"] = str(scratch / "storage")
+    os.environ["TEMP_DIR"] = str(scratch / "temp")
+    os.environ["LLM_CACHE_ENABLED"] = "0"
+    os.environ["LLM_REQUESTS_PER_MINUTE"] = "0"
+    os.environ["TRACE_ENABLED"] = "0"
+
+    from langchain_core.embeddings import DeterministicFakeEmbedding
+    from tools.vector_store import set_embeddings, get_vector_store
+    from benchmarks.fake_llm import install_fake_llm, estimate_tokens
+    from config.settings import FINDINGS_COLLECTION, SUMMARY_WINDOW_REPORTS
+
+    set_embeddings(DeterministicFakeEmbedding(size=384))
+    install_fake_llm(latency=args.latency, token_latency=args.token_latency)
+    store = get_vector_store(FINDINGS_COLLECTION)
+
+    print(f"Rolling window: {SUMMARY_WINDOW_REPORTS} reports; LLM: {args.latency}s + {args.token_latency}s per 1k tokens\n")
+    print(f"{'reports':>8}{'full tokens':>13}{'full s':>9}{'rolling tokens':>16}{'rolling s':>11}")
+    print("-" * 57)
+
+    written = 0
+    rows = []
+    for size in sorted(set(args.sizes)):
+        add_reports(store, written, size)
+        written = size
+
+        started = time.perf_counter()
+        full_prompt = summarize_full(PATIENT_ID)
+        full_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        rolling_prompt = summarize_rolling(PATIENT_ID, size)
+        rolling_seconds = time.perf_counter() - started
+
+        row = {
+            "reports": size,
+            "full_tokens": estimate_tokens(full_prompt),
+            "full_seconds": round(full_seconds, 3),
+            "rolling_tokens": estimate_tokens(rolling_prompt),
+            "rolling_seconds": round(rolling_seconds, 3)
+        }
+        rows.append(row)
+        overflow = "  (exceeds context window)" if row["full_tokens"] > args.context_window else ""
+        print(f"{size:>8}{row['full_tokens']:>13}{full_seconds:>9.2f}{row['rolling_tokens']:>16}{rolling_seconds:>11.2f}{overflow}")
+
+    if len(rows) > 1:
+        first, last = rows[0], rows[-1]
+        print(
+            f"\nFrom {first['reports']} to {last['reports']} reports: full prompt x{last['full_tokens'] / first['full_tokens']:.0f}, "
+            f"rolling prompt x{last['rolling_tokens'] / first['rolling_tokens']:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Secrets check: API keys never reach a recorded cassette
+
+Records calls that fail with the API key in their exception message:
+
+    http      - http_get to a closed local port (requests' ConnectionError
+                quotes the URL, query string included)
+    function  - a @recorded function whose error quotes a keyed URL
+
+and a successful http_get with the key in its query string. The check fails
+if the key appears anywhere in the cassette file.
+
+Usage:
+    python -m benchmarks.check_cassette_redaction
+"""
+import os
+import sys
+import socket
+import tempfile
+from pathlib import Path
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+
+from tools.cassettes import Cassette, set_cassette, http_get, recorded
+
+SECRET = "sk-cassette-check-8f3a1c"
+
+
+def closed_port() -> int:
+    """A local port with nothing listening on it"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@recorded
+def lookup(url: str):
+    raise RuntimeError(f"Lookup failed for url: {url}")
+
+
+def main():
+    path = Path(tempfile.mkdtemp(prefix="medagent-cassette-")) / "check.jsonl"
+    set_cassette(Cassette(path, mode="record"))
+    url = f"http://127.0.0.1:{closed_port()}/ipgeo?apiKey={SECRET}&ip=203.0.113.10"
+
+    errors = 0
+    for label, call in [("http", lambda: http_get(url, timeout=2)), ("function", lambda: lookup(url))]:
+        try:
+            call()
+            print(f"  {label}: expected the call to fail")
+            errors += 1
+        except Exception as e:
+            print(f"  {label}: failed as expected ({type(e).__name__})")
+
+    set_cassette(None)
+    text = path.read_text(encoding="utf-8")
+    recorded_errors = text.count('"error": "')
+
+    if recorded_errors < 2:
+        print(f"FAIL: expected 2 recorded errors, found {recorded_errors}")
+        sys.exit(1)
+    if SECRET in text:
+        print(f"FAIL: API key found in {path}")
+        sys.exit(1)
+    if errors:
+        sys.exit(1)
+    print(f"OK: {recorded_errors} failed calls recorded in {path} without the API key")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Concurrency check: several PDFs rasterized at once, each in its own job workspace
+
+Every job renders its PDF with convert_to_jpg inside job_workspace(). All
+jobs wait at a barrier before verifying, so every job's pages exist on disk
+at the same time. The check fails if any job:
+
+    - got the wrong number of pages, or a page from outside its workspace
+    - lost a page file, or found different pixels than a serial rendering
+    - left its workspace behind (including a job that fails on purpose)
+
+Usage:
+    python -m benchmarks.check_concurrent_workspaces --jobs 8 --pages 4
+"""
+import os
+import sys
+import hashlib
+import argparse
+import tempfile
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+
+from PIL import Image
+from config.settings import TEMP_DIR
+from tools.ocr_tools import convert_to_jpg, iter_pdf_pages
+from tools.workspace import job_workspace
+from benchmarks.bench_pdf_memory import make_pdf
+
+
+def pixel_hash(image) -> str:
+    return hashlib.sha256(image.convert("RGB").tobytes()).hexdigest()
+
+
+def reference_hashes(pdf_path: Path) -> list:
+    """Renders a PDF serially, in memory, for comparison"""
+    return [pixel_hash(page) for _, page in iter_pdf_pages(str(pdf_path))]
+
+
+def run_job(pdf_path: Path, expected: list, barrier: threading.Barrier, fail: bool) -> dict:
+    problems = []
+    workspace_path = None
+
+    try:
+        with job_workspace() as workspace:
+            workspace_path = workspace
+            paths = convert_to_jpg(str(pdf_path))
+            barrier.wait()
+
+            if len(paths) != len(expected):
+                problems.append(f"expected {len(expected)} pages, got {len(paths)}")
+
+            for index, path in enumerate(paths):
+                path = Path(path)
+                if path.parent != workspace:
+                    problems.append(f"page {index + 1} written outside the workspace: {path}")
+                if not path.exists():
+                    problems.append(f"page {index + 1} missing: {path}")
+                    continue
+                with Image.open(path) as img:
+                    if index < len(expected) and pixel_hash(img) != expected[index]:
+                        problems.append(f"page {index + 1} does not match the source PDF")
+
+            if fail:
+                raise RuntimeError("simulated job failure")
+    except RuntimeError as e:
+        if not fail:
+            problems.append(str(e))
+
+    if workspace_path is not None and workspace_path.exists():
+        problems.append(f"workspace not removed: {workspace_path}")
+
+    return {"pdf": pdf_path.name, "problems": problems}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=8)
+    parser.add_argument("--pages", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdfs = []
+        for i in range(args.jobs):
+            pdf = Path(tmp) / f"report_{i}.pdf"
+            # Same page count for every job so page file names collide if isolation breaks
+            make_pdf(pdf, args.pages, label=f"Report {i} page")
+            pdfs.append(pdf)
+
+        expected = {pdf: reference_hashes(pdf) for pdf in pdfs}
+        barrier = threading.Barrier(args.jobs)
+        # The last job fails after verifying, to check cleanup on error
+        with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+            results = list(pool.map(
+                lambda item: run_job(item[1], expected[item[1]], barrier, fail=item[0] == args.jobs - 1),
+                enumerate(pdfs)
+            ))
+
+    failed = False
+    for result in results:
+        status = "ok" if not result["problems"] else "; ".join(result["problems"])
+        print(f"{result['pdf']:<16}{status}")
+        failed = failed or bool(result["problems"])
+
+    leftovers = list(TEMP_DIR.glob("job-*"))
+    if leftovers:
+        print(f"Leftover workspaces in {TEMP_DIR}: {leftovers}")
+        failed = True
+
+    print("\nFAILED" if failed else f"\nOK: {args.jobs} concurrent jobs x {args.pages} pages, no page lost or mixed up")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
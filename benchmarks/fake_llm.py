@@ -0,0 +1,212 @@
+"""
+Deterministic stand-in for the Gemini chat model
+
+FakeClinicalChatModel answers each agent the way that agent expects, with
+no network access:
+
+    extraction      - JSON findings/values parsed from the report text
+    summarizer      - JSON summary built from the latest values
+    history         - JSON running summary counting the reports folded in
+    ReAct agents    - scripted tool calls, then a Final Answer
+
+The same prompt always produces the same answer, and a fixed latency per
+call can be injected, optionally growing with prompt size the way provider
+prefill time does. Install it for every agent with install_fake_llm().
+"""
+import re
+import json
+import time
+from typing import Any, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+
+VALUE_LINE = re.compile(r"^\s*([A-Za-z][A-Za-z0-9 ()/-]{1,40}?)\s*[:|]\s*([-+]?\d+(?:\.\d+)?)\s*([A-Za-z/%^0-9.]*)\s*(HIGH|LOW|H|L)?\s*$", re.MULTILINE)
+
+# ReAct scripts: tool calls made in order before the final answer
+REACT_SCRIPTS = {
+    "location_search": ["GetUserSummaries", "GetUserLocation"],
+    "search": ["GoogleMapsDoctorScraper"],
+    "chat": ["GetPatientHistory"],
+    "ocr": ["OCRTool"],
+    "stt": ["SpeechToText"],
+    "document_save": ["StoreContent"],
+    "extraction_agent": ["saveFindings"],
+}
+
+SPECIALISTS = [
+    (("glucose", "hba1c", "insulin"), "Endocrinologist"),
+    (("cholesterol", "ldl", "triglycerides", "troponin"), "Cardiologist"),
+    (("creatinine", "urea", "egfr"), "Nephrologist"),
+    (("hemoglobin", "platelet", "wbc"), "Hematologist"),
+]
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token)"""
+    return max(1, len(text) // 4)
+
+
+def parse_lab_values(text: str) -> tuple:
+    """
+    Reads "Name: value unit [HIGH|LOW]" lines from report text
+
+    Returns:
+        Tuple of (findings list, values dict)
+    """
+    findings, values = [], {}
+    for name, value, unit, flag in VALUE_LINE.findall(text):
+        name = name.strip()
+        values[name] = f"{value} {unit}".strip()
+        if flag:
+            direction = "elevated" if flag.upper().startswith("H") else "low"
+            findings.append(f"{name} is {direction} at {value} {unit}".strip())
+    if values and not findings:
+        findings.append("All measured values within reference ranges")
+    return findings, values
+
+
+def pick_specialist(text: str) -> str:
+    lowered = text.lower()
+    for keywords, specialist in SPECIALISTS:
+        if any(word in lowered for word in keywords):
+            return specialist
+    return "General Physician"
+
+
+class FakeClinicalChatModel(BaseChatModel):
+    """
+    Scripted chat model that plays every agent in the system
+    """
+
+    purpose: str = "default"
+    latency: float = 0.0
+    token_latency: float = 0.0
+    temperature: Optional[float] = None
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-clinical"
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager=None, **kwargs: Any) -> ChatResult:
+        prompt = "\n".join(str(message.content) for message in messages)
+        delay = self.latency + self.token_latency * estimate_tokens(prompt) / 1000
+        if delay:
+            time.sleep(delay)
+
+        if self.purpose in REACT_SCRIPTS:
+            text = self._react(prompt)
+        elif self.purpose == "extraction":
+            text = self._extraction(prompt)
+        elif self.purpose == "summarizer":
+            text = self._summary(prompt)
+        elif self.purpose == "history_summarizer":
+            text = self._history(prompt)
+        else:
+            text = "OK"
+
+        message = AIMessage(
+            content=text,
+            usage_metadata={
+                "input_tokens": estimate_tokens(prompt),
+                "output_tokens": estimate_tokens(text),
+                "total_tokens": estimate_tokens(prompt) + estimate_tokens(text)
+            }
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _extraction(self, prompt: str) -> str:
+        content = prompt.split("Report text:", 1)[-1]
+        findings, values = parse_lab_values(content)
+        return json.dumps({"findings": findings, "values": values})
+
+    def _summary(self, prompt: str) -> str:
+        latest = prompt.split("Latest findings and values:", 1)[-1].split("IMPORTANT:", 1)[0]
+        match = re.search(r'"values":\s*(\{.*?\})', latest, re.DOTALL)
+        try:
+            values = json.loads(match.group(1)) if match else {}
+        except json.JSONDecodeError:
+            values = {}
+        covered = re.search(r"\((\d+) earlier reports\)", prompt)
+        earlier = int(covered.group(1)) if covered else 0
+        recent = prompt.split("oldest first (findings and values):", 1)[-1].split("Latest findings and values:", 1)[0]
+        earlier = max(earlier, recent.count('"report_id"'))
+        return json.dumps({
+            "summary": f"Latest report lists {len(values)} measured values.",
+            "key_changes": "This is the first report on file." if not earlier else f"Compared against {earlier} earlier reports.",
+            "current_values": values,
+            "history_summary": f"{earlier + 1} reports on file. Most recent values: " + ", ".join(f"{k} {v}" for k, v in list(values.items())[:8])
+        })
+
+    def _history(self, prompt: str) -> str:
+        covered = re.search(r"\((\d+) reports\)", prompt)
+        reports = prompt.split("oldest first (findings and values):", 1)[-1].count('"report_id"')
+        total = (int(covered.group(1)) if covered else 0) + reports
+        return json.dumps({"history_summary": f"{total} reports on file."})
+
+    def _react(self, prompt: str) -> str:
+        # The zero-shot template describes "Observation:" once before "Begin!";
+        # only the scratchpad after it counts
+        scratchpad = prompt.rsplit("Begin!", 1)[-1]
+        observations = re.findall(r"Observation:(.*?)(?=\nThought:|\Z)", scratchpad, re.DOTALL)
+        script = REACT_SCRIPTS[self.purpose]
+
+        if len(observations) < len(script):
+            tool = script[len(observations)]
+            return f"Thought: I should use {tool}.\nAction: {tool}\nAction Input: {self._tool_input(tool, prompt)}"
+
+        return f"Thought: I now know the final answer\nFinal Answer: {self._final_answer(prompt, observations)}"
+
+    def _tool_input(self, tool: str, prompt: str) -> str:
+        if tool == "GoogleMapsDoctorScraper":
+            match = re.search(r'format: "([^"]+)"', prompt)
+            return match.group(1) if match else "General Physician, Kolkata"
+        match = re.search(r"(?:user_id|Patient ID):\s*(\S+)", prompt)
+        return match.group(1) if match else "none"
+
+    def _final_answer(self, prompt: str, observations: list) -> str:
+        last = observations[-1].strip() if observations else ""
+
+        if self.purpose == "location_search":
+            summary = observations[0] if observations else ""
+            location = observations[-1] if len(observations) > 1 else ""
+            city = re.search(r"['\"]city['\"]:\s*['\"]([^'\"]+)", location)
+            state = re.search(r"['\"]state_prov['\"]:\s*['\"]([^'\"]+)", location)
+            country = re.search(r"['\"]country['\"]:\s*['\"]([^'\"]+)", location)
+            return json.dumps({
+                "doctor_type": pick_specialist(summary),
+                "location": {
+                    "city": city.group(1) if city else "Unknown",
+                    "state": state.group(1) if state else "Unknown",
+                    "country": country.group(1) if country else "Unknown"
+                }
+            })
+
+        if self.purpose == "search":
+            return last
+
+        if self.purpose == "chat":
+            return f"Based on your records: {last[:300]}"
+
+        return last or "Done"
+
+
+def install_fake_llm(latency: float = 0.0, token_latency: float = 0.0):
+    """
+    Makes every agent factory return a FakeClinicalChatModel
+
+    Args:
+        latency: Seconds each call sleeps, to mimic provider latency
+        token_latency: Extra seconds per 1000 prompt tokens
+
+    Returns:
+        The previous factory (pass it to agents.llm.set_llm_factory to restore)
+    """
+    from agents.llm import set_llm_factory
+
+    def factory(temperature=None, purpose="default", **kwargs):
+        return FakeClinicalChatModel(purpose=purpose, latency=latency, token_latency=token_latency, temperature=temperature)
+
+    return set_llm_factory(factory)
@@ -0,0 +1,85 @@
+"""
+Stress test: report ID allocation under parallel ingests
+
+Several processes, each with several threads, allocate report numbers from
+a fresh sequence database at the same time. The sequence is seeded as if
+the collection already held RPT-1..RPT-<seed>. Exits non-zero if any ID is
+handed out twice or a number is skipped.
+
+Usage:
+    python -m benchmarks.stress_report_ids --processes 8 --threads 4 --per-thread 50
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import threading
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark")
+
+import tools.report_index as report_index
+
+
+SEED = 41
+
+
+def _seed() -> int:
+    # Simulates the one-off scan of the existing collection
+    time.sleep(0.2)
+    return SEED
+
+
+def _ingest_worker(db_path: str, threads: int, per_thread: int) -> list:
+    report_index.REPORT_INDEX_DB = Path(db_path)
+    allocated = []
+    lock = threading.Lock()
+
+    def run():
+        for _ in range(per_thread):
+            number = report_index.allocate_sequence("report_id", seed=_seed)
+            with lock:
+                allocated.append(f"RPT-{number}")
+
+    pool = [threading.Thread(target=run) for _ in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    return allocated
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--processes", type=int, default=8)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--per-thread", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / "report_index.db")
+
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=args.processes) as executor:
+            futures = [
+                executor.submit(_ingest_worker, db_path, args.threads, args.per_thread)
+                for _ in range(args.processes)
+            ]
+            ids = [report_id for f in futures for report_id in f.result()]
+        elapsed = time.perf_counter() - start
+
+    expected = {f"RPT-{n}" for n in range(SEED + 1, SEED + 1 + len(ids))}
+    duplicates = len(ids) - len(set(ids))
+
+    print(f"Allocated {len(ids)} IDs in {elapsed:.2f}s ({len(ids) / elapsed:.0f}/s)")
+    print(f"Duplicates: {duplicates}")
+    print(f"Contiguous from RPT-{SEED + 1}: {set(ids) == expected}")
+
+    if duplicates or set(ids) != expected:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
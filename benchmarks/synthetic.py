@@ -0,0 +1,122 @@
+"""
+Synthetic lab reports for benchmarks: text, scanned PDFs, images and dictations
+
+Everything is generated from a seed, so the same seed always yields the same
+report (and different seeds yield different file hashes, which keeps the
+duplicate-report index from short-circuiting benchmark runs).
+"""
+import random
+from datetime import date, timedelta
+from pathlib import Path
+
+
+# (name, unit, reference low, reference high)
+LAB_PANEL = [
+    ("Hemoglobin", "g/dL", 12.0, 17.0),
+    ("WBC", "10^3/uL", 4.0, 11.0),
+    ("Platelets", "10^3/uL", 150, 400),
+    ("Glucose", "mg/dL", 70, 100),
+    ("HbA1c", "%", 4.0, 5.6),
+    ("Total Cholesterol", "mg/dL", 125, 200),
+    ("LDL", "mg/dL", 50, 100),
+    ("HDL", "mg/dL", 40, 60),
+    ("Triglycerides", "mg/dL", 50, 150),
+    ("Creatinine", "mg/dL", 0.6, 1.3),
+    ("Urea", "mg/dL", 7, 20),
+    ("TSH", "mIU/L", 0.4, 4.0),
+]
+
+
+def lab_values(seed: int, panel_size: int = 8) -> list:
+    """
+    Draws a deterministic set of lab values, some outside their reference range
+
+    Returns:
+        List of (name, value, unit, flag) where flag is "HIGH", "LOW" or ""
+    """
+    rng = random.Random(seed)
+    values = []
+    for name, unit, low, high in rng.sample(LAB_PANEL, min(panel_size, len(LAB_PANEL))):
+        span = high - low
+        value = round(rng.uniform(low - 0.3 * span, high + 0.4 * span), 1)
+        flag = "HIGH" if value > high else "LOW" if value < low else ""
+        values.append((name, value, unit, flag))
+    return values
+
+
+def report_text(seed: int, patient_name: str = "Test Patient", panel_size: int = 8) -> str:
+    """
+    Builds the text of a blood test report
+
+    Args:
+        seed: Report seed
+        patient_name: Name printed on the report
+        panel_size: Number of lab values
+
+    Returns:
+        Report text with one "Name: value unit [FLAG]" line per value
+    """
+    report_date = date(2024, 1, 1) + timedelta(days=seed % 700)
+    lines = [
+        "CITY DIAGNOSTICS LABORATORY",
+        "Blood test - lab result report",
+        f"Patient: {patient_name}",
+        f"Report Date: {report_date.isoformat()}",
+        f"Sample ID: S-{seed:06d}",
+        ""
+    ]
+    for name, value, unit, flag in lab_values(seed, panel_size):
+        lines.append(f"{name}: {value} {unit} {flag}".rstrip())
+    lines += ["", "Reviewed by: Dr. A. Sen, MD (Pathology)"]
+    return "\n".join(lines)
+
+
+def _render_page(lines: list):
+    from PIL import Image, ImageDraw, ImageFont
+
+    page = Image.new("RGB", (1240, 1754), "white")
+    draw = ImageDraw.Draw(page)
+    try:
+        font = ImageFont.load_default(size=30)
+    except TypeError:
+        # Pillow < 10.1 has a single fixed-size bitmap font
+        font = ImageFont.load_default()
+    for i, line in enumerate(lines):
+        draw.text((90, 100 + i * 48), line, fill="black", font=font)
+    return page
+
+
+def make_report_image(path: Path, seed: int, patient_name: str = "Test Patient") -> str:
+    """
+    Writes a scanned-looking PNG of a report
+
+    Returns:
+        The report text drawn on the image
+    """
+    text = report_text(seed, patient_name)
+    _render_page(text.splitlines()).save(str(path), "PNG")
+    return text
+
+
+def make_report_pdf(path: Path, seed: int, pages: int = 1, patient_name: str = "Test Patient") -> str:
+    """
+    Writes a scanned (image-only) PDF; every page is a different report section
+
+    Returns:
+        The report text across all pages
+    """
+    texts = [report_text(seed * 100 + page, patient_name) for page in range(pages)]
+    images = [_render_page(text.splitlines()) for text in texts]
+    images[0].save(str(path), "PDF", save_all=True, append_images=images[1:], resolution=150)
+    return "\n\n".join(texts)
+
+
+def make_dictation_audio(path: Path, seed: int, seconds: float = 30) -> None:
+    """
+    Writes a 16 kHz mono WAV with speech-like bursts and pauses
+
+    The audio exercises segmentation and Whisper's latency; it does not
+    contain words.
+    """
+    from benchmarks.bench_stt_segments import make_dictation
+    make_dictation(path, seconds, seed=seed)
@@ -5,21 +5,49 @@ from dotenv import load_dotenv
 load_dotenv()
 
 BASE_DIR = Path(__file__).resolve().parent.parent
-STORAGE_DIR = BASE_DIR / "storage"
-TEMP_DIR = BASE_DIR / "temp"
+# Overridable so benchmarks and replays can run against a scratch copy
+STORAGE_DIR = Path(os.getenv("STORAGE_DIR", BASE_DIR / "storage"))
+TEMP_DIR = Path(os.getenv("TEMP_DIR", BASE_DIR / "temp"))
 CHROMA_DIR = STORAGE_DIR / "chroma"
-
-STORAGE_DIR.mkdir(exist_ok=True)
-TEMP_DIR.mkdir(exist_ok=True)
-CHROMA_DIR.mkdir(exist_ok=True)
+REPORT_INDEX_DB = STORAGE_DIR / "report_index.db"
+TRACE_DIR = STORAGE_DIR / "traces"
+METRICS_FILE = STORAGE_DIR / "metrics.prom"
+LLM_CACHE_DB = STORAGE_DIR / "llm_cache.db"
 
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 IPGEOLOCATION_API_KEY = os.getenv("IPGEOLOCATION_API_KEY")
 
 LLM_MODEL = "gemini-2.5-flash"
+
+# Disk-backed LLM response cache: identical prompts to the same model and
+# temperature are answered from LLM_CACHE_DB. Entries expire after the TTL and
+# the least recently used ones are evicted beyond LLM_CACHE_MAX_ENTRIES
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "1") == "1"
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000"))
+
+# Shared limits for every LLM call in the process: token bucket (requests per
+# minute, burst), concurrent calls, retries on throttling with jittered
+# exponential backoff, and the provider call timeout
+LLM_REQUESTS_PER_MINUTE = float(os.getenv("LLM_REQUESTS_PER_MINUTE", "60"))
+LLM_BURST = int(os.getenv("LLM_BURST", "10"))
+LLM_MAX_IN_FLIGHT = int(os.getenv("LLM_MAX_IN_FLIGHT", "4"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "5"))
+LLM_BACKOFF_BASE_SECONDS = float(os.getenv("LLM_BACKOFF_BASE_SECONDS", "1.0"))
+LLM_BACKOFF_MAX_SECONDS = float(os.getenv("LLM_BACKOFF_MAX_SECONDS", "60"))
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "120"))
 EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
 WHISPER_MODEL = "base"
 
+# Long recordings are split on silences and transcribed on STT_WORKERS processes
+STT_WORKERS = int(os.getenv("STT_WORKERS", "1"))
+STT_SEGMENT_SECONDS = 120
+STT_MIN_SILENCE_SECONDS = 0.4
+STT_SILENCE_THRESHOLD = 0.01
+
+# Run transcription through the ReAct agent instead of calling Whisper directly
+STT_USE_AGENT = False
+
 REPORT_COLLECTION = "patient-report-collection"
 FINDINGS_COLLECTION = "patient-report-findings"
 SUMMARY_COLLECTION = "patient-report-summaries"
@@ -27,10 +55,87 @@ SUMMARY_COLLECTION = "patient-report-summaries"
 OCR_LANGUAGES = ['en']
 OCR_GPU = True
 
+# Warm EasyOCR readers kept per language set (each one holds its own model weights)
+OCR_READER_POOL_SIZE = 1
+
+# OCR worker processes for multi-page documents (1 = OCR in-process)
+OCR_WORKERS = int(os.getenv("OCR_WORKERS", "1"))
+
+# PDF rasterization: resolution and number of pages rendered at once
+PDF_DPI = 200
+PDF_PAGE_WINDOW = 1
+
+# Use the embedded PDF text layer when a page has enough real text, OCR otherwise
+PDF_TEXT_LAYER = True
+PDF_TEXT_MIN_CHARS = 50
+
+# Run OCR through the ReAct agent instead of the direct pipeline
+OCR_USE_AGENT = False
+
+# Findings extraction: "structured" (one validated LLM call) or "agent" (ReAct agent)
+EXTRACTION_MODE = "structured"
+EXTRACTION_MAX_ATTEMPTS = 2
+
+# Summarization: the latest report, up to SUMMARY_WINDOW_REPORTS earlier ones and a
+# running history summary (capped at SUMMARY_HISTORY_MAX_CHARS) go into each prompt
+SUMMARY_WINDOW_REPORTS = int(os.getenv("SUMMARY_WINDOW_REPORTS", "5"))
+SUMMARY_HISTORY_MAX_CHARS = int(os.getenv("SUMMARY_HISTORY_MAX_CHARS", "4000"))
+# Batches of older reports folded into the running summary per summarization;
+# 0 leaves the backfill to `python -m agents.clinical_meta_agent.summarizer_agent backfill`
+SUMMARY_BACKFILL_BATCHES_PER_RUN = int(os.getenv("SUMMARY_BACKFILL_BATCHES_PER_RUN", "2"))
+
 CHUNK_SIZE = 1500
 CHUNK_OVERLAP = 300
 
 DEFAULT_PATIENT_ID = "pt-001"
 
-if not GOOGLE_API_KEY:
-    raise ValueError("GOOGLE_API_KEY not found in environment variables")
\ No newline at end of file
+# Daemon mode (python main.py --serve): local HTTP endpoint. POST /command needs
+# the token the daemon writes to SERVE_TOKEN_FILE (mode SERVE_TOKEN_FILE_MODE;
+# "640" shares it with the file's group), or SERVE_TOKEN when that is set.
+# Binding a non-loopback address needs SERVE_ALLOW_REMOTE=1 (or --allow-remote)
+SERVE_HOST = os.getenv("SERVE_HOST", "127.0.0.1")
+SERVE_PORT = int(os.getenv("SERVE_PORT", "8765"))
+SERVE_TOKEN = os.getenv("SERVE_TOKEN")
+SERVE_TOKEN_FILE = Path(os.getenv("SERVE_TOKEN_FILE", STORAGE_DIR / "daemon.token"))
+SERVE_TOKEN_FILE_MODE = int(os.getenv("SERVE_TOKEN_FILE_MODE", "600"), 8)
+SERVE_ALLOW_REMOTE = os.getenv("SERVE_ALLOW_REMOTE", "0") == "1"
+
+# Ingestion queue (--submit): worker threads, pending-job cap and finished jobs kept for --status
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", "2"))
+INGEST_MAX_PENDING = int(os.getenv("INGEST_MAX_PENDING", "16"))
+INGEST_HISTORY_LIMIT = 500
+
+# Latency tracing: spans per workflow run, appended to TRACE_DIR/spans.jsonl
+# ("chrome" also writes one Chrome-trace file per run). The file is rotated
+# once it reaches TRACE_MAX_BYTES, keeping TRACE_KEEP_FILES rotated files and
+# the newest TRACE_KEEP_CHROME Chrome traces
+TRACE_ENABLED = os.getenv("TRACE_ENABLED", "1") == "1"
+TRACE_FORMAT = os.getenv("TRACE_FORMAT", "jsonl")
+TRACE_MAX_BYTES = int(os.getenv("TRACE_MAX_BYTES", str(20 * 1024 * 1024)))
+TRACE_KEEP_FILES = int(os.getenv("TRACE_KEEP_FILES", "5"))
+TRACE_KEEP_CHROME = 100
+
+# Record/replay of LLM, geolocation and scraper I/O: "off", "record" or "replay".
+# CASSETTE_LATENCY on replay: "0" (none), "recorded" (original timings) or seconds per call
+CASSETTE_MODE = os.getenv("CASSETTE_MODE", "off")
+CASSETTE_FILE = Path(os.getenv("CASSETTE_FILE", STORAGE_DIR / "cassettes" / "session.jsonl"))
+CASSETTE_LATENCY = os.getenv("CASSETTE_LATENCY", "0")
+
+
+def ensure_directories():
+    """
+    Creates the storage and temp directories (called by the subsystems that write to them)
+    """
+    STORAGE_DIR.mkdir(parents=True, exist_ok=True)
+    TEMP_DIR.mkdir(parents=True, exist_ok=True)
+    CHROMA_DIR.mkdir(parents=True, exist_ok=True)
+
+
+def require_google_api_key() -> str:
+    """
+    Returns the Gemini API key, failing loudly if it is not configured
+    (a cassette replay makes no Gemini calls and does not need one)
+    """
+    if not GOOGLE_API_KEY and CASSETTE_MODE != "replay":
+        raise ValueError("GOOGLE_API_KEY not found in environment variables")
+    return GOOGLE_API_KEY
\ No newline at end of file
@@ -1,55 +1,80 @@
 from graph.state import AgentState
-from agents.head_meta_agent.head_agent import process_input, save_document
-from agents.clinical_meta_agent.clinical_agent import extract_findings, summarize_report
-from agents.search_meta_agent.search_meta_agent import get_search_parameters, find_doctors, handle_search_error
+from observability.tracing import traced
+from observability.metrics import timed_node
 
+# Agents are imported inside each node so that building the graph stays cheap
+# and only the subsystems a run actually reaches get loaded.
 
+
+@traced(category="node")
+@timed_node
 def input_node(state: AgentState) -> AgentState:
     """
     Initial node: Processes input through Head Meta Agent
     """
+    from agents.head_meta_agent.head_agent import process_input
     return process_input(state)
 
 
+@traced(category="node")
+@timed_node
 def document_save_node(state: AgentState) -> AgentState:
     """
     Saves document to ChromaDB
     """
+    from agents.head_meta_agent.head_agent import save_document
     return save_document(state)
 
 
+@traced(category="node")
+@timed_node
 def extraction_node(state: AgentState) -> AgentState:
     """
     Extracts findings through Clinical Meta Agent
     """
+    from agents.clinical_meta_agent.clinical_agent import extract_findings
     return extract_findings(state)
 
 
+@traced(category="node")
+@timed_node
 def summarization_node(state: AgentState) -> AgentState:
     """
     Generates summary through Clinical Meta Agent
     """
+    from agents.clinical_meta_agent.clinical_agent import summarize_report
     return summarize_report(state)
 
+@traced(category="node")
+@timed_node
 def search_params_node(state: AgentState) -> AgentState:
     """
     Gets search parameters (doctor type and location) through Search Meta Agent
     """
+    from agents.search_meta_agent.search_meta_agent import get_search_parameters
     return get_search_parameters(state)
 
 
+@traced(category="node")
+@timed_node
 def doctor_search_node(state: AgentState) -> AgentState:
     """
     Searches for doctors through Search Meta Agent
     """
+    from agents.search_meta_agent.search_meta_agent import find_doctors
     return find_doctors(state)
 
+@traced(category="node")
+@timed_node
 def search_error_node(state: AgentState) -> AgentState:
     """
     Handles search-specific errors through Search Meta Agent
     """
+    from agents.search_meta_agent.search_meta_agent import handle_search_error
     return handle_search_error(state)
 
+@traced(category="node")
+@timed_node
 def error_node(state: AgentState) -> AgentState:
     """
     Handles errors
@@ -9,13 +9,16 @@ class AgentState(TypedDict):
     file_path: Optional[str]
     text_input: Optional[str]
     patient_id: str
+    file_hash: Optional[str]
     
     # OCR/STT outputs
     extracted_text: Optional[str]
     confidence: Optional[float]
+    transcript_segments: Optional[List[Dict[str, Any]]]
     
     # Document Save outputs
     report_metadata: Optional[Dict[str, Any]]
+    duplicate_of: Optional[str]
     
     # Extraction outputs
     findings: Optional[List[str]]
@@ -29,6 +32,7 @@ class AgentState(TypedDict):
     # Doctor Search outputs
     doctor_type: Optional[str]
     location: Optional[Dict[str, str]]
+    search_params: Optional[Dict[str, Any]]
     search_results: Optional[Dict[str, Any]]
     top_doctors: Optional[List[Dict[str, Any]]]
     total_results: Optional[int]
@@ -41,4 +45,23 @@ class AgentState(TypedDict):
     error: Optional[str]
     
     # Routing
-    next_step: Optional[str]
\ No newline at end of file
+    next_step: Optional[str]
+
+
+def create_initial_state(**fields) -> AgentState:
+    """
+    Builds a complete AgentState with every key set to None
+    
+    Args:
+        **fields: Values to set (must be AgentState keys)
+        
+    Returns:
+        Initial state for a workflow invocation
+    """
+    unknown = set(fields) - set(AgentState.__annotations__)
+    if unknown:
+        raise KeyError(f"Unknown AgentState keys: {sorted(unknown)}")
+    
+    state = {key: None for key in AgentState.__annotations__}
+    state.update(fields)
+    return state
@@ -1,5 +1,16 @@
+import time
+import threading
 from langgraph.graph import StateGraph, END
-from graph.state import AgentState
+from graph.state import AgentState, create_initial_state
+from tools.report_index import hash_file, find_report_by_file, complete_report
+from tools.workspace import job_workspace
+from observability.tracing import trace_run, get_callbacks
+from observability.metrics import (
+    INGEST_SECONDS,
+    INGESTS_TOTAL,
+    DUPLICATE_REPORTS,
+    get_metrics_callbacks
+)
 from graph.nodes import (
     input_node,
     document_save_node,
@@ -117,6 +128,45 @@ def create_search_workflow():
     return app
 
 
+_report_app = None
+_search_app = None
+_compile_lock = threading.Lock()
+
+
+def get_report_workflow():
+    """
+    Returns the compiled report workflow, compiling it on first use
+    
+    Returns:
+        Shared compiled LangGraph workflow for report processing
+    """
+    global _report_app
+    
+    if _report_app is None:
+        with _compile_lock:
+            if _report_app is None:
+                _report_app = create_report_workflow()
+    
+    return _report_app
+
+
+def get_search_workflow():
+    """
+    Returns the compiled search workflow, compiling it on first use
+    
+    Returns:
+        Shared compiled LangGraph workflow for doctor search
+    """
+    global _search_app
+    
+    if _search_app is None:
+        with _compile_lock:
+            if _search_app is None:
+                _search_app = create_search_workflow()
+    
+    return _search_app
+
+
 def run_report_workflow(
     input_type: str,
     file_path: str = None,
@@ -135,35 +185,50 @@ def run_report_workflow(
     Returns:
         Final state dictionary with report summary
     """
-    initial_state = {
-        "input_type": input_type,
-        "file_path": file_path,
-        "text_input": text_input,
-        "patient_id": patient_id,
-        "extracted_text": None,
-        "confidence": None,
-        "report_metadata": None,
-        "findings": None,
-        "values": None,
-        "summary": None,
-        "key_changes": None,
-        "current_values": None,
-        "doctor_type": None,
-        "location": None,
-        "search_params": None,
-        "search_results": None,
-        "top_doctors": None,
-        "total_results": None,
-        "raw_search_output": None,
-        "final_response": None,
-        "error": None,
-        "next_step": None
-    }
-    
-    app = create_report_workflow()
-    result = app.invoke(initial_state)
+    initial_state = create_initial_state(
+        input_type=input_type,
+        file_path=file_path,
+        text_input=text_input,
+        patient_id=patient_id
+    )
     
-    return result
+    started = time.perf_counter()
+    outcome = "error"
+    
+    try:
+        with trace_run("report", input_type=input_type, patient_id=patient_id):
+            if file_path:
+                initial_state["file_hash"] = hash_file(file_path)
+                existing_id = find_report_by_file(patient_id, initial_state["file_hash"])
+                if existing_id:
+                    from agents.head_meta_agent.head_agent import load_existing_report
+                    DUPLICATE_REPORTS.inc(match="file")
+                    outcome = "duplicate"
+                    return load_existing_report(initial_state, existing_id)
+            
+            # Scratch files (rendered pages, ...) live in a per-run directory that
+            # is removed when the run finishes or fails
+            app = get_report_workflow()
+            with job_workspace():
+                result = app.invoke(initial_state, config={"callbacks": get_callbacks() + get_metrics_callbacks()})
+        
+        if result.get("error"):
+            outcome = "error"
+        elif result.get("duplicate_of"):
+            outcome = "duplicate"
+        else:
+            outcome = "ok"
+            # Only now does the report count for duplicate detection; a run that
+            # failed or was interrupted part-way is ingested again next time
+            report_id = (result.get("report_metadata") or {}).get("report_id")
+            if report_id:
+                complete_report(patient_id, report_id)
+        
+        return result
+    
+    finally:
+        INGEST_SECONDS.observe(time.perf_counter() - started, input_type=input_type)
+        INGESTS_TOTAL.inc(input_type=input_type, outcome=outcome)
 
 
 def run_search_workflow(patient_id: str) -> dict:
@@ -176,32 +241,10 @@ def run_search_workflow(patient_id: str) -> dict:
     Returns:
         Final state dictionary with doctor search results
     """
-    initial_state = {
-        "input_type": None,
-        "file_path": None,
-        "text_input": None,
-        "patient_id": patient_id,
-        "extracted_text": None,
-        "confidence": None,
-        "report_metadata": None,
-        "findings": None,
-        "values": None,
-        "summary": None,
-        "key_changes": None,
-        "current_values": None,
-        "doctor_type": None,
-        "location": None,
-        "search_params": None,
-        "search_results": None,
-        "top_doctors": None,
-        "total_results": None,
-        "raw_search_output": None,
-        "final_response": None,
-        "error": None,
-        "next_step": None
-    }
-    
-    app = create_search_workflow()
-    result = app.invoke(initial_state)
-    
-    return result
\ No newline at end of file
+    initial_state = create_initial_state(patient_id=patient_id)
+    
+    with trace_run("search", patient_id=patient_id):
+        app = get_search_workflow()
+        result = app.invoke(initial_state, config={"callbacks": get_callbacks() + get_metrics_callbacks()})
+    
+    return result
@@ -4,23 +4,34 @@ Continuous terminal-based interface
 """
 import sys
 from pathlib import Path
-from graph.workflow import run_report_workflow, run_search_workflow
-from tools.ocr_tools import cleanup_temp_files
 
+# The workflows (and with them LangChain, Chroma, EasyOCR, Whisper, ...) are
+# imported on first use so that starting the CLI and --help stay fast.
 
-def print_banner():
+JOB_ACTIONS = ["submit", "status", "result", "jobs"]
+
+
+def print_banner(label: str = "Continuous Terminal Interface"):
     """Prints the welcome banner"""
     print("\n" + "="*70)
     print("  MEDICAL REPORT DIAGNOSIS AGENTIC SYSTEM")
-    print("  Continuous Terminal Interface")
+    print(f"  {label}")
     print("="*70)
     print("\nCommands:")
     print("  --file <path>     : Process a file (PDF, image, audio)")
     print("  --text <message>  : Send a text message or query")
     print("  --patient <id>    : Set current patient ID (default: pt-001)")
     print("  --search          : Search for doctors based on your medical report")
+    print("  --submit <path>   : Queue a file for background processing")
+    print("  --status <job-id> : Show the status of a queued job")
+    print("  --result <job-id> : Show the result of a finished job")
+    print("  --jobs            : List queued, running and finished jobs")
     print("  --help            : Show this help message")
     print("  --exit / quit     : Exit the system")
+    print("\nLaunch options:")
+    print("  python main.py --serve [--host H] [--port P]   : Run as a daemon with warm models")
+    print("                  [--allow-remote]               : (also accept a non-loopback --host)")
+    print("  python main.py --connect [--host H] [--port P] : Send commands to a running daemon")
     print("="*70 + "\n")
 
 
@@ -42,6 +53,12 @@ def print_help():
     print("  find doctors")
     print("  search for doctors")
     print("  find me a doctor")
+    print("\nBackground Jobs:")
+    print("  --submit report.pdf")
+    print("  --patient pt-002 --submit scan.jpg")
+    print("  --status job-1")
+    print("  --result job-1")
+    print("  --jobs")
     print("\nChange Patient:")
     print("  --patient pt-002")
     print("\nCombined:")
@@ -121,6 +138,16 @@ def parse_command(command: str, current_patient: str) -> dict:
     if not command:
         return {"action": "empty"}
     
+    if command.lower() in ['--jobs', 'jobs']:
+        return {"action": "jobs"}
+    
+    for flag in ['--status', '--result']:
+        if command.startswith(flag):
+            job_words = command[len(flag):].split()
+            if not job_words:
+                return {"action": "invalid", "message": f"Please provide a job id after {flag}"}
+            return {"action": flag[2:], "job_id": job_words[0]}
+    
     # Parse arguments
     result = {
         "action": "process",
@@ -145,8 +172,13 @@ def parse_command(command: str, current_patient: str) -> dict:
     
     command = command.strip()
     
+    # --submit takes the same arguments as --file but queues the job
+    if '--submit' in command:
+        result["action"] = "submit"
+        command = command.replace('--submit', '--file', 1)
+    
     # Check if this is a search command
-    if is_search_command(command):
+    if result["action"] == "process" and is_search_command(command):
         result["is_search"] = True
         result["action"] = "search"
         return result
@@ -177,6 +209,28 @@ def parse_command(command: str, current_patient: str) -> dict:
     return result
 
 
+def detect_input_type(file_path: str):
+    """
+    Maps a file's extension to the workflow input type
+    
+    Args:
+        file_path: Path to file
+        
+    Returns:
+        "pdf", "image" or "audio", or None for unsupported files
+    """
+    suffix = Path(file_path).suffix.lower()
+    
+    if suffix == ".pdf":
+        return "pdf"
+    elif suffix in [".png", ".jpg", ".jpeg", ".bmp", ".tiff"]:
+        return "image"
+    elif suffix in [".mp3", ".wav", ".m4a", ".flac"]:
+        return "audio"
+    
+    return None
+
+
 def process_search_command(patient_id: str) -> str:
     """
     Processes a doctor search command
@@ -188,6 +242,8 @@ def process_search_command(patient_id: str) -> str:
         Response string with doctor search results
     """
     try:
+        from graph.workflow import run_search_workflow
+        
         print(f"\n🔍 Searching for doctors based on your medical report...")
         print(f"👤 Patient ID: {patient_id}")
         print("⏳ Please wait...\n")
@@ -212,6 +268,8 @@ def process_report_command(cmd_dict: dict) -> str:
         Response string
     """
     try:
+        from graph.workflow import run_report_workflow
+        
         file_path = cmd_dict.get("file_path")
         text_input = cmd_dict.get("text_input")
         patient_id = cmd_dict.get("patient_id", "pt-001")
@@ -224,16 +282,9 @@ def process_report_command(cmd_dict: dict) -> str:
                 return f"ERROR: File not found: {file_path}"
             
             # Determine file type
-            suffix = file_path_obj.suffix.lower()
-            
-            if suffix == ".pdf":
-                input_type = "pdf"
-            elif suffix in [".png", ".jpg", ".jpeg", ".bmp", ".tiff"]:
-                input_type = "image"
-            elif suffix in [".mp3", ".wav", ".m4a", ".flac"]:
-                input_type = "audio"
-            else:
-                return f"ERROR: Unsupported file type: {suffix}"
+            input_type = detect_input_type(file_path)
+            if input_type is None:
+                return f"ERROR: Unsupported file type: {file_path_obj.suffix.lower()}"
             
             print(f"\n📄 Processing {input_type.upper()} file: {file_path}")
             print(f"👤 Patient ID: {patient_id}")
@@ -246,9 +297,6 @@ def process_report_command(cmd_dict: dict) -> str:
                 patient_id=patient_id
             )
             
-            # Cleanup
-            cleanup_temp_files()
-            
             return result.get("final_response", "No response generated")
         
         elif text_input:
@@ -269,15 +317,120 @@ def process_report_command(cmd_dict: dict) -> str:
             return "ERROR: No input provided"
             
     except Exception as e:
-        cleanup_temp_files()
         return f"ERROR: {str(e)}"
 
 
-def main():
+def run_queued_report_command(cmd_dict: dict) -> str:
+    """
+    Runs a report/file command on the ingestion queue and waits for its response
+    
+    Going through the queue keeps one patient's reports strictly in order,
+    also when a --file races a --submit or another daemon client's --file.
+    
+    Args:
+        cmd_dict: Parsed command dictionary
+        
+    Returns:
+        Response string
+    """
+    from service.job_queue import get_ingest_queue
+    
+    queue = get_ingest_queue()
+    try:
+        job_id = queue.submit(cmd_dict)
+    except RuntimeError as e:
+        return f"ERROR: {str(e)}"
+    
+    info = queue.result(job_id, wait=True)
+    return info["error"] or info["response"]
+
+
+def format_job(info: dict) -> str:
+    """
+    Formats a job status dictionary as a one-line summary
+    """
+    target = info.get("file_path") or "text input"
+    line = f"{info['job_id']}  [{info['status']}]  {info['patient_id']}  {target}"
+    
+    if info.get("finished_at") and info.get("started_at"):
+        line += f"  ({info['finished_at'] - info['started_at']:.1f}s)"
+    
+    return line
+
+
+def process_job_command(cmd_dict: dict) -> str:
+    """
+    Processes an ingestion queue command (submit, status, result, jobs)
+    
+    Args:
+        cmd_dict: Parsed command dictionary
+        
+    Returns:
+        Response string
+    """
+    from service.job_queue import get_ingest_queue, QueueFull
+    
+    queue = get_ingest_queue()
+    action = cmd_dict["action"]
+    
+    try:
+        if action == "submit":
+            if cmd_dict.get("file_path") and not Path(cmd_dict["file_path"]).exists():
+                return f"ERROR: File not found: {cmd_dict['file_path']}"
+            job_id = queue.submit(cmd_dict, block=False)
+            return f"📥 Queued {job_id} for patient {cmd_dict['patient_id']}. Check it with --status {job_id}"
+        
+        if action == "status":
+            return format_job(queue.status(cmd_dict["job_id"]))
+        
+        if action == "result":
+            info = queue.result(cmd_dict["job_id"])
+            if info["status"] in ["queued", "running"]:
+                return f"{format_job(info)}\nJob has not finished yet."
+            return f"{format_job(info)}\n\n{info['error'] or info['response']}"
+        
+        jobs = queue.jobs()
+        if not jobs:
+            return "No jobs submitted yet."
+        return "\n".join(format_job(info) for info in jobs)
+    
+    except QueueFull as e:
+        return f"ERROR: {str(e)}. Try again once some jobs have finished."
+    except KeyError:
+        return f"ERROR: Unknown job id: {cmd_dict.get('job_id')}"
+
+
+def execute_command(cmd_dict: dict) -> str:
     """
-    Main continuous loop for terminal interface
+    Runs a parsed "search", "process" or ingestion queue command
+    
+    Args:
+        cmd_dict: Parsed command dictionary
+        
+    Returns:
+        Response string
+    """
+    if cmd_dict.get("action") == "search":
+        return process_search_command(cmd_dict["patient_id"])
+    
+    if cmd_dict.get("action") == "process":
+        return run_queued_report_command(cmd_dict)
+    
+    if cmd_dict.get("action") in JOB_ACTIONS:
+        return process_job_command(cmd_dict)
+    
+    return f"ERROR: Unsupported action: {cmd_dict.get('action')}"
+
+
+def run_loop(execute=execute_command, label: str = "Continuous Terminal Interface"):
+    """
+    Continuous prompt loop
+    
+    Args:
+        execute: Callable that runs a parsed search/process command and returns the response
+        label: Subtitle shown in the banner
     """
-    print_banner()
+    print_banner(label)
     
     current_patient = "pt-001"
     
@@ -311,24 +464,14 @@ def main():
                 print(f"\n❌ {cmd_dict.get('message')}\n")
                 continue
             
-            elif cmd_dict["action"] == "search":
+            elif cmd_dict["action"] in ["search", "process"] + JOB_ACTIONS:
                 # Update current patient if changed
-                if cmd_dict["patient_id"] != current_patient:
+                if cmd_dict.get("patient_id", current_patient) != current_patient:
                     current_patient = cmd_dict["patient_id"]
                     print(f"\n✓ Switched to Patient ID: {current_patient}\n")
                 
-                # Process search command
-                response = process_search_command(current_patient)
-                print(f"\n{response}\n")
-            
-            elif cmd_dict["action"] == "process":
-                # Update current patient if changed
-                if cmd_dict["patient_id"] != current_patient:
-                    current_patient = cmd_dict["patient_id"]
-                    print(f"\n✓ Switched to Patient ID: {current_patient}\n")
-                
-                # Process the report command
-                response = process_report_command(cmd_dict)
+                # Process the search / report command
+                response = execute(cmd_dict)
                 print(f"\n{response}\n")
         
         except KeyboardInterrupt:
@@ -340,5 +483,67 @@ def main():
             continue
 
 
+def get_option(args: list, name: str, default=None):
+    """
+    Returns the value following a launch flag (e.g. --port 8765), or the default
+    """
+    if name in args:
+        index = args.index(name)
+        if index + 1 < len(args):
+            return args[index + 1]
+    return default
+
+
+def main():
+    """
+    Entry point: interactive CLI, daemon (--serve) or thin client (--connect)
+    """
+    args = sys.argv[1:]
+    
+    if "--help" in args or "-h" in args:
+        print_banner()
+        print_help()
+        return
+    
+    from config.settings import SERVE_HOST, SERVE_PORT
+    host = get_option(args, "--host", SERVE_HOST)
+    port = int(get_option(args, "--port", SERVE_PORT))
+    
+    if "--serve" in args:
+        from config.settings import require_google_api_key, SERVE_ALLOW_REMOTE
+        from service.server import serve
+        require_google_api_key()
+        serve(host, port, allow_remote="--allow-remote" in args or SERVE_ALLOW_REMOTE)
+        return
+    
+    if "--connect" in args:
+        from service.client import RemoteExecutor
+        executor = RemoteExecutor(host, port)
+        executor.check_health()
+        run_loop(executor, label=f"Connected to daemon at {host}:{port}")
+        return
+    
+    from config.settings import require_google_api_key
+    require_google_api_key()
+    
+    # Without a daemon to scrape, metrics are written to METRICS_FILE after every command
+    from observability.metrics import dump_metrics
+    
+    def execute_and_dump(cmd_dict: dict) -> str:
+        try:
+            return execute_command(cmd_dict)
+        finally:
+            dump_metrics()
+    
+    try:
+        run_loop(execute_and_dump)
+    finally:
+        # Submitted reports run on daemon threads; finish them rather than
+        # dropping them (or leaving one half-stored) on exit
+        from service.job_queue import drain_ingest_queue
+        drain_ingest_queue()
+        dump_metrics()
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,116 @@
+"""
+LangChain callback handlers: LLM and tool calls as trace spans and metrics
+"""
+import time
+from langchain_core.callbacks import BaseCallbackHandler
+from observability.tracing import start_span
+from observability.metrics import LLM_CALLS, LLM_TOKENS, LLM_SECONDS, current_node
+
+
+def _model_name(serialized: dict, kwargs: dict) -> str:
+    params = kwargs.get("invocation_params") or {}
+    return params.get("model") or params.get("model_name") or (serialized or {}).get("name") or "llm"
+
+
+def _token_usage(response) -> dict:
+    """
+    Reads token counts from an LLMResult, whichever way the provider reports them
+    """
+    for generations in response.generations or []:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage:
+                return {
+                    "input_tokens": usage.get("input_tokens", 0),
+                    "output_tokens": usage.get("output_tokens", 0),
+                    "total_tokens": usage.get("total_tokens", 0)
+                }
+
+    usage = (response.llm_output or {}).get("token_usage") or {}
+    if usage:
+        return {
+            "input_tokens": usage.get("prompt_tokens", 0),
+            "output_tokens": usage.get("completion_tokens", 0),
+            "total_tokens": usage.get("total_tokens", 0)
+        }
+    return {}
+
+
+class TracingCallbackHandler(BaseCallbackHandler):
+    """
+    Opens a span on every LLM / tool start and closes it on end or error
+
+    Spans nest under the span of their LangChain parent run when it is
+    known, otherwise under the innermost open span (the graph node).
+    """
+
+    def __init__(self):
+        self._spans = {}
+
+    def _start(self, run_id, parent_run_id, name: str, category: str, **attrs):
+        parent = self._spans.get(parent_run_id)
+        self._spans[run_id] = start_span(name, category, parent_id=parent.span_id if parent else None, **attrs)
+
+    def _end(self, run_id, error: BaseException = None, **attrs):
+        current = self._spans.pop(run_id, None)
+        if current is None:
+            return
+        current.set(**attrs)
+        current.finish(error=f"{type(error).__name__}: {error}" if error else None)
+
+    def on_llm_start(self, serialized, prompts, *, run_id, parent_run_id=None, **kwargs):
+        self._start(run_id, parent_run_id, _model_name(serialized, kwargs), "llm", prompts=len(prompts))
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, parent_run_id=None, **kwargs):
+        self._start(run_id, parent_run_id, _model_name(serialized, kwargs), "llm", prompts=len(messages))
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        self._end(run_id, **_token_usage(response))
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, error=error)
+
+    def on_tool_start(self, serialized, input_str, *, run_id, parent_run_id=None, **kwargs):
+        name = (serialized or {}).get("name") or kwargs.get("name") or "tool"
+        self._start(run_id, parent_run_id, f"tool.{name}", "tool")
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        self._end(run_id)
+
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, error=error)
+
+
+class MetricsCallbackHandler(BaseCallbackHandler):
+    """
+    Counts LLM calls and tokens, labelled with the graph node that made them
+    """
+
+    def __init__(self):
+        self._started = {}
+
+    def _start(self, run_id):
+        self._started[run_id] = (time.perf_counter(), current_node())
+
+    def _end(self, run_id, outcome: str) -> str:
+        started, node = self._started.pop(run_id, (None, current_node()))
+        if started is not None:
+            LLM_SECONDS.observe(time.perf_counter() - started, node=node)
+        LLM_CALLS.inc(node=node, outcome=outcome)
+        return node
+
+    def on_llm_start(self, serialized, prompts, *, run_id, **kwargs):
+        self._start(run_id)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        self._start(run_id)
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        node = self._end(run_id, "ok")
+        usage = _token_usage(response)
+        if usage:
+            LLM_TOKENS.inc(usage["input_tokens"], node=node, direction="input")
+            LLM_TOKENS.inc(usage["output_tokens"], node=node, direction="output")
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, "error")
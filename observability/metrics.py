@@ -0,0 +1,346 @@
+"""
+In-process metrics registry with Prometheus text exposition
+
+Counters, gauges and histograms are module-level objects defined below and
+updated by the agents and tools. The daemon serves them at GET /metrics;
+CLI runs write them to METRICS_FILE on exit (a format node_exporter's
+textfile collector can pick up).
+"""
+import os
+import time
+import bisect
+import functools
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from config.settings import METRICS_FILE, ensure_directories
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+# Graph node currently executing in this context (label for LLM metrics)
+_current_node = ContextVar("metrics_node", default="none")
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple, values: tuple, extra: dict = None) -> str:
+    pairs = list(zip(names, values)) + list((extra or {}).items())
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metric:
+    """
+    Base class: a named family of time series keyed by label values
+    """
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._series = {}
+        self._lock = threading.Lock()
+        REGISTRY.register(self)
+
+    def _key(self, labels: dict) -> tuple:
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"{self.name} expects labels {self.label_names}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            for key, value in sorted(self._series.items()):
+                lines.extend(self._render_series(key, value))
+        return lines
+
+    def _render_series(self, key: tuple, value) -> list:
+        return [f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"]
+
+
+class Counter(Metric):
+    """
+    Monotonically increasing count
+    """
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._series.get(self._key(labels), 0)
+
+
+class Gauge(Metric):
+    """
+    Value that can go up and down
+    """
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._series.get(self._key(labels), 0)
+
+
+class Histogram(Metric):
+    """
+    Distribution of observed values in cumulative buckets
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: tuple = (), buckets: tuple = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labels)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            index = bisect.bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                series["counts"][index] += 1
+            series["sum"] += value
+            series["count"] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """
+        Observes the duration of the enclosed block in seconds
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _render_series(self, key: tuple, series: dict) -> list:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, series["counts"]):
+            cumulative += count
+            labels = _format_labels(self.label_names, key, {"le": _format_value(bound)})
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.label_names, key, {"le": "+Inf"})
+        lines.append(f"{self.name}_bucket{labels} {series['count']}")
+        labels = _format_labels(self.label_names, key)
+        lines.append(f"{self.name}_sum{labels} {_format_value(series['sum'])}")
+        lines.append(f"{self.name}_count{labels} {series['count']}")
+        return lines
+
+
+class Registry:
+    """
+    Holds every metric defined in the process
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: Metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric already registered: {metric.name}")
+            self._metrics[metric.name] = metric
+
+    def render(self) -> str:
+        """
+        Returns every metric in the Prometheus text exposition format
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+# Ingestion
+INGEST_SECONDS = Histogram(
+    "medagent_ingest_seconds", "End-to-end report workflow latency", ("input_type",)
+)
+INGESTS_TOTAL = Counter(
+    "medagent_ingests_total", "Report workflow runs by outcome", ("input_type", "outcome")
+)
+INPUT_SECONDS = Histogram(
+    "medagent_input_processing_seconds", "Head agent input processing (OCR / STT / chat) latency", ("input_type",)
+)
+DUPLICATE_REPORTS = Counter(
+    "medagent_duplicate_reports_total", "Reports recognised as already ingested", ("match",)
+)
+QUEUE_PENDING = Gauge(
+    "medagent_ingest_queue_pending", "Jobs queued or running in the ingestion queue"
+)
+QUEUE_RUNNING = Gauge(
+    "medagent_ingest_queue_running", "Jobs currently running in the ingestion queue"
+)
+QUEUE_REJECTED = Counter(
+    "medagent_ingest_queue_rejected_total", "Submissions refused because the queue was full"
+)
+
+# Graph and LLM
+NODE_SECONDS = Histogram(
+    "medagent_graph_node_seconds", "Graph node latency", ("node",)
+)
+LLM_CALLS = Counter(
+    "medagent_llm_calls_total", "LLM calls by graph node and outcome", ("node", "outcome")
+)
+LLM_TOKENS = Counter(
+    "medagent_llm_tokens_total", "LLM tokens by graph node and direction", ("node", "direction")
+)
+LLM_SECONDS = Histogram(
+    "medagent_llm_call_seconds", "LLM call latency", ("node",)
+)
+LLM_IN_FLIGHT = Gauge(
+    "medagent_llm_in_flight", "LLM calls currently holding a concurrency slot"
+)
+LLM_LIMITER_WAITING = Gauge(
+    "medagent_llm_limiter_waiting", "LLM calls waiting for a rate or concurrency slot"
+)
+LLM_LIMITER_WAIT_SECONDS = Histogram(
+    "medagent_llm_limiter_wait_seconds", "Time LLM calls spent waiting for the rate limiter"
+)
+LLM_RETRIES = Counter(
+    "medagent_llm_retries_total", "LLM call retries by reason (throttled, unavailable, timeout)", ("reason",)
+)
+LLM_GIVEUPS = Counter(
+    "medagent_llm_giveups_total", "LLM calls that failed after exhausting retries or with a non-retryable error", ("reason",)
+)
+LLM_CACHE_LOOKUPS = Counter(
+    "medagent_llm_cache_lookups_total", "LLM response cache lookups by outcome (hit, miss, expired)", ("outcome",)
+)
+
+# Clinical
+CLINICAL_SECONDS = Histogram(
+    "medagent_clinical_step_seconds", "Findings extraction and summarization latency", ("step",)
+)
+CLINICAL_FAILURES = Counter(
+    "medagent_clinical_failures_total", "Failed clinical steps", ("step",)
+)
+FINDINGS_EXTRACTED = Counter(
+    "medagent_findings_extracted_total", "Findings extracted from reports"
+)
+
+# Tools
+OCR_PAGES = Counter(
+    "medagent_ocr_pages_total", "PDF / image pages read, by source", ("source",)
+)
+OCR_PAGE_SECONDS = Histogram(
+    "medagent_ocr_page_seconds", "OCR time per page"
+)
+STT_AUDIO_SECONDS = Counter(
+    "medagent_stt_audio_seconds_total", "Seconds of audio transcribed"
+)
+STT_SECONDS = Histogram(
+    "medagent_stt_transcribe_seconds", "Transcription wall time per recording"
+)
+CHROMA_SECONDS = Histogram(
+    "medagent_chroma_operation_seconds", "Chroma operation latency", ("collection", "operation")
+)
+SCRAPER_RUNS = Counter(
+    "medagent_scraper_runs_total", "Google Maps scraper runs by outcome (success, empty, error)", ("outcome",)
+)
+SCRAPER_SECONDS = Histogram(
+    "medagent_scraper_seconds", "Google Maps scraper latency"
+)
+DOCTOR_SEARCHES = Counter(
+    "medagent_doctor_searches_total", "Doctor search workflow outcomes", ("outcome",)
+)
+DAEMON_REQUESTS = Counter(
+    "medagent_daemon_requests_total", "Daemon HTTP requests", ("path", "status")
+)
+
+
+def current_node() -> str:
+    """
+    Returns the graph node running in this context ("none" outside the graph)
+    """
+    return _current_node.get()
+
+
+def timed_node(fn):
+    """
+    Decorator for graph nodes: observes their latency and labels the LLM
+    calls they make with the node name
+    """
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        token = _current_node.set(fn.__name__)
+        try:
+            with NODE_SECONDS.time(node=fn.__name__):
+                return fn(*args, **kwargs)
+        finally:
+            _current_node.reset(token)
+
+    return wrapper
+
+
+def get_metrics_callbacks() -> list:
+    """
+    Returns the LangChain callbacks that count LLM calls and tokens
+
+    Returns:
+        List with a MetricsCallbackHandler
+    """
+    from observability.callbacks import MetricsCallbackHandler
+    return [MetricsCallbackHandler()]
+
+
+def render_metrics() -> str:
+    """
+    Returns all metrics in the Prometheus text format
+    """
+    return REGISTRY.render()
+
+
+def dump_metrics(path=None):
+    """
+    Writes all metrics to a file, atomically
+
+    Args:
+        path: Target file (defaults to METRICS_FILE)
+    """
+    path = str(path or METRICS_FILE)
+    ensure_directories()
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(render_metrics())
+    os.replace(tmp_path, path)
@@ -0,0 +1,474 @@
+"""
+Local latency tracing for workflow runs
+
+Every report or search workflow invocation is a run. Inside a run, spans are
+opened for graph nodes, LLM and tool calls (through a LangChain callback
+handler), Chroma operations, PDF rendering / OCR pages and Selenium steps.
+When the run ends its spans are appended to TRACE_DIR/spans.jsonl; with
+TRACE_FORMAT=chrome a Chrome-trace file (chrome://tracing, Perfetto) is
+written per run as well. Nothing leaves the machine.
+
+spans.jsonl is rotated to spans.1.jsonl, spans.2.jsonl, ... once it reaches
+TRACE_MAX_BYTES; only TRACE_KEEP_FILES rotated files and the newest
+TRACE_KEEP_CHROME Chrome traces are kept, so a long-lived daemon or a large
+backfill uses bounded disk space.
+
+Outside a run every tracing call is a cheap no-op.
+
+Usage:
+    python -m observability.tracing list
+    python -m observability.tracing summary [run_id]
+    python -m observability.tracing chrome [run_id] [-o trace.json]
+"""
+import os
+import json
+import time
+import uuid
+import argparse
+import functools
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from config.settings import (
+    TRACE_ENABLED,
+    TRACE_DIR,
+    TRACE_FORMAT,
+    TRACE_MAX_BYTES,
+    TRACE_KEEP_FILES,
+    TRACE_KEEP_CHROME
+)
+
+
+SPANS_FILE = TRACE_DIR / "spans.jsonl"
+
+_current_run = ContextVar("trace_run", default=None)
+_current_span = ContextVar("trace_span", default=None)
+_write_lock = threading.Lock()
+
+
+class Run:
+    """
+    Collects the spans of one workflow invocation
+    """
+
+    def __init__(self, name: str, attrs: dict):
+        self.run_id = f"{name}-{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        self.name = name
+        self.attrs = attrs
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def add(self, record: dict):
+        with self._lock:
+            self.spans.append(record)
+
+
+class Span:
+    """
+    One timed operation; finish() records it on its run (only the first call counts)
+    """
+
+    def __init__(self, run: Run, name: str, category: str, parent_id: str, attrs: dict):
+        self.run = run
+        self.name = name
+        self.category = category
+        self.span_id = uuid.uuid4().hex[:12]
+        self.parent_id = parent_id
+        self.attrs = dict(attrs)
+        self.start_us = time.time_ns() // 1000
+        self._start = time.perf_counter()
+        self._finished = False
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def finish(self, error: str = None):
+        if self._finished:
+            return
+        self._finished = True
+
+        record = {
+            "run_id": self.run.run_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "category": self.category,
+            "start_us": self.start_us,
+            "duration_us": int((time.perf_counter() - self._start) * 1e6),
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "attrs": self.attrs
+        }
+        if error:
+            record["error"] = error
+        self.run.add(record)
+
+
+class _NoopSpan:
+    span_id = None
+
+    def set(self, **attrs):
+        pass
+
+    def finish(self, error: str = None):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+def current_run_id():
+    """
+    Returns the id of the run being traced in this context, or None
+    """
+    run = _current_run.get()
+    return run.run_id if run else None
+
+
+def start_span(name: str, category: str = "function", parent_id: str = None, **attrs):
+    """
+    Opens a span that the caller must finish()
+
+    Use span() where a with-block fits; this is for callbacks and
+    step-by-step code where start and end are in different places.
+
+    Args:
+        name: Span name (e.g. "ocr.page")
+        category: Group used by the summary (node, llm, tool, chroma, ocr, selenium, ...)
+        parent_id: Parent span id (defaults to the innermost open span)
+        **attrs: Extra attributes stored with the span
+
+    Returns:
+        Span, or a no-op span outside a traced run
+    """
+    run = _current_run.get()
+    if run is None:
+        return NOOP_SPAN
+
+    if parent_id is None:
+        parent = _current_span.get()
+        parent_id = parent.span_id if parent else None
+
+    return Span(run, name, category, parent_id, attrs)
+
+
+@contextmanager
+def span(name: str, category: str = "function", **attrs):
+    """
+    Times the enclosed block as a child of the current span
+
+    Yields:
+        The span, so attributes can be added with span.set(...)
+    """
+    current = start_span(name, category, **attrs)
+    if current is NOOP_SPAN:
+        yield current
+        return
+
+    token = _current_span.set(current)
+    try:
+        yield current
+    except Exception as e:
+        current.finish(error=f"{type(e).__name__}: {e}")
+        raise
+    finally:
+        _current_span.reset(token)
+        current.finish()
+
+
+def traced(category: str = "function", name: str = None):
+    """
+    Decorator that wraps every call of a function in a span
+
+    Args:
+        category: Span category
+        name: Span name (defaults to the function name)
+    """
+    def decorator(fn):
+        span_name = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(span_name, category):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def record_span(name: str, category: str, start_us: int, duration_us: int, pid: int = None, **attrs):
+    """
+    Records a span that was timed elsewhere (e.g. inside a worker process)
+
+    Args:
+        name: Span name
+        category: Span category
+        start_us: Wall-clock start in microseconds since the epoch
+        duration_us: Duration in microseconds
+        pid: Process that did the work
+        **attrs: Extra attributes
+    """
+    run = _current_run.get()
+    if run is None:
+        return
+
+    parent = _current_span.get()
+    run.add({
+        "run_id": run.run_id,
+        "span_id": uuid.uuid4().hex[:12],
+        "parent_id": parent.span_id if parent else None,
+        "name": name,
+        "category": category,
+        "start_us": start_us,
+        "duration_us": duration_us,
+        "pid": pid or os.getpid(),
+        "tid": pid or threading.get_ident(),
+        "attrs": attrs
+    })
+
+
+def get_callbacks() -> list:
+    """
+    Returns the LangChain callbacks that trace LLM and tool calls for the current run
+
+    Returns:
+        List with a TracingCallbackHandler, or an empty list outside a run
+    """
+    if _current_run.get() is None:
+        return []
+
+    from observability.callbacks import TracingCallbackHandler
+    return [TracingCallbackHandler()]
+
+
+@contextmanager
+def trace_run(name: str, **attrs):
+    """
+    Traces one workflow invocation and writes its spans when it ends
+
+    Nested calls join the outer run. A no-op when TRACE_ENABLED is off.
+
+    Args:
+        name: Run name ("report", "search", ...)
+        **attrs: Attributes stored on the root span (input type, patient, ...)
+
+    Yields:
+        The run id, or None when tracing is disabled
+    """
+    if not TRACE_ENABLED or _current_run.get() is not None:
+        yield current_run_id()
+        return
+
+    run = Run(name, attrs)
+    run_token = _current_run.set(run)
+
+    try:
+        with span(name, "run", **attrs):
+            yield run.run_id
+    finally:
+        _current_run.reset(run_token)
+        try:
+            write_run(run)
+        except OSError as e:
+            print(f"⚠️ Could not write trace {run.run_id}: {e}")
+
+
+def write_run(run: Run):
+    """
+    Appends a finished run's spans to the trace file
+    """
+    TRACE_DIR.mkdir(parents=True, exist_ok=True)
+    spans = sorted(run.spans, key=lambda s: s["start_us"])
+
+    with _write_lock:
+        if SPANS_FILE.exists() and SPANS_FILE.stat().st_size >= TRACE_MAX_BYTES:
+            rotate_spans_file()
+        with open(SPANS_FILE, "a", encoding="utf-8") as f:
+            for record in spans:
+                f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+
+    if TRACE_FORMAT == "chrome":
+        with open(TRACE_DIR / f"{run.run_id}.trace.json", "w", encoding="utf-8") as f:
+            json.dump(to_chrome_trace(spans), f, default=str)
+        prune_chrome_traces()
+
+
+def rotated_file(index: int):
+    return TRACE_DIR / f"spans.{index}.jsonl"
+
+
+def rotate_spans_file():
+    """
+    Shifts spans.jsonl to spans.1.jsonl (and so on), dropping the oldest beyond TRACE_KEEP_FILES
+    """
+    if TRACE_KEEP_FILES < 1:
+        SPANS_FILE.unlink(missing_ok=True)
+        return
+
+    rotated_file(TRACE_KEEP_FILES).unlink(missing_ok=True)
+    for index in range(TRACE_KEEP_FILES - 1, 0, -1):
+        if rotated_file(index).exists():
+            os.replace(rotated_file(index), rotated_file(index + 1))
+    os.replace(SPANS_FILE, rotated_file(1))
+
+
+def prune_chrome_traces():
+    """
+    Deletes all but the newest TRACE_KEEP_CHROME Chrome-trace files
+    """
+    traces = sorted(TRACE_DIR.glob("*.trace.json"), key=lambda p: p.stat().st_mtime, reverse=True)
+    for path in traces[TRACE_KEEP_CHROME:]:
+        path.unlink(missing_ok=True)
+
+
+def trace_files() -> list:
+    """
+    Returns the rotated trace files and spans.jsonl, oldest first
+    """
+    rotated = [rotated_file(index) for index in range(TRACE_KEEP_FILES, 0, -1)]
+    return [path for path in rotated + [SPANS_FILE] if path.exists()]
+
+
+def load_runs(path=None) -> OrderedDict:
+    """
+    Reads the trace files
+
+    Args:
+        path: Trace file (defaults to spans.jsonl and its rotated files)
+
+    Returns:
+        OrderedDict of run_id -> list of spans, oldest run first
+    """
+    paths = [path] if path else trace_files()
+    runs = OrderedDict()
+
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                runs.setdefault(record["run_id"], []).append(record)
+
+    return runs
+
+
+def to_chrome_trace(spans: list) -> dict:
+    """
+    Converts spans to the Chrome trace event format
+    """
+    events = []
+    for record in spans:
+        args = dict(record.get("attrs") or {})
+        if record.get("error"):
+            args["error"] = record["error"]
+        events.append({
+            "name": record["name"],
+            "cat": record["category"],
+            "ph": "X",
+            "ts": record["start_us"],
+            "dur": record["duration_us"],
+            "pid": record["pid"],
+            "tid": record["tid"],
+            "args": args
+        })
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def summarize(spans: list) -> str:
+    """
+    Formats a per-operation latency breakdown for one run
+
+    Self time is a span's duration minus the time covered by its direct
+    children; it is what the operation itself cost.
+
+    Args:
+        spans: Spans of a single run
+
+    Returns:
+        Printable table
+    """
+    root = next((s for s in spans if s["category"] == "run"), None)
+    wall_us = root["duration_us"] if root else max(s["start_us"] + s["duration_us"] for s in spans) - min(s["start_us"] for s in spans)
+
+    child_us = {}
+    for record in spans:
+        if record["parent_id"]:
+            child_us[record["parent_id"]] = child_us.get(record["parent_id"], 0) + record["duration_us"]
+
+    rows = {}
+    for record in spans:
+        if record["category"] == "run":
+            continue
+        key = (record["category"], record["name"])
+        row = rows.setdefault(key, {"count": 0, "total": 0, "self": 0, "max": 0, "errors": 0, "tokens": 0})
+        row["count"] += 1
+        row["total"] += record["duration_us"]
+        row["self"] += max(0, record["duration_us"] - child_us.get(record["span_id"], 0))
+        row["max"] = max(row["max"], record["duration_us"])
+        row["errors"] += 1 if record.get("error") else 0
+        row["tokens"] += (record.get("attrs") or {}).get("total_tokens", 0) or 0
+
+    lines = []
+    if root:
+        attrs = ", ".join(f"{k}={v}" for k, v in (root.get("attrs") or {}).items())
+        lines.append(f"Run {root['run_id']}  ({attrs})")
+    lines.append(f"Wall time: {wall_us / 1000:.1f} ms, {len(spans)} spans\n")
+    lines.append(f"{'category':<10}{'operation':<34}{'count':>6}{'total ms':>11}{'self ms':>10}{'max ms':>10}{'% wall':>8}{'tokens':>8}{'err':>5}")
+    lines.append("-" * 102)
+
+    for (category, name), row in sorted(rows.items(), key=lambda item: -item[1]["self"]):
+        lines.append(
+            f"{category:<10}{name[:33]:<34}{row['count']:>6}{row['total'] / 1000:>11.1f}"
+            f"{row['self'] / 1000:>10.1f}{row['max'] / 1000:>10.1f}"
+            f"{100 * row['self'] / wall_us if wall_us else 0:>7.1f}%"
+            f"{row['tokens'] or '':>8}{row['errors'] or '':>5}"
+        )
+
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect local workflow traces")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="List traced runs")
+    summary = sub.add_parser("summary", help="Latency breakdown of one run (default: latest)")
+    summary.add_argument("run_id", nargs="?")
+    chrome = sub.add_parser("chrome", help="Export one run (default: latest) as a Chrome trace")
+    chrome.add_argument("run_id", nargs="?")
+    chrome.add_argument("-o", "--output", default=None)
+    args = parser.parse_args()
+
+    runs = load_runs()
+    if not runs:
+        print(f"No traces in {SPANS_FILE}")
+        return
+
+    if args.command == "list":
+        for run_id, spans in runs.items():
+            root = next((s for s in spans if s["category"] == "run"), spans[0])
+            started = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(root["start_us"] / 1e6))
+            print(f"{run_id:<40}{started:>22}{root['duration_us'] / 1000:>12.1f} ms{len(spans):>8} spans")
+        return
+
+    run_id = args.run_id or next(reversed(runs))
+    if run_id not in runs:
+        print(f"Unknown run: {run_id}")
+        return
+
+    if args.command == "summary":
+        print(summarize(runs[run_id]))
+    else:
+        output = args.output or f"{run_id}.trace.json"
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(to_chrome_trace(runs[run_id]), f, default=str)
+        print(f"Wrote {output} (open in chrome://tracing or https://ui.perfetto.dev)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Thin client for the daemon started with `python main.py --serve`
+"""
+import json
+import urllib.error
+import urllib.request
+from pathlib import Path
+from config.settings import SERVE_TOKEN, SERVE_TOKEN_FILE
+
+
+def read_token() -> str:
+    """
+    Returns the daemon token from SERVE_TOKEN or the daemon's token file
+    
+    Raises:
+        PermissionError: If neither is set or readable
+    """
+    if SERVE_TOKEN:
+        return SERVE_TOKEN
+    try:
+        return SERVE_TOKEN_FILE.read_text(encoding="utf-8").strip()
+    except OSError as e:
+        raise PermissionError(
+            f"Cannot read the daemon token at {SERVE_TOKEN_FILE} ({e.strerror}). "
+            "Set SERVE_TOKEN, or ask for read access to that file"
+        )
+
+
+class RemoteExecutor:
+    """
+    Sends parsed CLI commands to a running daemon
+    
+    Instances are callables with the same signature as main.execute_command,
+    so the regular prompt loop can drive a remote daemon.
+    """
+    
+    def __init__(self, host: str, port: int, timeout: float = None, token: str = None):
+        self.base_url = f"http://{host}:{port}"
+        self.timeout = timeout
+        self.token = token or read_token()
+    
+    def _request(self, path: str, payload: dict = None) -> dict:
+        data = json.dumps(payload).encode("utf-8") if payload is not None else None
+        request = urllib.request.Request(
+            self.base_url + path,
+            data=data,
+            headers={"Content-Type": "application/json", "X-Daemon-Token": self.token},
+            method="POST" if data is not None else "GET"
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read().decode("utf-8"))
+        except urllib.error.HTTPError as e:
+            body = e.read().decode("utf-8", errors="replace")
+            try:
+                return {"error": json.loads(body).get("error", body)}
+            except json.JSONDecodeError:
+                return {"error": body}
+    
+    def check_health(self) -> dict:
+        """
+        Verifies the daemon is reachable
+        
+        Raises:
+            ConnectionError: If nothing is listening at the configured address
+        """
+        try:
+            return self._request("/health")
+        except urllib.error.URLError as e:
+            raise ConnectionError(
+                f"No daemon at {self.base_url} ({e.reason}). Start one with: python main.py --serve"
+            )
+    
+    def __call__(self, cmd_dict: dict) -> str:
+        """
+        Runs a parsed command on the daemon
+        
+        Args:
+            cmd_dict: Parsed command dictionary
+            
+        Returns:
+            Response string
+        """
+        cmd_dict = dict(cmd_dict)
+        
+        # The daemon resolves paths from its own working directory
+        if cmd_dict.get("file_path"):
+            cmd_dict["file_path"] = str(Path(cmd_dict["file_path"]).expanduser().resolve())
+        
+        try:
+            result = self._request("/command", cmd_dict)
+        except urllib.error.URLError as e:
+            return f"ERROR: Daemon unreachable at {self.base_url}: {e.reason}"
+        
+        if "error" in result:
+            return f"ERROR: {result['error']}"
+        
+        return result.get("response", "No response generated")
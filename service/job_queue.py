@@ -0,0 +1,320 @@
+"""
+Ingestion job queue: runs report commands on a bounded pool of worker threads
+
+Jobs for different patients run in parallel; jobs for the same patient run
+strictly one after another in submission order, so each summarization sees
+the history left by the previous report. Synchronous --file / --text
+commands go through the same queue (main.run_queued_report_command), so
+they are ordered with the submitted jobs too.
+"""
+import time
+import threading
+from collections import deque, OrderedDict
+from config.settings import INGEST_WORKERS, INGEST_MAX_PENDING, INGEST_HISTORY_LIMIT
+from observability.metrics import QUEUE_PENDING, QUEUE_RUNNING, QUEUE_REJECTED
+
+
+class QueueFull(Exception):
+    """Raised when a job is submitted without blocking and the queue is at capacity"""
+
+
+class Job:
+    """
+    One queued ingestion command and its outcome
+    """
+    
+    def __init__(self, job_id: str, cmd_dict: dict):
+        self.job_id = job_id
+        self.cmd_dict = cmd_dict
+        self.patient_id = cmd_dict.get("patient_id")
+        self.status = "queued"
+        self.response = None
+        self.error = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+    
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.job_id,
+            "patient_id": self.patient_id,
+            "file_path": self.cmd_dict.get("file_path"),
+            "status": self.status,
+            "response": self.response,
+            "error": self.error,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at
+        }
+
+
+class IngestQueue:
+    """
+    Bounded worker pool with per-patient FIFO ordering and backpressure
+    
+    A patient is handed to at most one worker at a time; when that worker
+    finishes a job it releases the patient so their next job can start.
+    At most `max_pending` jobs may be queued or running at once.
+    """
+    
+    def __init__(self, runner=None, workers: int = INGEST_WORKERS, max_pending: int = INGEST_MAX_PENDING):
+        if runner is None:
+            from main import process_report_command
+            runner = process_report_command
+        
+        self.runner = runner
+        self.max_pending = max(1, max_pending)
+        self._cond = threading.Condition()
+        self._jobs = OrderedDict()
+        self._patient_jobs = {}
+        self._ready = deque()
+        self._active = set()
+        self._pending = 0
+        self._counter = 0
+        self._closed = False
+        self._workers = [
+            threading.Thread(target=self._work, name=f"ingest-worker-{i}", daemon=True)
+            for i in range(max(1, workers))
+        ]
+        for worker in self._workers:
+            worker.start()
+    
+    def submit(self, cmd_dict: dict, block: bool = True, timeout: float = None) -> str:
+        """
+        Queues a parsed "process" command
+        
+        Args:
+            cmd_dict: Parsed command dictionary (must carry a patient_id)
+            block: Wait for room when the queue is full instead of raising
+            timeout: Seconds to wait for room when blocking (None waits forever)
+            
+        Returns:
+            Job identifier
+            
+        Raises:
+            QueueFull: If the queue stays full (immediately when block=False)
+        """
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Ingest queue is shut down")
+            
+            if self._pending >= self.max_pending:
+                if not block:
+                    QUEUE_REJECTED.inc()
+                    raise QueueFull(f"Ingest queue is full ({self._pending} jobs pending)")
+                if not self._cond.wait_for(lambda: self._pending < self.max_pending or self._closed, timeout):
+                    QUEUE_REJECTED.inc()
+                    raise QueueFull(f"Ingest queue is full ({self._pending} jobs pending)")
+                if self._closed:
+                    raise RuntimeError("Ingest queue is shut down")
+            
+            self._counter += 1
+            job = Job(f"job-{self._counter}", dict(cmd_dict, action="process"))
+            self._jobs[job.job_id] = job
+            self._pending += 1
+            QUEUE_PENDING.inc()
+            
+            patient_jobs = self._patient_jobs.setdefault(job.patient_id, deque())
+            patient_jobs.append(job)
+            if len(patient_jobs) == 1 and job.patient_id not in self._active:
+                self._ready.append(job.patient_id)
+            
+            self._cond.notify_all()
+            return job.job_id
+    
+    def _next_job(self):
+        with self._cond:
+            self._cond.wait_for(lambda: self._ready or self._closed)
+            if not self._ready:
+                return None
+            
+            patient_id = self._ready.popleft()
+            self._active.add(patient_id)
+            job = self._patient_jobs[patient_id].popleft()
+            job.status = "running"
+            job.started_at = time.time()
+            QUEUE_RUNNING.inc()
+            return job
+    
+    def _finish(self, job: Job):
+        with self._cond:
+            job.finished_at = time.time()
+            self._pending -= 1
+            QUEUE_PENDING.dec()
+            QUEUE_RUNNING.dec()
+            self._active.discard(job.patient_id)
+            
+            patient_jobs = self._patient_jobs[job.patient_id]
+            if patient_jobs:
+                self._ready.append(job.patient_id)
+            else:
+                del self._patient_jobs[job.patient_id]
+            
+            self._trim_history()
+            self._cond.notify_all()
+    
+    def _trim_history(self):
+        finished = [jid for jid, j in self._jobs.items() if j.status in ("done", "failed")]
+        for job_id in finished[:max(0, len(finished) - INGEST_HISTORY_LIMIT)]:
+            del self._jobs[job_id]
+    
+    def _work(self):
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+            
+            try:
+                response = self.runner(job.cmd_dict)
+                job.response = response
+                if isinstance(response, str) and response.startswith("ERROR:"):
+                    job.status = "failed"
+                    job.error = response
+                else:
+                    job.status = "done"
+            except Exception as e:
+                job.status = "failed"
+                job.error = f"ERROR: {str(e)}"
+            finally:
+                self._finish(job)
+    
+    def status(self, job_id: str) -> dict:
+        """
+        Returns a job's status without its response
+        
+        Raises:
+            KeyError: If the job id is unknown (or has aged out of the history)
+        """
+        with self._cond:
+            info = self._jobs[job_id].to_dict()
+        info.pop("response")
+        return info
+    
+    def result(self, job_id: str, wait: bool = False, timeout: float = None) -> dict:
+        """
+        Returns a job's status and response, optionally waiting for it to finish
+        
+        Raises:
+            KeyError: If the job id is unknown (or has aged out of the history)
+        """
+        with self._cond:
+            job = self._jobs[job_id]
+            if wait:
+                self._cond.wait_for(lambda: job.status in ("done", "failed"), timeout)
+            return job.to_dict()
+    
+    def jobs(self) -> list:
+        """
+        Returns the status of every known job, oldest first
+        """
+        with self._cond:
+            infos = [job.to_dict() for job in self._jobs.values()]
+        for info in infos:
+            info.pop("response")
+        return infos
+    
+    def unfinished(self) -> list:
+        """
+        Returns the status of the jobs still queued or running, oldest first
+        """
+        with self._cond:
+            infos = [job.to_dict() for job in self._jobs.values() if job.status in ("queued", "running")]
+        for info in infos:
+            info.pop("response")
+        return infos
+    
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "workers": len(self._workers),
+                "max_pending": self.max_pending,
+                "pending": self._pending,
+                "running": len(self._active),
+                "waiting_patients": len(self._ready)
+            }
+    
+    def join(self, timeout: float = None) -> bool:
+        """
+        Waits until every submitted job has finished
+        
+        Returns:
+            True if the queue drained, False on timeout
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: self._pending == 0, timeout)
+    
+    def shutdown(self, wait: bool = True):
+        """
+        Stops accepting jobs; with wait=True, lets queued jobs finish first
+        """
+        if wait:
+            self.join()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if wait:
+            for worker in self._workers:
+                worker.join()
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_ingest_queue() -> IngestQueue:
+    """
+    Returns the process-wide ingestion queue, starting its workers on first use
+    """
+    global _queue
+    
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = IngestQueue()
+    
+    return _queue
+
+
+def shutdown_ingest_queue(wait: bool = True):
+    """
+    Shuts down the process-wide ingestion queue if it was started
+    """
+    global _queue
+    
+    with _queue_lock:
+        queue, _queue = _queue, None
+    if queue is not None:
+        queue.shutdown(wait=wait)
+
+
+def drain_ingest_queue():
+    """
+    Lets the process-wide queue finish its jobs before the process exits
+    
+    The queued and running jobs are listed first. Pressing Ctrl+C while
+    waiting abandons them, and the abandoned jobs are listed so they can
+    be submitted again.
+    """
+    with _queue_lock:
+        queue = _queue
+    if queue is None:
+        return
+    
+    unfinished = queue.unfinished()
+    if unfinished:
+        print(f"\n⏳ Waiting for {len(unfinished)} queued or running job(s) to finish (Ctrl+C to abandon them):")
+        for info in unfinished:
+            print(f"   {_describe(info)}")
+    
+    try:
+        shutdown_ingest_queue(wait=True)
+    except KeyboardInterrupt:
+        abandoned = queue.unfinished()
+        queue.shutdown(wait=False)
+        print(f"\n⚠️ Abandoned {len(abandoned)} job(s); submit them again to process them:")
+        for info in abandoned:
+            print(f"   {_describe(info)}")
+
+
+def _describe(info: dict) -> str:
+    return f"{info['job_id']}  [{info['status']}]  {info['patient_id']}  {info.get('file_path') or 'text input'}"
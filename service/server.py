@@ -0,0 +1,237 @@
+"""
+Long-running daemon: keeps the workflows and models warm and serves
+commands over a local HTTP endpoint.
+
+Endpoints:
+    GET  /health   - liveness and uptime
+    GET  /metrics  - Prometheus text exposition
+    GET  /limiter  - shared LLM rate limiter state (tokens, in-flight, retries)
+    POST /command  - run a parsed CLI command (see main.parse_command),
+                     including the ingestion queue commands (--submit, --status, ...)
+
+Commands read patient records and local files, so POST /command requires
+the daemon token in the X-Daemon-Token header. The daemon writes a fresh
+token to SERVE_TOKEN_FILE on every start, readable only by its own user (or
+group, with SERVE_TOKEN_FILE_MODE=640); --connect reads it from there.
+"""
+import os
+import hmac
+import json
+import time
+import secrets
+import ipaddress
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from config.settings import (
+    REPORT_COLLECTION,
+    FINDINGS_COLLECTION,
+    SUMMARY_COLLECTION,
+    SERVE_TOKEN,
+    SERVE_TOKEN_FILE,
+    SERVE_TOKEN_FILE_MODE
+)
+from observability.metrics import DAEMON_REQUESTS, render_metrics
+
+
+STARTED_AT = time.time()
+TOKEN_HEADER = "X-Daemon-Token"
+
+
+def is_loopback(host: str) -> bool:
+    """
+    Tells whether a bind address only accepts connections from this host
+    """
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def create_token() -> str:
+    """
+    Returns the token clients must send, writing it to SERVE_TOKEN_FILE
+    
+    SERVE_TOKEN is used as is when set; otherwise a new random token is
+    generated for this daemon run.
+    """
+    if SERVE_TOKEN:
+        return SERVE_TOKEN
+    
+    token = secrets.token_urlsafe(32)
+    SERVE_TOKEN_FILE.parent.mkdir(parents=True, exist_ok=True)
+    if SERVE_TOKEN_FILE.exists():
+        SERVE_TOKEN_FILE.unlink()
+    # Created with the final permissions, so the token is never world-readable
+    fd = os.open(SERVE_TOKEN_FILE, os.O_WRONLY | os.O_CREAT | os.O_EXCL, SERVE_TOKEN_FILE_MODE)
+    with os.fdopen(fd, "w") as f:
+        f.write(token)
+    os.chmod(SERVE_TOKEN_FILE, SERVE_TOKEN_FILE_MODE)
+    return token
+
+
+def warm_up():
+    """
+    Loads the workflows, embedding model, Chroma clients, OCR reader and Whisper model
+    
+    A subsystem that fails to load is reported and skipped; it will be
+    retried on first use.
+    """
+    def timed(label, fn):
+        start = time.perf_counter()
+        try:
+            fn()
+            print(f"  ✓ {label} ready in {time.perf_counter() - start:.2f}s")
+        except Exception as e:
+            print(f"  ⚠️ {label} not warmed: {e}")
+    
+    def load_workflows():
+        from graph.workflow import get_report_workflow, get_search_workflow
+        import agents.head_meta_agent.head_agent
+        import agents.clinical_meta_agent.clinical_agent
+        get_report_workflow()
+        get_search_workflow()
+    
+    def load_stores():
+        from tools.vector_store import get_vector_store
+        for collection in (REPORT_COLLECTION, FINDINGS_COLLECTION, SUMMARY_COLLECTION):
+            get_vector_store(collection)
+    
+    def load_ocr():
+        from tools.ocr_reader_pool import acquire_reader
+        with acquire_reader():
+            pass
+    
+    def load_whisper():
+        from tools.stt_tools import get_whisper_model
+        get_whisper_model()
+    
+    print("\n🔥 Warming up models...")
+    timed("Workflows", load_workflows)
+    timed("Embeddings + Chroma", load_stores)
+    timed("EasyOCR reader", load_ocr)
+    timed("Whisper model", load_whisper)
+
+
+class CommandHandler(BaseHTTPRequestHandler):
+    """
+    Handles one HTTP request per thread
+    """
+    
+    def _send_json(self, status: int, payload: dict):
+        path = self.path if self.path in ["/health", "/limiter", "/command"] else "other"
+        DAEMON_REQUESTS.inc(path=path, status=str(status))
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def do_GET(self):
+        if self.path == "/metrics":
+            body = render_metrics().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            DAEMON_REQUESTS.inc(path="/metrics", status="200")
+        elif self.path == "/health":
+            self._send_json(200, {
+                "status": "ok",
+                "uptime_seconds": round(time.time() - STARTED_AT, 1)
+            })
+        elif self.path == "/limiter":
+            from agents.llm_limiter import get_limiter
+            self._send_json(200, get_limiter().snapshot())
+        else:
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+    
+    def do_POST(self):
+        if self.path != "/command":
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+            return
+        
+        if not hmac.compare_digest(self.headers.get(TOKEN_HEADER, ""), self.server.token):
+            self._send_json(401, {"error": f"Missing or wrong {TOKEN_HEADER} header"})
+            return
+        
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            cmd_dict = json.loads(self.rfile.read(length) or b"{}")
+        except (ValueError, json.JSONDecodeError) as e:
+            self._send_json(400, {"error": f"Invalid JSON body: {e}"})
+            return
+        
+        from main import execute_command, JOB_ACTIONS
+        
+        action = cmd_dict.get("action")
+        if action not in ["search", "process"] + JOB_ACTIONS:
+            self._send_json(400, {"error": f"Unsupported action: {action}"})
+            return
+        
+        if action in ["search", "process", "submit"] and not cmd_dict.get("patient_id"):
+            self._send_json(400, {"error": f"A '{action}' command needs a patient_id"})
+            return
+        
+        if action in ["status", "result"] and not cmd_dict.get("job_id"):
+            self._send_json(400, {"error": f"A '{action}' command needs a job_id"})
+            return
+        
+        start = time.perf_counter()
+        response = execute_command(cmd_dict)
+        
+        self._send_json(200, {
+            "patient_id": cmd_dict.get("patient_id"),
+            "response": response,
+            "elapsed_seconds": round(time.perf_counter() - start, 3)
+        })
+    
+    def log_message(self, format, *args):
+        print(f"[{self.log_date_time_string()}] {self.address_string()} {format % args}")
+
+
+def serve(host: str, port: int, allow_remote: bool = False):
+    """
+    Warms the models and serves commands until interrupted
+    
+    Args:
+        host: Interface to bind
+        port: TCP port
+        allow_remote: Allow a non-loopback host (the endpoint is plain HTTP)
+        
+    Raises:
+        ValueError: If host is not a loopback address and allow_remote is False
+    """
+    if not is_loopback(host) and not allow_remote:
+        raise ValueError(
+            f"Refusing to bind {host}: the daemon serves patient records over plain HTTP. "
+            "Use a loopback address, or pass --allow-remote (SERVE_ALLOW_REMOTE=1) to override"
+        )
+    
+    token = create_token()
+    warm_up()
+    
+    server = ThreadingHTTPServer((host, port), CommandHandler)
+    server.daemon_threads = True
+    server.token = token
+    if not is_loopback(host):
+        print(f"\n⚠️  Listening on non-loopback address {host}; commands and results are not encrypted")
+    print(f"\n🚀 Daemon listening on http://{host}:{port} (Ctrl+C to stop)")
+    print(f"   Clients authenticate with {'SERVE_TOKEN' if SERVE_TOKEN else SERVE_TOKEN_FILE}\n")
+    
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Shutting down daemon...")
+    finally:
+        server.server_close()
+        if not SERVE_TOKEN:
+            SERVE_TOKEN_FILE.unlink(missing_ok=True)
+        from service.job_queue import drain_ingest_queue
+        drain_ingest_queue()
+        from tools.ocr_tools import shutdown_ocr_workers
+        from tools.stt_tools import shutdown_stt_workers
+        shutdown_ocr_workers()
+        shutdown_stt_workers()
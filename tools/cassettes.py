@@ -0,0 +1,435 @@
+"""
+Record/replay cassettes for the system's external I/O
+
+With CASSETTE_MODE=record every LLM call, geolocation request and Google
+Maps scrape is appended to CASSETTE_FILE as a request/response pair (with
+its original duration). With CASSETTE_MODE=replay the same calls are
+answered from the file, so a recorded session can be re-run against a new
+build with no network access and its wall time compared.
+
+Replay matches a call by its exact request first. When the request changed
+(a reworded prompt, a different IP in a URL) it falls back to the next
+unused recording of the same kind and group (LLM purpose, URL host or
+function), in recorded order.
+
+Usage:
+    python -m tools.cassettes stats [cassette.jsonl]
+"""
+import re
+import sys
+import json
+import time
+import hashlib
+import argparse
+import functools
+import threading
+import urllib.parse
+from collections import deque
+from pathlib import Path
+from typing import Any, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from config.settings import CASSETTE_MODE, CASSETTE_FILE, CASSETTE_LATENCY
+
+
+# Query parameters that are never written to a cassette
+SECRET_PARAMS = {"apikey", "api_key", "key", "token", "access_token"}
+
+# The same parameters inside free text, e.g. a URL quoted in an exception message
+SECRET_IN_TEXT = re.compile(
+    r"([?&;](?:" + "|".join(sorted(SECRET_PARAMS)) + r")=)[^&\s'\"<>)]+",
+    re.IGNORECASE
+)
+
+_cassette = None
+_configured = False
+_cassette_lock = threading.Lock()
+
+
+class CassetteMiss(LookupError):
+    """
+    Raised on replay when no recording is left for a call
+    """
+
+
+class ReplayedError(RuntimeError):
+    """
+    Raised on replay for a call that failed when it was recorded
+    """
+
+
+def redact_url(url: str) -> str:
+    """
+    Replaces API keys and tokens in a URL's query string
+    """
+    parts = urllib.parse.urlsplit(url)
+    query = [
+        (name, "REDACTED" if name.lower() in SECRET_PARAMS else value)
+        for name, value in urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+    ]
+    return urllib.parse.urlunsplit(parts._replace(query=urllib.parse.urlencode(query)))
+
+
+def redact_text(text: str) -> str:
+    """
+    Replaces API keys and tokens in any URL query strings within a text
+    """
+    return SECRET_IN_TEXT.sub(r"\1REDACTED", text)
+
+
+def redact_request(value):
+    """
+    Redacts secrets in every string of a JSON-like request description
+    """
+    if isinstance(value, str):
+        return redact_text(value)
+    if isinstance(value, dict):
+        return {key: redact_request(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [redact_request(item) for item in value]
+    return value
+
+
+def request_key(kind: str, request: dict) -> str:
+    canonical = json.dumps([kind, request], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class Cassette:
+    """
+    One cassette file, opened for recording or for replay
+    """
+
+    def __init__(self, path, mode: str = "record", latency: str = "0"):
+        """
+        Args:
+            path: Cassette file (JSON lines)
+            mode: "record" (append) or "replay"
+            latency: Delay per replayed call: "0", "recorded" (the original
+                duration) or a number of seconds
+        """
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+
+        self.path = Path(path)
+        self.mode = mode
+        self.latency = str(latency)
+        self.stats = {"recorded": 0, "replayed": 0, "fallback": 0, "missed": 0}
+        self._lock = threading.Lock()
+        self._entries = []
+        self._by_key = {}
+        self._by_group = {}
+        self._used = set()
+
+        if mode == "replay":
+            self._load()
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def _load(self):
+        if not self.path.exists():
+            raise FileNotFoundError(f"Cassette not found: {self.path}")
+
+        for entry in read_entries(self.path):
+            index = len(self._entries)
+            self._entries.append(entry)
+            self._by_key.setdefault(entry["key"], deque()).append(index)
+            self._by_group.setdefault((entry["kind"], entry.get("group")), deque()).append(index)
+
+    def _take(self, queue: deque) -> Optional[dict]:
+        while queue:
+            index = queue.popleft()
+            if index not in self._used:
+                self._used.add(index)
+                return self._entries[index]
+        return None
+
+    def _delay(self, entry: dict) -> float:
+        if self.latency == "recorded":
+            return entry.get("duration") or 0.0
+        try:
+            return max(0.0, float(self.latency))
+        except ValueError:
+            return 0.0
+
+    def record(self, kind: str, request: dict, response: Any, duration: float, group: str = None, error: str = None):
+        """
+        Appends one request/response pair to the cassette
+
+        The error text is redacted: exception messages often quote the
+        request URL, API key included.
+        """
+        entry = {
+            "kind": kind,
+            "group": group,
+            "key": request_key(kind, request),
+            "request": request,
+            "response": response,
+            "error": redact_text(error) if error else None,
+            "duration": round(duration, 4),
+            "recorded_at": time.time()
+        }
+        line = json.dumps(entry, ensure_ascii=False, default=str)
+
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+            self.stats["recorded"] += 1
+
+    def replay(self, kind: str, request: dict, group: str = None) -> Any:
+        """
+        Returns the recorded response for a request, after the configured delay
+
+        Raises:
+            CassetteMiss: No unused recording matches the request or its group
+            ReplayedError: The recorded call had failed
+        """
+        with self._lock:
+            entry = self._take(self._by_key.get(request_key(kind, request), deque()))
+            if entry is None:
+                entry = self._take(self._by_group.get((kind, group), deque()))
+                if entry is not None:
+                    self.stats["fallback"] += 1
+            if entry is None:
+                self.stats["missed"] += 1
+                raise CassetteMiss(f"No recorded {kind} call left for {group or 'request'} in {self.path}")
+            self.stats["replayed"] += 1
+
+        delay = self._delay(entry)
+        if delay > 0:
+            time.sleep(delay)
+
+        if entry.get("error"):
+            raise ReplayedError(entry["error"])
+        return entry["response"]
+
+    def call(self, kind: str, request: dict, fn, group: str = None, encode=None, decode=None):
+        """
+        Runs fn() and records it, or answers from the cassette on replay
+
+        Args:
+            kind: Interaction kind ("llm", "http", "function")
+            request: JSON-serializable description of the call
+            fn: Performs the real call
+            group: Fallback matching group
+            encode: Turns fn's result into JSON-serializable data
+            decode: Turns recorded data back into fn's result type
+
+        Returns:
+            fn's result, real or replayed
+        """
+        # Arguments can carry keyed URLs too; matching uses the redacted form
+        request = redact_request(request)
+        if self.replaying:
+            response = self.replay(kind, request, group)
+            return decode(response) if decode else response
+
+        started = time.perf_counter()
+        try:
+            result = fn()
+        except Exception as e:
+            self.record(kind, request, None, time.perf_counter() - started, group, error=f"{type(e).__name__}: {e}")
+            raise
+
+        self.record(kind, request, encode(result) if encode else result, time.perf_counter() - started, group)
+        return result
+
+
+def get_cassette() -> Optional[Cassette]:
+    """
+    Returns the process-wide cassette, or None when CASSETTE_MODE is "off"
+    """
+    global _cassette, _configured
+
+    if not _configured:
+        with _cassette_lock:
+            if not _configured:
+                if CASSETTE_MODE != "off":
+                    _cassette = Cassette(CASSETTE_FILE, CASSETTE_MODE, CASSETTE_LATENCY)
+                    print(f"Cassette {CASSETTE_MODE}: {CASSETTE_FILE}")
+                _configured = True
+    return _cassette
+
+
+def set_cassette(cassette: Optional[Cassette]) -> Optional[Cassette]:
+    """
+    Installs a cassette for the whole process (None turns recording off)
+
+    Returns:
+        The previous cassette
+    """
+    global _cassette, _configured
+
+    with _cassette_lock:
+        previous, _cassette = _cassette, cassette
+        _configured = True
+    return previous
+
+
+def read_entries(path) -> list:
+    entries = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return entries
+
+
+class RecordedResponse:
+    """
+    The parts of a requests.Response the callers use, detached from the connection
+    """
+
+    def __init__(self, url: str, status_code: int, text: str):
+        self.url = url
+        self.status_code = status_code
+        self.text = text
+
+    def json(self):
+        return json.loads(self.text)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            import requests
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}", response=self)
+
+    def to_dict(self) -> dict:
+        return {"url": self.url, "status_code": self.status_code, "text": self.text}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RecordedResponse":
+        return cls(data["url"], data["status_code"], data["text"])
+
+
+def http_get(url: str, **kwargs):
+    """
+    requests.get through the cassette (a plain requests.get when it is off)
+
+    Returns:
+        requests.Response, or a RecordedResponse when recording or replaying
+    """
+    import requests
+
+    cassette = get_cassette()
+    if cassette is None:
+        return requests.get(url, **kwargs)
+
+    def fetch():
+        response = requests.get(url, **kwargs)
+        return RecordedResponse(redact_url(response.url), response.status_code, response.text)
+
+    return cassette.call(
+        "http",
+        {"method": "GET", "url": redact_url(url)},
+        fetch,
+        group=urllib.parse.urlsplit(url).netloc,
+        encode=RecordedResponse.to_dict,
+        decode=RecordedResponse.from_dict
+    )
+
+
+def recorded(fn):
+    """
+    Decorator: records / replays a function with JSON-serializable arguments and result
+    """
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        cassette = get_cassette()
+        if cassette is None:
+            return fn(*args, **kwargs)
+        request = {"function": fn.__qualname__, "args": list(args), "kwargs": kwargs}
+        # Snapshot the result as recorded; callers may mutate it afterwards
+        return cassette.call(
+            "function", request, lambda: fn(*args, **kwargs), group=fn.__qualname__,
+            encode=lambda result: json.loads(json.dumps(result, default=str))
+        )
+
+    return wrapper
+
+
+class CassetteChatModel(BaseChatModel):
+    """
+    Chat model that records the wrapped model's answers, or replays them
+
+    On replay there is no wrapped model; answers come from the cassette.
+    """
+
+    inner: Optional[Any] = None
+    purpose: str = "default"
+    temperature: Optional[float] = None
+
+    @property
+    def _llm_type(self) -> str:
+        return "cassette"
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager=None, **kwargs: Any) -> ChatResult:
+        request = {
+            "purpose": self.purpose,
+            "temperature": self.temperature,
+            "stop": stop,
+            "messages": [[message.type, message.content] for message in messages]
+        }
+
+        def generate():
+            # Callbacks are reported once, by this model
+            result = self.inner._generate(messages, stop=stop, **kwargs)
+            return result.generations[0].message
+
+        def encode(message) -> dict:
+            return {"content": message.content, "usage_metadata": getattr(message, "usage_metadata", None)}
+
+        def decode(data: dict):
+            return AIMessage(content=data["content"], usage_metadata=data.get("usage_metadata"))
+
+        cassette = get_cassette()
+        if cassette is None:
+            message = generate()
+        else:
+            message = cassette.call("llm", request, generate, group=self.purpose, encode=encode, decode=decode)
+
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+def summarize_cassette(path) -> str:
+    """
+    Formats call counts and recorded time per kind and group
+    """
+    rows = {}
+    for entry in read_entries(path):
+        row = rows.setdefault((entry["kind"], entry.get("group") or ""), {"count": 0, "seconds": 0.0, "errors": 0})
+        row["count"] += 1
+        row["seconds"] += entry.get("duration") or 0.0
+        row["errors"] += 1 if entry.get("error") else 0
+
+    lines = [f"{'kind':<10}{'group':<36}{'calls':>7}{'recorded s':>12}{'errors':>8}", "-" * 73]
+    for (kind, group), row in sorted(rows.items()):
+        lines.append(f"{kind:<10}{group[:35]:<36}{row['count']:>7}{row['seconds']:>12.2f}{row['errors']:>8}")
+    total = sum(row["seconds"] for row in rows.values())
+    lines.append(f"\n{sum(row['count'] for row in rows.values())} calls, {total:.2f} s recorded")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect record/replay cassettes")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    stats_parser = subparsers.add_parser("stats", help="Calls and recorded time per kind")
+    stats_parser.add_argument("path", nargs="?", default=str(CASSETTE_FILE))
+    args = parser.parse_args()
+
+    if not Path(args.path).exists():
+        print(f"Cassette not found: {args.path}")
+        sys.exit(1)
+    print(summarize_cassette(args.path))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,6 @@
 import json
-from langchain_huggingface import HuggingFaceEmbeddings
-from langchain_chroma import Chroma
+from tools.vector_store import get_vector_store
 from config.settings import (
-    CHROMA_DIR,
-    EMBEDDING_MODEL,
     FINDINGS_COLLECTION,
     REPORT_COLLECTION
 )
@@ -29,12 +26,7 @@ def query_findings(action_input: str) -> str:
         query = query.strip()
         patient_id = patient_id.strip()
         
-        embeddings = HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL)
-        vector_store = Chroma(
-            collection_name=FINDINGS_COLLECTION,
-            embedding_function=embeddings,
-            persist_directory=str(CHROMA_DIR)
-        )
+        vector_store = get_vector_store(FINDINGS_COLLECTION)
         
         results = vector_store.similarity_search(
             query,
@@ -80,13 +72,7 @@ def get_patient_history(patient_id: str) -> str:
     try:
         patient_id = patient_id.strip()
         
-        embeddings = HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL)
-        
-        findings_store = Chroma(
-            collection_name=FINDINGS_COLLECTION,
-            embedding_function=embeddings,
-            persist_directory=str(CHROMA_DIR)
-        )
+        findings_store = get_vector_store(FINDINGS_COLLECTION)
         
         findings_results = findings_store.get(
             where={"patient_id": patient_id},
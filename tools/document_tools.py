@@ -2,13 +2,13 @@ import re
 from datetime import datetime
 from uuid import uuid4
 from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_huggingface import HuggingFaceEmbeddings
-from langchain_chroma import Chroma
+from tools.vector_store import get_vector_store
+from tools.report_index import allocate_sequence
 from langchain.docstore.document import Document
 from config.settings import (
-    CHROMA_DIR, 
-    EMBEDDING_MODEL, 
     REPORT_COLLECTION,
+    FINDINGS_COLLECTION,
+    SUMMARY_COLLECTION,
     CHUNK_SIZE,
     CHUNK_OVERLAP,
     DEFAULT_PATIENT_ID
@@ -49,32 +49,39 @@ def extract_report_data(text: str) -> tuple:
     return report_date, confidence
 
 
-def get_next_report_id() -> str:
+def get_max_stored_report_number() -> int:
     """
-    Generates next sequential report ID
+    Scans the report collection for the highest report number in use
+    
+    Only used once, to seed the report ID sequence.
     
     Returns:
-        Report ID string (e.g., "RPT-1")
+        Highest N among stored "RPT-N" IDs, or 0
     """
-    embeddings = HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL)
-    vector_store = Chroma(
-        collection_name=REPORT_COLLECTION,
-        embedding_function=embeddings,
-        persist_directory=str(CHROMA_DIR)
-    )
+    vector_store = get_vector_store(REPORT_COLLECTION)
     
     results = vector_store.get(include=["metadatas"])
     
     if not results["metadatas"]:
-        return "RPT-1"
+        return 0
     
     report_ids = [m["report_id"] for m in results["metadatas"] if "report_id" in m]
     
     if not report_ids:
-        return "RPT-1"
+        return 0
+    
+    return max(int(r.split("-")[1]) for r in report_ids)
+
+
+def get_next_report_id() -> str:
+    """
+    Generates next sequential report ID
     
-    max_id = max(int(r.split("-")[1]) for r in report_ids)
-    return f"RPT-{max_id + 1}"
+    Returns:
+        Report ID string (e.g., "RPT-1")
+    """
+    number = allocate_sequence("report_id", seed=get_max_stored_report_number)
+    return f"RPT-{number}"
 
 
 def convert_text_to_document(
@@ -140,12 +147,7 @@ def store_in_chroma(chunks: list) -> None:
     Args:
         chunks: List of document chunks
     """
-    embeddings = HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL)
-    vector_store = Chroma(
-        collection_name=REPORT_COLLECTION,
-        embedding_function=embeddings,
-        persist_directory=str(CHROMA_DIR)
-    )
+    vector_store = get_vector_store(REPORT_COLLECTION)
     
     uuids = [str(uuid4()) for _ in range(len(chunks))]
     vector_store.add_documents(documents=chunks, ids=uuids)
@@ -174,4 +176,26 @@ def store_content(text: str, patient_id: str = DEFAULT_PATIENT_ID) -> dict:
     chunks = split_document(document)
     store_in_chroma(chunks)
     
-    return metadata
\ No newline at end of file
+    return metadata
+
+
+def delete_report_documents(report_id: str) -> int:
+    """
+    Removes a report's chunks, findings and summaries from ChromaDB
+    
+    Used to clear what a failed ingest stored before the report is ingested again.
+    
+    Args:
+        report_id: Report identifier
+        
+    Returns:
+        Number of documents deleted
+    """
+    deleted = 0
+    for collection in (REPORT_COLLECTION, FINDINGS_COLLECTION, SUMMARY_COLLECTION):
+        vector_store = get_vector_store(collection)
+        ids = vector_store.get(where={"report_id": report_id}, include=[]).get("ids", [])
+        if ids:
+            vector_store.delete(ids=ids)
+            deleted += len(ids)
+    return deleted
@@ -1,12 +1,9 @@
 import re
 import ast
 import json
-from langchain_huggingface import HuggingFaceEmbeddings
-from langchain_chroma import Chroma
+from tools.vector_store import get_vector_store
 from langchain.docstore.document import Document
 from config.settings import (
-    CHROMA_DIR,
-    EMBEDDING_MODEL,
     REPORT_COLLECTION,
     FINDINGS_COLLECTION
 )
@@ -34,12 +31,7 @@ def get_content(metadata: str) -> str:
     
     report_id = match.group(1)
     
-    embeddings = HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL)
-    vector_store = Chroma(
-        collection_name=REPORT_COLLECTION,
-        embedding_function=embeddings,
-        persist_directory=str(CHROMA_DIR)
-    )
+    vector_store = get_vector_store(REPORT_COLLECTION)
     
     results = vector_store.get(
         where={"report_id": report_id},
@@ -73,12 +65,7 @@ def save_findings(action_input) -> str:
     if not metadata:
         raise ValueError("Metadata is required")
 
-    embeddings = HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL)
-    vector_store = Chroma(
-        collection_name=FINDINGS_COLLECTION,
-        embedding_function=embeddings,
-        persist_directory=str(CHROMA_DIR)
-    )
+    vector_store = get_vector_store(FINDINGS_COLLECTION)
 
     document = Document(
         page_content=json.dumps(
@@ -90,4 +77,30 @@ def save_findings(action_input) -> str:
 
     vector_store.add_documents(documents=[document])
     print(f"✅ Saved findings for report {metadata.get('report_id')}")
-    return "Findings saved successfully"
\ No newline at end of file
+    return "Findings saved successfully"
+
+
+def get_report_findings(report_id: str) -> dict:
+    """
+    Retrieves the stored findings for a report
+    
+    Args:
+        report_id: Report identifier (e.g., "RPT-3")
+        
+    Returns:
+        Dictionary with 'findings' and 'values' (empty if none were saved)
+    """
+    vector_store = get_vector_store(FINDINGS_COLLECTION)
+    
+    results = vector_store.get(
+        where={"report_id": report_id},
+        include=["documents"]
+    )
+    
+    for doc in reversed(results.get("documents", [])):
+        try:
+            return json.loads(doc)
+        except Exception:
+            continue
+    
+    return {"findings": [], "values": {}}
@@ -0,0 +1,252 @@
+"""
+Disk-backed LLM response cache
+
+A LangChain BaseCache on SQLite (LLM_CACHE_DB), shared by every process on
+the machine. Entries are keyed by the model's parameters string (model
+name, temperature, stop words, ...) and the SHA-256 of the prompt with its
+whitespace normalized. Entries expire after LLM_CACHE_TTL_SECONDS; beyond
+LLM_CACHE_MAX_ENTRIES the least recently used ones are evicted.
+
+Callers that validate an answer wrap the call in track_cached_answers()
+and pass the tracked keys to discard_cached_answers() when they reject it,
+so a malformed answer is not served again for the same prompt.
+
+Usage:
+    python -m tools.llm_cache stats
+    python -m tools.llm_cache clear
+"""
+import re
+import time
+import json
+import sqlite3
+import hashlib
+import argparse
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Optional
+
+from langchain_core.caches import BaseCache
+from langchain_core.load import dumps, loads
+
+from config.settings import (
+    LLM_CACHE_DB,
+    LLM_CACHE_TTL_SECONDS,
+    LLM_CACHE_MAX_ENTRIES,
+    ensure_directories
+)
+from observability.metrics import LLM_CACHE_LOOKUPS
+
+
+_cache = None
+_cache_lock = threading.Lock()
+_tracked_keys = contextvars.ContextVar("llm_cache_tracked_keys", default=None)
+
+
+def normalize_prompt(prompt: str) -> str:
+    """
+    Collapses runs of whitespace, including escaped newlines and tabs in
+    serialized messages, so formatting-only differences share an entry
+    """
+    return re.sub(r"(?:\\[nrt]|\s)+", " ", prompt).strip()
+
+
+def cache_key(prompt: str, llm_string: str) -> str:
+    digest = hashlib.sha256()
+    digest.update(hashlib.sha256(llm_string.encode("utf-8")).digest())
+    digest.update(normalize_prompt(prompt).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _track(key: str):
+    keys = _tracked_keys.get()
+    if keys is not None:
+        keys.append(key)
+
+
+@contextmanager
+def track_cached_answers():
+    """
+    Collects the keys of the cache entries read or written inside the block
+
+    Yields:
+        List the keys are appended to
+    """
+    keys = []
+    token = _tracked_keys.set(keys)
+    try:
+        yield keys
+    finally:
+        _tracked_keys.reset(token)
+
+
+def discard_cached_answers(keys: list):
+    """
+    Evicts entries collected by track_cached_answers(), e.g. an answer that failed validation
+    """
+    if keys:
+        get_llm_cache().discard(keys)
+
+
+class SQLiteLLMCache(BaseCache):
+    """
+    LLM response cache with TTL and LRU eviction
+    """
+
+    def __init__(self, path=LLM_CACHE_DB, ttl_seconds: int = LLM_CACHE_TTL_SECONDS, max_entries: int = LLM_CACHE_MAX_ENTRIES):
+        """
+        Args:
+            path: SQLite database file
+            ttl_seconds: Age after which an entry is ignored and removed (0 = never)
+            max_entries: Entries kept before least recently used ones are evicted
+        """
+        self.path = str(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        ensure_directories()
+
+        with self._db() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    llm_hash TEXT NOT NULL,
+                    generations TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL,
+                    hits INTEGER NOT NULL DEFAULT 0
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_last_used ON llm_cache (last_used)")
+
+    @contextmanager
+    def _db(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return bool(self.ttl_seconds) and now - created_at > self.ttl_seconds
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[list]:
+        key = cache_key(prompt, llm_string)
+        now = time.time()
+
+        with self._db() as conn:
+            row = conn.execute("SELECT generations, created_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                LLM_CACHE_LOOKUPS.inc(outcome="miss")
+                return None
+            if self._expired(row[1], now):
+                conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                LLM_CACHE_LOOKUPS.inc(outcome="expired")
+                return None
+            conn.execute("UPDATE llm_cache SET last_used = ?, hits = hits + 1 WHERE key = ?", (now, key))
+
+        try:
+            generations = [loads(item) for item in json.loads(row[0])]
+        except Exception as e:
+            print(f"Discarding unreadable LLM cache entry: {e}")
+            with self._db() as conn:
+                conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            LLM_CACHE_LOOKUPS.inc(outcome="miss")
+            return None
+
+        # A cached answer costs no tokens; don't report the original usage again
+        for generation in generations:
+            message = getattr(generation, "message", None)
+            if message is not None and getattr(message, "usage_metadata", None):
+                message.usage_metadata = None
+
+        LLM_CACHE_LOOKUPS.inc(outcome="hit")
+        _track(key)
+        return generations
+
+    def update(self, prompt: str, llm_string: str, return_val: list) -> None:
+        key = cache_key(prompt, llm_string)
+        llm_hash = hashlib.sha256(llm_string.encode("utf-8")).hexdigest()
+        payload = json.dumps([dumps(generation) for generation in return_val])
+        now = time.time()
+
+        with self._db() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, llm_hash, generations, created_at, last_used, hits) VALUES (?, ?, ?, ?, ?, 0)",
+                (key, llm_hash, payload, now, now)
+            )
+            self._evict(conn, now)
+        _track(key)
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        if self.ttl_seconds:
+            conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_seconds,))
+
+        count = conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        if count > self.max_entries:
+            conn.execute(
+                "DELETE FROM llm_cache WHERE key IN (SELECT key FROM llm_cache ORDER BY last_used ASC LIMIT ?)",
+                (count - self.max_entries,)
+            )
+
+    def discard(self, keys: list) -> None:
+        """
+        Removes the entries with the given keys
+        """
+        with self._db() as conn:
+            conn.executemany("DELETE FROM llm_cache WHERE key = ?", [(key,) for key in keys])
+
+    def clear(self, **kwargs) -> None:
+        with self._db() as conn:
+            conn.execute("DELETE FROM llm_cache")
+
+    def stats(self) -> dict:
+        """
+        Returns entry count, total hits, models cached and the age of the oldest entry
+        """
+        with self._db() as conn:
+            entries, hits, models, oldest = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(hits), 0), COUNT(DISTINCT llm_hash), MIN(created_at) FROM llm_cache"
+            ).fetchone()
+        return {
+            "entries": entries,
+            "hits": hits,
+            "model_configs": models,
+            "oldest_age_seconds": round(time.time() - oldest, 1) if oldest else None,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds
+        }
+
+
+def get_llm_cache() -> SQLiteLLMCache:
+    """
+    Returns the process-wide LLM cache (opened on first use)
+    """
+    global _cache
+
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = SQLiteLLMCache()
+    return _cache
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or clear the LLM response cache")
+    parser.add_argument("command", choices=["stats", "clear"])
+    args = parser.parse_args()
+
+    cache = get_llm_cache()
+    if args.command == "clear":
+        cache.clear()
+        print(f"Cleared {cache.path}")
+    else:
+        for name, value in cache.stats().items():
+            print(f"{name:<20}{value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+import time
+import queue
+import threading
+from contextlib import contextmanager
+from config.settings import OCR_LANGUAGES, OCR_GPU, OCR_READER_POOL_SIZE
+
+
+class ReaderPool:
+    """
+    Pool of warm EasyOCR readers for one language set
+
+    Readers are built lazily, up to `size` of them, and handed out to one
+    worker at a time. Callers block until a reader is free once the pool
+    is full.
+    """
+
+    def __init__(self, languages: tuple, gpu: bool = OCR_GPU, size: int = OCR_READER_POOL_SIZE):
+        self.languages = languages
+        self.gpu = gpu
+        self.size = max(1, size)
+        self.load_times = []
+        self._idle = queue.LifoQueue()
+        self._built = 0
+        self._lock = threading.Lock()
+
+    def _build_reader(self):
+        import easyocr
+
+        start = time.perf_counter()
+        reader = easyocr.Reader(list(self.languages), gpu=self.gpu)
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            self.load_times.append(elapsed)
+
+        print(f"Loaded EasyOCR reader {list(self.languages)} in {elapsed:.2f}s")
+        return reader
+
+    @contextmanager
+    def acquire(self, timeout: float = None):
+        """
+        Checks out a reader for exclusive use
+
+        Args:
+            timeout: Seconds to wait for a free reader (None waits forever)
+
+        Yields:
+            easyocr.Reader instance
+        """
+        reader = None
+
+        try:
+            reader = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_build = self._built < self.size
+                if can_build:
+                    self._built += 1
+
+            if can_build:
+                try:
+                    reader = self._build_reader()
+                except Exception:
+                    with self._lock:
+                        self._built -= 1
+                    raise
+            else:
+                reader = self._idle.get(timeout=timeout)
+
+        try:
+            yield reader
+        finally:
+            self._idle.put(reader)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "languages": list(self.languages),
+                "readers_built": self._built,
+                "readers_idle": self._idle.qsize(),
+                "load_times": list(self.load_times)
+            }
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_reader_pool(languages=None) -> ReaderPool:
+    """
+    Returns the process-wide reader pool for a language set
+
+    Args:
+        languages: List of EasyOCR language codes (defaults to OCR_LANGUAGES)
+
+    Returns:
+        ReaderPool instance
+    """
+    key = tuple(sorted(languages or OCR_LANGUAGES))
+
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = ReaderPool(key)
+            _pools[key] = pool
+
+    return pool
+
+
+@contextmanager
+def acquire_reader(languages=None, timeout: float = None):
+    """
+    Checks out a warm reader for the given language set
+
+    Args:
+        languages: List of EasyOCR language codes (defaults to OCR_LANGUAGES)
+        timeout: Seconds to wait for a free reader
+
+    Yields:
+        easyocr.Reader instance
+    """
+    with get_reader_pool(languages).acquire(timeout=timeout) as reader:
+        yield reader
+
+
+def get_reader_pool_stats() -> list:
+    """
+    Returns reader counts and load times for every pool
+
+    Returns:
+        List of per-pool stats dictionaries
+    """
+    with _pools_lock:
+        pools = list(_pools.values())
+    return [pool.stats() for pool in pools]
@@ -1,8 +1,27 @@
 import os
 import ast
-from pdf2image import convert_from_path
-import easyocr
-from config.settings import TEMP_DIR, OCR_LANGUAGES, OCR_GPU
+import time
+import types
+import subprocess
+import threading
+import multiprocessing
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from pdf2image import convert_from_path, pdfinfo_from_path
+from config.settings import (
+    OCR_LANGUAGES,
+    OCR_GPU,
+    OCR_WORKERS,
+    PDF_DPI,
+    PDF_PAGE_WINDOW,
+    PDF_TEXT_LAYER,
+    PDF_TEXT_MIN_CHARS
+)
+from tools.ocr_reader_pool import acquire_reader
+from tools.workspace import scratch_dir, current_workspace, remove_scratch_dir
+from observability.tracing import span, record_span
+from observability.metrics import OCR_PAGES, OCR_PAGE_SECONDS
 
 
 def get_file_type(doc_path: str) -> str:
@@ -26,22 +45,170 @@ def get_file_type(doc_path: str) -> str:
         raise ValueError("Unsupported File Type. Must be pdf or image.")
 
 
+def get_pdf_page_count(pdf_path: str) -> int:
+    """
+    Reads the page count of a PDF without rendering it
+    
+    Args:
+        pdf_path: Path to PDF file
+        
+    Returns:
+        Number of pages
+    """
+    return int(pdfinfo_from_path(pdf_path)["Pages"])
+
+
+def _page_windows(page_numbers: list, window: int) -> list:
+    """
+    Groups sorted page numbers into consecutive (first, last) runs of at most `window` pages
+    """
+    runs = []
+    for page in page_numbers:
+        if runs and page == runs[-1][1] + 1 and page - runs[-1][0] < window:
+            runs[-1][1] = page
+        else:
+            runs.append([page, page])
+    return [tuple(run) for run in runs]
+
+
+def iter_pdf_pages(
+    pdf_path: str, 
+    dpi: int = PDF_DPI, 
+    window: int = PDF_PAGE_WINDOW, 
+    page_numbers: list = None
+):
+    """
+    Renders a PDF a few pages at a time
+    
+    Only `window` pages are held in memory at once, so peak memory does not
+    grow with the length of the document.
+    
+    Args:
+        pdf_path: Path to PDF file
+        dpi: Rendering resolution
+        window: Number of pages rendered per poppler call
+        page_numbers: Pages to render (1-based); all pages when None
+        
+    Yields:
+        Tuple of (page_number, PIL image), page numbers starting at 1
+    """
+    if page_numbers is None:
+        page_numbers = range(1, get_pdf_page_count(pdf_path) + 1)
+    
+    for first, last in _page_windows(sorted(page_numbers), max(1, window)):
+        with span("pdf.render", "ocr", first_page=first, last_page=last, dpi=dpi):
+            pages = convert_from_path(pdf_path, dpi=dpi, first_page=first, last_page=last)
+        
+        for offset, page in enumerate(pages):
+            yield first + offset, page
+        
+        del pages
+
+
+def iter_pdf_arrays(pdf_path: str, dpi: int = PDF_DPI, window: int = PDF_PAGE_WINDOW):
+    """
+    Renders a PDF page by page as RGB arrays ready for OCR
+    
+    Args:
+        pdf_path: Path to PDF file
+        dpi: Rendering resolution
+        window: Number of pages rendered per poppler call
+        
+    Yields:
+        numpy array per page, in page order
+    """
+    for _, page in iter_pdf_pages(pdf_path, dpi=dpi, window=window):
+        yield np.asarray(page.convert("RGB"))
+        page.close()
+
+
+def extract_text_layer(pdf_path: str) -> list:
+    """
+    Reads the embedded text layer of every page using poppler's pdftotext
+    
+    Args:
+        pdf_path: Path to PDF file
+        
+    Returns:
+        List of page texts in page order (empty list if pdftotext is unavailable)
+    """
+    try:
+        output = subprocess.run(
+            ["pdftotext", "-layout", "-enc", "UTF-8", pdf_path, "-"],
+            check=True,
+            capture_output=True
+        ).stdout.decode("utf-8", errors="replace")
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"Text layer extraction unavailable, falling back to OCR: {e}")
+        return []
+    
+    # pdftotext ends every page with a form feed
+    pages = output.split("\f")
+    if pages and not pages[-1].strip():
+        pages = pages[:-1]
+    return pages
+
+
+def is_usable_text(text: str, min_chars: int = PDF_TEXT_MIN_CHARS) -> bool:
+    """
+    Decides whether an embedded page text is good enough to skip OCR
+    
+    Args:
+        text: Page text from the PDF text layer
+        min_chars: Minimum number of non-whitespace characters
+        
+    Returns:
+        True if the text can be used instead of OCR
+    """
+    chars = [c for c in text if not c.isspace()]
+    if len(chars) < min_chars:
+        return False
+    
+    alnum = sum(1 for c in chars if c.isalnum())
+    garbage = sum(1 for c in chars if c == "\ufffd" or not c.isprintable())
+    
+    return alnum / len(chars) >= 0.5 and garbage / len(chars) <= 0.05
+
+
+def get_native_pages(pdf_path: str) -> dict:
+    """
+    Collects pages whose embedded text can be used directly
+    
+    Args:
+        pdf_path: Path to PDF file
+        
+    Returns:
+        Dictionary of page_number -> list of non-empty text lines
+    """
+    native = {}
+    for page_number, text in enumerate(extract_text_layer(pdf_path), 1):
+        if is_usable_text(text):
+            native[page_number] = [line.strip() for line in text.splitlines() if line.strip()]
+    return native
+
+
 def convert_to_jpg(pdf_path: str) -> list:
     """
     Converts PDF files to images for performing OCR
     
+    Pages are written to the current job's workspace, so concurrent jobs
+    never share or delete each other's files. Outside a job they go to a
+    private directory under TEMP_DIR; pass any of the returned paths to
+    cleanup_temp_files() to remove it.
+    
     Args:
         pdf_path: Path to PDF file
         
     Returns:
         List of image file paths
     """
-    pages = convert_from_path(pdf_path)
+    workspace = scratch_dir(prefix="pages-")
     pg_arr = []
     
-    for i, page in enumerate(pages):
-        path = TEMP_DIR / f"temp_page_{i}.png"
+    for page_number, page in iter_pdf_pages(pdf_path):
+        path = workspace / f"temp_page_{page_number - 1}.png"
         page.save(str(path), "PNG")
+        page.close()
         pg_arr.append(str(path))
     
     print(f"Extracted {len(pg_arr)} pages from PDF")
@@ -53,7 +220,7 @@ def get_ocr(imgs) -> dict:
     Performs OCR on images using EasyOCR
     
     Args:
-        imgs: List of image paths or single image path
+        imgs: Image path, numpy array, or a list / generator of them
         
     Returns:
         Dictionary with 'content' and 'confidence'
@@ -64,18 +231,60 @@ def get_ocr(imgs) -> dict:
         except Exception:
             imgs = [imgs]
     
-    if not isinstance(imgs, list):
+    if not isinstance(imgs, (list, tuple, types.GeneratorType)):
         imgs = [imgs]
     
-    reader = easyocr.Reader(OCR_LANGUAGES, gpu=OCR_GPU)
+    page_results = {}
+    
+    with acquire_reader(OCR_LANGUAGES) as reader:
+        for index, img in enumerate(imgs):
+            page_results[index] = _read_page(reader, img)
+    
+    result = combine_page_results(page_results)
+    result["ocr_pages"] = len(page_results)
+    result["native_pages"] = 0
+    return result
+
+
+def _read_page(reader, image) -> tuple:
+    """
+    Runs a reader over one page
+    
+    Returns:
+        Tuple of (texts, scores)
+    """
+    # Metrics recorded inside OCR worker processes stay there; the parent
+    # records those pages from the returned timings instead
+    started = time.perf_counter()
+    with span("ocr.page", "ocr") as page_span:
+        result = reader.readtext(image, detail=1)
+        page_span.set(boxes=len(result))
+    OCR_PAGES.inc(source="ocr")
+    OCR_PAGE_SECONDS.observe(time.perf_counter() - started)
+    texts = [text for (_, text, _) in result]
+    scores = [score for (_, _, score) in result]
+    return texts, scores
+
+
+def combine_page_results(page_results: dict) -> dict:
+    """
+    Joins per-page OCR output in page order
+    
+    The confidence is the average over every text box on every page.
+    
+    Args:
+        page_results: Dictionary of page index -> (texts, scores)
+        
+    Returns:
+        Dictionary with 'content' and 'confidence'
+    """
     all_text = []
     all_score = []
     
-    for img_path in imgs:
-        result = reader.readtext(img_path, detail=1)
-        for (_, text, score) in result:
-            all_text.append(text)
-            all_score.append(score)
+    for index in sorted(page_results):
+        texts, scores = page_results[index]
+        all_text.extend(texts)
+        all_score.extend(scores)
     
     page_content = "\n".join(all_text)
     avg_confidence = sum(all_score) / len(all_score) if all_score else 0.0
@@ -86,12 +295,226 @@ def get_ocr(imgs) -> dict:
     }
 
 
-def cleanup_temp_files():
+# Parallel OCR: one warm reader per worker process
+_worker_reader = None
+_executor = None
+_executor_workers = 0
+_executor_lock = threading.Lock()
+
+
+def _init_ocr_worker(languages: list, gpu: bool):
+    """
+    Process pool initializer: loads one EasyOCR reader per worker
+    """
+    global _worker_reader
+    import easyocr
+    _worker_reader = easyocr.Reader(languages, gpu=gpu)
+
+
+def _ocr_page_task(task: tuple) -> tuple:
+    """
+    OCRs a single page inside a worker process
+    
+    Args:
+        task: (index, source, page_number, dpi) where source is a PDF path
+              (page_number set) or an image path (page_number None)
+        
+    Returns:
+        Tuple of (index, texts, scores, (start_us, duration_us, pid)), the
+        timing being recorded as a trace span by the parent process
+    """
+    index, source, page_number, dpi = task
+    start_us = time.time_ns() // 1000
+    started = time.perf_counter()
+    
+    if page_number is None:
+        image = source
+    else:
+        page = convert_from_path(source, dpi=dpi, first_page=page_number, last_page=page_number)[0]
+        image = np.asarray(page.convert("RGB"))
+        page.close()
+    
+    texts, scores = _read_page(_worker_reader, image)
+    timing = (start_us, int((time.perf_counter() - started) * 1e6), os.getpid())
+    return index, texts, scores, timing
+
+
+def get_ocr_executor(workers: int = OCR_WORKERS) -> ProcessPoolExecutor:
+    """
+    Returns the shared OCR process pool, (re)creating it if the size changed
+    
+    Args:
+        workers: Number of worker processes
+        
+    Returns:
+        ProcessPoolExecutor whose workers each hold a warm reader
+    """
+    global _executor, _executor_workers
+    
+    with _executor_lock:
+        if _executor is None or _executor_workers != workers:
+            if _executor is not None:
+                _executor.shutdown(wait=True)
+            _executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_ocr_worker,
+                initargs=(list(OCR_LANGUAGES), OCR_GPU)
+            )
+            _executor_workers = workers
+        return _executor
+
+
+def shutdown_ocr_workers():
+    """
+    Stops the OCR worker processes, if any were started
+    """
+    global _executor, _executor_workers
+    
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+        _executor = None
+        _executor_workers = 0
+
+
+def run_parallel_ocr(tasks: list, workers: int = OCR_WORKERS) -> dict:
     """
-    Cleans up temporary image files
+    Spreads page OCR tasks across the worker pool
+    
+    Args:
+        tasks: List of (index, source, page_number, dpi) tuples
+        workers: Number of worker processes
+        
+    Returns:
+        Dictionary of index -> (texts, scores)
     """
-    for file in TEMP_DIR.glob("temp_page_*.png"):
+    executor = get_ocr_executor(workers)
+    page_results = {}
+    
+    for index, texts, scores, (start_us, duration_us, pid) in executor.map(_ocr_page_task, tasks):
+        record_span("ocr.page", "ocr", start_us, duration_us, pid=pid, page=index, boxes=len(texts))
+        OCR_PAGES.inc(source="ocr")
+        OCR_PAGE_SECONDS.observe(duration_us / 1e6)
+        page_results[index] = (texts, scores)
+    
+    return page_results
+
+
+def get_ocr_parallel(imgs: list, workers: int = OCR_WORKERS) -> dict:
+    """
+    Performs OCR on a list of image paths using the worker pool
+    
+    Text is reassembled in page order and the confidence is the average over
+    every detected text box, exactly as in get_ocr.
+    
+    Args:
+        imgs: List of image paths
+        workers: Number of worker processes
+        
+    Returns:
+        Dictionary with 'content' and 'confidence'
+    """
+    tasks = [(i, img, None, None) for i, img in enumerate(imgs)]
+    result = combine_page_results(run_parallel_ocr(tasks, workers))
+    result["ocr_pages"] = len(tasks)
+    result["native_pages"] = 0
+    return result
+
+
+def ocr_pdf_pages(
+    pdf_path: str, 
+    page_numbers: list, 
+    dpi: int = PDF_DPI, 
+    window: int = PDF_PAGE_WINDOW, 
+    workers: int = OCR_WORKERS
+) -> dict:
+    """
+    OCRs selected PDF pages, streaming them in-process or spreading them over workers
+    
+    Args:
+        pdf_path: Path to PDF file
+        page_numbers: Pages to OCR (1-based)
+        dpi: Rendering resolution
+        window: Number of pages rendered per poppler call
+        workers: Number of OCR worker processes (1 runs in-process)
+        
+    Returns:
+        Dictionary of page_number -> (texts, scores)
+    """
+    if workers > 1 and len(page_numbers) > 1:
+        tasks = [(page, pdf_path, page, dpi) for page in page_numbers]
+        return run_parallel_ocr(tasks, workers)
+    
+    page_results = {}
+    with acquire_reader(OCR_LANGUAGES) as reader:
+        for page_number, page in iter_pdf_pages(pdf_path, dpi=dpi, window=window, page_numbers=page_numbers):
+            image = np.asarray(page.convert("RGB"))
+            page.close()
+            page_results[page_number] = _read_page(reader, image)
+    return page_results
+
+
+def ocr_pdf(
+    pdf_path: str, 
+    dpi: int = PDF_DPI, 
+    window: int = PDF_PAGE_WINDOW, 
+    workers: int = OCR_WORKERS,
+    use_text_layer: bool = PDF_TEXT_LAYER
+) -> dict:
+    """
+    Extracts the text of a PDF without writing temporary images
+    
+    Pages with a usable embedded text layer are read directly; only scanned
+    pages are rendered and OCR'd. Native lines count with confidence 1.0.
+    
+    Args:
+        pdf_path: Path to PDF file
+        dpi: Rendering resolution
+        window: Number of pages rendered per poppler call
+        workers: Number of OCR worker processes (1 runs in-process)
+        use_text_layer: Read embedded text before falling back to OCR
+        
+    Returns:
+        Dictionary with 'content', 'confidence', 'ocr_pages' and 'native_pages'
+    """
+    total = get_pdf_page_count(pdf_path)
+    native = get_native_pages(pdf_path) if use_text_layer else {}
+    scanned = [page for page in range(1, total + 1) if page not in native]
+    
+    page_results = {page: (lines, [1.0] * len(lines)) for page, lines in native.items()}
+    OCR_PAGES.inc(len(native), source="text_layer")
+    if scanned:
+        page_results.update(ocr_pdf_pages(pdf_path, scanned, dpi=dpi, window=window, workers=workers))
+    
+    print(f"Read {len(native)} pages from the text layer, OCR'd {len(scanned)} of {total} pages")
+    
+    result = combine_page_results(page_results)
+    result["ocr_pages"] = len(scanned)
+    result["native_pages"] = len(native)
+    return result
+
+
+def cleanup_temp_files(pages: list = None):
+    """
+    Cleans up temporary page images
+    
+    Inside a job this clears the job's own images; other jobs' files are
+    never touched, and the whole workspace is removed anyway when the job's
+    `job_workspace()` block exits. Outside a job, pass the paths returned by
+    convert_to_jpg() and their scratch directory is removed.
+    
+    Args:
+        pages: Page image paths from convert_to_jpg() (needed outside a job)
+    """
+    workspace = current_workspace()
+    if workspace is None:
+        if pages:
+            remove_scratch_dir(Path(pages[0]).parent)
+        return
+    
+    for file in workspace.glob("temp_page_*.png"):
         try:
             file.unlink()
         except Exception as e:
-            print(f"Error deleting {file}: {e}")
\ No newline at end of file
+            print(f"Error deleting {file}: {e}")
@@ -0,0 +1,354 @@
+import re
+import sqlite3
+import hashlib
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Optional
+from config.settings import REPORT_INDEX_DB, ensure_directories
+
+
+def _connect() -> sqlite3.Connection:
+    """
+    Opens the report index database, creating the schema on first use
+    """
+    ensure_directories()
+    conn = sqlite3.connect(str(REPORT_INDEX_DB), timeout=30)
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS report_hashes (
+            patient_id TEXT NOT NULL,
+            report_id TEXT NOT NULL,
+            file_sha256 TEXT,
+            text_sha256 TEXT,
+            created_at TEXT NOT NULL,
+            completed_at TEXT
+        )
+        """
+    )
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(report_hashes)")]
+    if "completed_at" not in columns:
+        # Indexes written before reports were marked complete: treat their rows as complete
+        try:
+            conn.execute("ALTER TABLE report_hashes ADD COLUMN completed_at TEXT")
+            conn.execute("UPDATE report_hashes SET completed_at = created_at")
+        except sqlite3.OperationalError as e:
+            # Another process migrated it first
+            if "duplicate column" not in str(e):
+                raise
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_report_file ON report_hashes (patient_id, file_sha256)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_report_text ON report_hashes (patient_id, text_sha256)"
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS sequences (
+            name TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS running_summaries (
+            patient_id TEXT PRIMARY KEY,
+            last_report_id TEXT NOT NULL,
+            reports_covered INTEGER NOT NULL,
+            summary TEXT NOT NULL,
+            previous_summary TEXT,
+            previous_reports_covered INTEGER NOT NULL DEFAULT 0,
+            updated_at TEXT NOT NULL
+        )
+        """
+    )
+    conn.commit()
+    return conn
+
+
+@contextmanager
+def _index():
+    """
+    Yields a connection that is committed and closed on exit
+    """
+    conn = _connect()
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def hash_file(file_path: str) -> str:
+    """
+    Computes the SHA-256 of a file's bytes
+
+    Args:
+        file_path: Path to file
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalizes extracted text so trivial whitespace and case differences hash the same
+    """
+    return re.sub(r"\s+", " ", str(text)).strip().lower()
+
+
+def hash_text(text: str) -> str:
+    """
+    Computes the SHA-256 of normalized extracted text
+
+    Args:
+        text: Extracted report text
+
+    Returns:
+        Hex digest
+    """
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+def find_report_by_file(patient_id: str, file_sha256: str) -> Optional[str]:
+    """
+    Looks up a completed report previously ingested from the same file bytes
+
+    Args:
+        patient_id: Patient identifier
+        file_sha256: SHA-256 of the file
+
+    Returns:
+        Existing report_id or None
+    """
+    with _index() as conn:
+        row = conn.execute(
+            "SELECT report_id FROM report_hashes "
+            "WHERE patient_id = ? AND file_sha256 = ? AND completed_at IS NOT NULL LIMIT 1",
+            (patient_id, file_sha256)
+        ).fetchone()
+    return row[0] if row else None
+
+
+def find_report_by_text(patient_id: str, text_sha256: str) -> Optional[str]:
+    """
+    Looks up a completed report previously ingested with the same normalized text
+
+    Args:
+        patient_id: Patient identifier
+        text_sha256: SHA-256 of the normalized text
+
+    Returns:
+        Existing report_id or None
+    """
+    with _index() as conn:
+        row = conn.execute(
+            "SELECT report_id FROM report_hashes "
+            "WHERE patient_id = ? AND text_sha256 = ? AND completed_at IS NOT NULL LIMIT 1",
+            (patient_id, text_sha256)
+        ).fetchone()
+    return row[0] if row else None
+
+
+def record_report(
+    patient_id: str,
+    report_id: str,
+    file_sha256: Optional[str] = None,
+    text_sha256: Optional[str] = None,
+    completed: bool = False
+) -> None:
+    """
+    Records the hashes of a newly stored report
+
+    The row does not count for duplicate detection until complete_report()
+    marks it, so a report whose extraction or summarization failed is
+    ingested again on the next upload instead of resolving to a half-built one.
+
+    Args:
+        patient_id: Patient identifier
+        report_id: Report ID assigned when the document was saved
+        file_sha256: SHA-256 of the source file, if any
+        text_sha256: SHA-256 of the normalized extracted text
+        completed: Mark the row complete right away (e.g. another file of a finished report)
+    """
+    now = datetime.now().isoformat()
+    with _index() as conn:
+        conn.execute(
+            "INSERT INTO report_hashes (patient_id, report_id, file_sha256, text_sha256, created_at, completed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (patient_id, report_id, file_sha256, text_sha256, now, now if completed else None)
+        )
+
+
+def complete_report(patient_id: str, report_id: str) -> None:
+    """
+    Marks a report's hashes complete once the whole workflow has finished
+
+    Args:
+        patient_id: Patient identifier
+        report_id: Report ID assigned when the document was saved
+    """
+    with _index() as conn:
+        conn.execute(
+            "UPDATE report_hashes SET completed_at = ? "
+            "WHERE patient_id = ? AND report_id = ? AND completed_at IS NULL",
+            (datetime.now().isoformat(), patient_id, report_id)
+        )
+
+
+def find_incomplete_reports(
+    patient_id: str,
+    file_sha256: Optional[str] = None,
+    text_sha256: Optional[str] = None
+) -> list:
+    """
+    Lists reports of the same file or text whose ingest never finished
+
+    Args:
+        patient_id: Patient identifier
+        file_sha256: SHA-256 of the source file, if any
+        text_sha256: SHA-256 of the normalized extracted text
+
+    Returns:
+        List of report IDs (empty when there are none)
+    """
+    with _index() as conn:
+        rows = conn.execute(
+            "SELECT DISTINCT report_id FROM report_hashes "
+            "WHERE patient_id = ? AND completed_at IS NULL "
+            "AND ((file_sha256 IS NOT NULL AND file_sha256 = ?) OR (text_sha256 IS NOT NULL AND text_sha256 = ?))",
+            (patient_id, file_sha256, text_sha256)
+        ).fetchall()
+    return [row[0] for row in rows]
+
+
+def forget_report(patient_id: str, report_id: str) -> None:
+    """
+    Drops the index rows of a report whose ingest never finished
+
+    Args:
+        patient_id: Patient identifier
+        report_id: Report ID of the failed ingest
+    """
+    with _index() as conn:
+        conn.execute(
+            "DELETE FROM report_hashes WHERE patient_id = ? AND report_id = ? AND completed_at IS NULL",
+            (patient_id, report_id)
+        )
+
+
+def allocate_sequence(name: str, seed: Callable[[], int]) -> int:
+    """
+    Atomically allocates the next value of a persistent sequence
+    
+    The allocation runs inside an exclusive SQLite write transaction, so it
+    is safe across threads and processes. The first call seeds the sequence
+    with `seed()` (the highest value already in use).
+
+    Args:
+        name: Sequence name
+        seed: Callable returning the current maximum, used only on first use
+
+    Returns:
+        Newly allocated value
+    """
+    conn = _connect()
+    conn.isolation_level = None
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        row = conn.execute("SELECT value FROM sequences WHERE name = ?", (name,)).fetchone()
+
+        if row is None:
+            value = int(seed()) + 1
+            conn.execute("INSERT INTO sequences (name, value) VALUES (?, ?)", (name, value))
+        else:
+            value = row[0] + 1
+            conn.execute("UPDATE sequences SET value = ? WHERE name = ?", (value, name))
+
+        conn.execute("COMMIT")
+        return value
+    except Exception:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+
+
+def get_running_summary(patient_id: str) -> Optional[dict]:
+    """
+    Returns the patient's running history summary
+
+    Args:
+        patient_id: Patient identifier
+
+    Returns:
+        Dictionary with last_report_id, reports_covered, summary and the
+        previous_summary / previous_reports_covered it replaced, or None
+    """
+    with _index() as conn:
+        row = conn.execute(
+            "SELECT last_report_id, reports_covered, summary, previous_summary, previous_reports_covered "
+            "FROM running_summaries WHERE patient_id = ?",
+            (patient_id,)
+        ).fetchone()
+    if row is None:
+        return None
+    return {
+        "last_report_id": row[0],
+        "reports_covered": row[1],
+        "summary": row[2],
+        "previous_summary": row[3],
+        "previous_reports_covered": row[4]
+    }
+
+
+def save_running_summary(patient_id: str, report_id: str, summary: str, reports_covered: int) -> None:
+    """
+    Stores the running history summary after a report was folded into it
+
+    The summary it replaces is kept, so summarizing the same report again
+    starts from the history before that report rather than counting it twice.
+
+    Args:
+        patient_id: Patient identifier
+        report_id: Newest report the summary covers
+        summary: Updated running summary
+        reports_covered: Number of reports the summary covers
+    """
+    conn = _connect()
+    conn.isolation_level = None
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        row = conn.execute(
+            "SELECT last_report_id, reports_covered, summary, previous_summary, previous_reports_covered "
+            "FROM running_summaries WHERE patient_id = ?",
+            (patient_id,)
+        ).fetchone()
+
+        if row is None:
+            previous_summary, previous_count = None, 0
+        elif row[0] == report_id:
+            previous_summary, previous_count = row[3], row[4]
+        else:
+            previous_summary, previous_count = row[2], row[1]
+
+        conn.execute(
+            "INSERT OR REPLACE INTO running_summaries "
+            "(patient_id, last_report_id, reports_covered, summary, previous_summary, previous_reports_covered, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (patient_id, report_id, reports_covered, summary, previous_summary, previous_count, datetime.now().isoformat())
+        )
+        conn.execute("COMMIT")
+    except Exception:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
@@ -1,13 +1,12 @@
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
 import time
 import urllib.parse
 import re
+from observability.tracing import start_span
+from observability.metrics import SCRAPER_RUNS, SCRAPER_SECONDS
+from tools.cassettes import recorded
 
 
+@recorded
 def scrape_google_maps(doc_type, location):
     """
     Scrape medical professional data from Google Maps
@@ -31,7 +30,14 @@ def scrape_google_maps(doc_type, location):
         >>> print(results[0]['name'])
     """
     
+    from selenium import webdriver
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    
     driver = None
+    started = time.perf_counter()
+    step = start_span("selenium.launch", "selenium")
     
     try:
         options = webdriver.ChromeOptions()
@@ -46,14 +52,18 @@ def scrape_google_maps(doc_type, location):
         
         driver = webdriver.Chrome(options=options)
         driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        step.finish()
         
         query = f"{doc_type} in {location}"
         encoded_query = urllib.parse.quote(query)
         url = f"https://www.google.com/maps/search/{encoded_query}/"
         
+        step = start_span("selenium.load", "selenium", query=query)
         driver.get(url)
         time.sleep(5)
+        step.finish()
         
+        step = start_span("selenium.scroll", "selenium")
         try:
             time.sleep(3)
             scrollable = driver.find_element(By.CSS_SELECTOR, 'div[role="feed"]')
@@ -68,15 +78,19 @@ def scrape_google_maps(doc_type, location):
             for i in range(5):
                 driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
                 time.sleep(2)
+        step.finish()
         
         results = []
         
+        step = start_span("selenium.wait_results", "selenium")
         WebDriverWait(driver, 10).until(
             EC.presence_of_element_located((By.CSS_SELECTOR, 'a[href*="/maps/place/"]'))
         )
         
         listings = driver.find_elements(By.CSS_SELECTOR, 'a[href*="/maps/place/"]')
+        step.finish()
         
+        step = start_span("selenium.parse", "selenium", listings=len(listings))
         for listing in listings:
             try:
                 data = {
@@ -145,15 +159,21 @@ def scrape_google_maps(doc_type, location):
             except:
                 continue
         
+        step.set(results=len(results))
+        step.finish()
+        SCRAPER_RUNS.inc(outcome="success" if results else "empty")
         return results
         
     except Exception as e:
+        step.finish(error=f"{type(e).__name__}: {e}")
+        SCRAPER_RUNS.inc(outcome="error")
         print(f"Error during scraping: {e}")
         return []
         
     finally:
         if driver:
             driver.quit()
+        SCRAPER_SECONDS.observe(time.perf_counter() - started)
 
 def perform_ranking(results):
     """
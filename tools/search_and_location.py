@@ -1,11 +1,8 @@
-import requests
 import json
-from langchain_huggingface import HuggingFaceEmbeddings
-from langchain_chroma import Chroma
+from tools.vector_store import get_vector_store
+from tools.cassettes import http_get
 from langchain.docstore.document import Document
 from config.settings import (
-    CHROMA_DIR,
-    EMBEDDING_MODEL,
     SUMMARY_COLLECTION
 )
 import re
@@ -13,12 +10,12 @@ from typing import Optional
 
 def get_user_location(api_key):
     try:
-        ip_response = requests.get("https://api.ipify.org?format=json")
+        ip_response = http_get("https://api.ipify.org?format=json")
         ip_response.raise_for_status()
         ip = ip_response.json().get("ip")
 
         geo_url = f"https://api.ipgeolocation.io/ipgeo?apiKey={api_key}&ip={ip}"
-        geo_response = requests.get(geo_url)
+        geo_response = http_get(geo_url)
         geo_response.raise_for_status()
         data = geo_response.json()
 
@@ -57,12 +54,7 @@ def get_user_summaries(user_id: str) -> Optional[str]:
     print(f"🔍 Searching for user_id: '{user_id}'")
     
     try:
-        embeddings = HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL)
-        vector_store = Chroma(
-            collection_name=SUMMARY_COLLECTION,
-            embedding_function=embeddings,
-            persist_directory=str(CHROMA_DIR)
-        )
+        vector_store = get_vector_store(SUMMARY_COLLECTION)
         
         results = vector_store.get(
             where={"user_id": user_id},
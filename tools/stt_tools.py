@@ -1,17 +1,251 @@
-import whisper
-from config.settings import WHISPER_MODEL
+import math
+import time
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from config.settings import (
+    WHISPER_MODEL,
+    STT_WORKERS,
+    STT_SEGMENT_SECONDS,
+    STT_MIN_SILENCE_SECONDS,
+    STT_SILENCE_THRESHOLD
+)
+from observability.metrics import STT_AUDIO_SECONDS, STT_SECONDS
+
+
+# Whisper works on 16 kHz mono audio (whisper.audio.SAMPLE_RATE)
+SAMPLE_RATE = 16000
+
+_model = None
+_model_lock = threading.Lock()
+
+# Segment-parallel transcription: one model per worker process
+_worker_model = None
+_executor = None
+_executor_workers = 0
+_executor_lock = threading.Lock()
+
+
+def get_whisper_model():
+    """
+    Returns the process-wide Whisper model, loading it on first use
+
+    Returns:
+        Loaded Whisper model
+    """
+    global _model
+
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                import whisper
+                start = time.perf_counter()
+                _model = whisper.load_model(WHISPER_MODEL)
+                print(f"Loaded Whisper model '{WHISPER_MODEL}' in {time.perf_counter() - start:.2f}s")
+
+    return _model
+
+
+def split_on_silence(
+    audio: np.ndarray,
+    target_seconds: float = STT_SEGMENT_SECONDS,
+    min_silence_seconds: float = STT_MIN_SILENCE_SECONDS,
+    threshold: float = STT_SILENCE_THRESHOLD
+) -> list:
+    """
+    Splits audio into segments of at most `target_seconds`, cutting inside silences
+
+    Each cut is placed in the middle of the last long-enough silence in the
+    second half of the window; if there is none, the window is cut hard.
+
+    Args:
+        audio: Mono float32 samples at 16 kHz
+        target_seconds: Maximum segment length
+        min_silence_seconds: Shortest pause that counts as a boundary
+        threshold: RMS level below which a 20 ms frame is silent
+
+    Returns:
+        List of (start_sample, end_sample) tuples covering the whole clip
+    """
+    total = len(audio)
+    target = int(target_seconds * SAMPLE_RATE)
+    if total <= target:
+        return [(0, total)]
+
+    frame = int(0.02 * SAMPLE_RATE)
+    n_frames = total // frame
+    rms = np.sqrt(np.mean(audio[:n_frames * frame].reshape(n_frames, frame) ** 2, axis=1))
+    silent = np.concatenate(([False], rms < threshold, [False]))
+
+    edges = np.flatnonzero(silent[1:] != silent[:-1])
+    starts, ends = edges[::2], edges[1::2]
+    long_enough = (ends - starts) >= max(1, int(min_silence_seconds * SAMPLE_RATE / frame))
+    cut_points = ((starts[long_enough] + ends[long_enough]) // 2) * frame
+
+    segments = []
+    start = 0
+    while total - start > target:
+        lo, hi = start + target // 2, start + target
+        candidates = cut_points[(cut_points > lo) & (cut_points <= hi)]
+        cut = int(candidates[-1]) if len(candidates) else hi
+        segments.append((start, cut))
+        start = cut
+    segments.append((start, total))
+
+    return segments
+
+
+def _format_segments(result: dict, offset: float) -> list:
+    return [
+        {
+            "start": round(seg["start"] + offset, 2),
+            "end": round(seg["end"] + offset, 2),
+            "text": seg["text"].strip(),
+            "avg_logprob": seg.get("avg_logprob"),
+            "no_speech_prob": seg.get("no_speech_prob")
+        }
+        for seg in result.get("segments", [])
+    ]
+
+
+def _init_stt_worker(model_name: str):
+    """
+    Process pool initializer: loads one Whisper model per worker
+    """
+    global _worker_model
+    import whisper
+    _worker_model = whisper.load_model(model_name)
+
+
+def _transcribe_segment_task(task: tuple) -> tuple:
+    """
+    Transcribes one audio segment inside a worker process
+
+    Args:
+        task: (index, samples, offset_seconds)
+
+    Returns:
+        Tuple of (index, segments with absolute timestamps)
+    """
+    index, samples, offset = task
+    result = _worker_model.transcribe(samples, fp16=False)
+    return index, _format_segments(result, offset)
+
+
+def get_stt_executor(workers: int = STT_WORKERS) -> ProcessPoolExecutor:
+    """
+    Returns the shared transcription process pool, (re)creating it if the size changed
+
+    Args:
+        workers: Number of worker processes
+
+    Returns:
+        ProcessPoolExecutor whose workers each hold a loaded model
+    """
+    global _executor, _executor_workers
+
+    with _executor_lock:
+        if _executor is None or _executor_workers != workers:
+            if _executor is not None:
+                _executor.shutdown(wait=True)
+            _executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_stt_worker,
+                initargs=(WHISPER_MODEL,)
+            )
+            _executor_workers = workers
+        return _executor
+
+
+def shutdown_stt_workers():
+    """
+    Stops the transcription worker processes, if any were started
+    """
+    global _executor, _executor_workers
+
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+        _executor = None
+        _executor_workers = 0
+
+
+def transcribe_segments(audio_path: str, workers: int = STT_WORKERS) -> dict:
+    """
+    Transcribes an audio file, in parallel segments when it is long
+
+    Long clips are split on silences and the segments are transcribed on
+    CPU worker processes, then stitched back together in order with
+    timestamps relative to the start of the file.
+
+    Args:
+        audio_path: Path to audio file
+        workers: Number of worker processes (1 transcribes in-process)
+
+    Returns:
+        Dictionary with 'text', 'segments' and 'duration' (seconds)
+    """
+    from whisper.audio import load_audio
+
+    started = time.perf_counter()
+    audio = load_audio(audio_path)
+    duration = len(audio) / SAMPLE_RATE
+    ranges = split_on_silence(audio)
+
+    if workers > 1 and len(ranges) > 1:
+        tasks = [(i, audio[start:end], start / SAMPLE_RATE) for i, (start, end) in enumerate(ranges)]
+        results = sorted(get_stt_executor(workers).map(_transcribe_segment_task, tasks), key=lambda r: r[0])
+        segments = [seg for _, segs in results for seg in segs]
+        text = " ".join(seg["text"] for seg in segments if seg["text"])
+        print(f"Transcribed {duration:.0f}s of audio as {len(ranges)} segments on {workers} workers")
+    else:
+        result = get_whisper_model().transcribe(audio, fp16=False)
+        segments = _format_segments(result, 0.0)
+        text = result["text"].strip()
+
+    STT_AUDIO_SECONDS.inc(duration)
+    STT_SECONDS.observe(time.perf_counter() - started)
+
+    return {
+        "text": text,
+        "segments": segments,
+        "duration": duration
+    }
+
+
+def transcript_confidence(segments: list) -> float:
+    """
+    Turns Whisper's per-segment average log-probabilities into one confidence score
+    
+    Each segment contributes exp(avg_logprob), weighted by its duration.
+
+    Args:
+        segments: Segments as returned by transcribe_segments
+
+    Returns:
+        Confidence between 0.0 and 1.0 (0.0 if there are no scored segments)
+    """
+    total = 0.0
+    weighted = 0.0
+    for seg in segments:
+        if seg.get("avg_logprob") is None:
+            continue
+        length = max(seg["end"] - seg["start"], 0.01)
+        weighted += math.exp(min(seg["avg_logprob"], 0.0)) * length
+        total += length
+    return weighted / total if total else 0.0
 
 
 def transcribe(audio_path: str) -> str:
     """
     Transcribes audio file to text using Whisper
-    
+
     Args:
         audio_path: Path to audio file
-        
+
     Returns:
         Transcribed text
     """
-    model = whisper.load_model(WHISPER_MODEL)
-    result = model.transcribe(audio_path, fp16=False)
-    return result['text']
\ No newline at end of file
+    return transcribe_segments(audio_path)["text"]
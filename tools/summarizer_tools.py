@@ -1,13 +1,12 @@
+import re
 import json
 from datetime import datetime
-from langchain_huggingface import HuggingFaceEmbeddings
-from langchain_chroma import Chroma
+from tools.vector_store import get_vector_store
 from langchain.docstore.document import Document
 from config.settings import (
-    CHROMA_DIR,
-    EMBEDDING_MODEL,
     FINDINGS_COLLECTION,
-    SUMMARY_COLLECTION
+    SUMMARY_COLLECTION,
+    SUMMARY_WINDOW_REPORTS
 )
 
 
@@ -21,12 +20,7 @@ def get_all_findings(user_id: str) -> list:
     Returns:
         List of finding documents
     """
-    embeddings = HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL)
-    vector_store = Chroma(
-        collection_name=FINDINGS_COLLECTION,
-        embedding_function=embeddings,
-        persist_directory=str(CHROMA_DIR)
-    )
+    vector_store = get_vector_store(FINDINGS_COLLECTION)
     
     results = vector_store.get(
         where={"patient_id": user_id},
@@ -44,6 +38,123 @@ def get_all_findings(user_id: str) -> list:
     return docs
 
 
+def _report_sequence(report_id) -> int:
+    match = re.search(r"(\d+)$", str(report_id or ""))
+    return int(match.group(1)) if match else -1
+
+
+def _ordered_entries(vector_store, user_id: str) -> list:
+    """
+    Lists a patient's finding documents as (id, metadata), oldest report first
+    
+    A report whose findings were saved more than once (re-extraction) is
+    listed once, as its latest copy.
+    """
+    results = vector_store.get(
+        where={"patient_id": user_id},
+        include=["metadatas"]
+    )
+    
+    # Report IDs are allocated in ingest order; the sort is stable, so a
+    # report saved twice keeps its latest copy last
+    entries = sorted(
+        zip(results.get("ids", []), results.get("metadatas", [])),
+        key=lambda entry: _report_sequence((entry[1] or {}).get("report_id"))
+    )
+    
+    latest = {}
+    for index, (doc_id, metadata) in enumerate(entries):
+        latest[(metadata or {}).get("report_id") or doc_id] = index
+    return [entries[index] for index in sorted(latest.values())]
+
+
+def _fetch_findings(vector_store, selected: list) -> list:
+    """
+    Loads the finding documents of the given (id, metadata) entries, in order
+    """
+    if not selected:
+        return []
+    
+    fetched = vector_store.get(
+        ids=[doc_id for doc_id, _ in selected],
+        include=["documents"]
+    )
+    documents = dict(zip(fetched.get("ids", []), fetched.get("documents", [])))
+    
+    findings_list = []
+    for doc_id, metadata in selected:
+        try:
+            findings = json.loads(documents.get(doc_id, ""))
+        except Exception:
+            continue
+        metadata = metadata or {}
+        findings_list.append({
+            "report_id": metadata.get("report_id"),
+            "report_date": metadata.get("report_date"),
+            **findings
+        })
+    return findings_list
+
+
+def get_findings_window(user_id: str, report_id: str = None, window: int = SUMMARY_WINDOW_REPORTS) -> tuple:
+    """
+    Retrieves a report's findings and those of the few reports before it
+    
+    Only metadata is read for the patient's whole history; finding
+    documents are fetched for the window alone.
+    
+    Args:
+        user_id: Patient ID
+        report_id: Report to center on (defaults to the newest one)
+        window: Number of earlier reports to include
+        
+    Returns:
+        Tuple of (latest findings or None, list of earlier findings oldest
+        first, number of reports up to and including the latest); each
+        findings dict carries its report_id and report_date
+    """
+    vector_store = get_vector_store(FINDINGS_COLLECTION)
+    
+    entries = _ordered_entries(vector_store, user_id)
+    if not entries:
+        return None, [], 0
+    
+    position = len(entries) - 1
+    if report_id:
+        matches = [i for i, (_, metadata) in enumerate(entries) if (metadata or {}).get("report_id") == report_id]
+        position = matches[-1] if matches else position
+    
+    window_findings = _fetch_findings(vector_store, entries[max(0, position - window):position + 1])
+    if not window_findings:
+        return None, [], 0
+    
+    print(f"Retrieved {len(window_findings)} of {position + 1} finding documents for patient {user_id}")
+    return window_findings[-1], window_findings[:-1], position + 1
+
+
+def iter_findings_batches(user_id: str, start: int, end: int, batch_size: int = SUMMARY_WINDOW_REPORTS):
+    """
+    Yields the findings of a slice of the patient's reports, a batch at a time
+    
+    The report list is read once; documents are fetched per batch.
+    
+    Args:
+        user_id: Patient ID
+        start: Index of the first report (0 = the patient's oldest)
+        end: Index one past the last report
+        batch_size: Reports per batch
+        
+    Yields:
+        Lists of findings dicts, oldest first, each with its report_id and report_date
+    """
+    vector_store = get_vector_store(FINDINGS_COLLECTION)
+    entries = _ordered_entries(vector_store, user_id)[start:end]
+    batch_size = max(1, batch_size)
+    
+    for i in range(0, len(entries), batch_size):
+        yield _fetch_findings(vector_store, entries[i:i + batch_size])
+
+
 def get_recent_findings(user_id: str) -> dict:
     """
     Retrieves the most recent findings for a patient
@@ -54,12 +165,7 @@ def get_recent_findings(user_id: str) -> dict:
     Returns:
         Most recent finding document
     """
-    embeddings = HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL)
-    vector_store = Chroma(
-        collection_name=FINDINGS_COLLECTION,
-        embedding_function=embeddings,
-        persist_directory=str(CHROMA_DIR)
-    )
+    vector_store = get_vector_store(FINDINGS_COLLECTION)
     
     results = vector_store.get(
         where={"patient_id": user_id},
@@ -75,24 +181,50 @@ def get_recent_findings(user_id: str) -> dict:
     except Exception:
         return {}
     
-def store_summaries(summary: str, user_id: str):
-    embeddings = HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL)
-    vector_store = Chroma(
-        collection_name=SUMMARY_COLLECTION,
-        embedding_function=embeddings,
-        persist_directory=str(CHROMA_DIR)
-    )
+def store_summaries(summary: str, user_id: str, report_id: str = None):
+    vector_store = get_vector_store(SUMMARY_COLLECTION)
     current_date = datetime.now().strftime("%Y-%m-%d")
     current_timestamp = datetime.now().isoformat()
 
+    metadata = {
+        "user_id": user_id,
+        "date": current_date,
+        "timestamp": current_timestamp
+    }
+    if report_id:
+        metadata["report_id"] = report_id
+
     document = Document(
         page_content=summary,
-        metadata={
-            "user_id": user_id,
-            "date": current_date,
-            "timestamp": current_timestamp
-        }
+        metadata=metadata
     )
     vector_store.add_documents(documents=[document])
     print(f"✅ Saved summary for user {user_id} on {current_date}")
-    return "Summaries saved successfully"
\ No newline at end of file
+    return "Summaries saved successfully"
+
+
+def get_report_summary(report_id: str):
+    """
+    Retrieves the summary generated when a report was ingested
+    
+    Args:
+        report_id: Report identifier
+        
+    Returns:
+        Most recent summary text for that report, or None
+    """
+    vector_store = get_vector_store(SUMMARY_COLLECTION)
+    
+    results = vector_store.get(
+        where={"report_id": report_id},
+        include=["documents", "metadatas"]
+    )
+    
+    if not results.get("documents"):
+        return None
+    
+    latest = max(
+        zip(results["documents"], results["metadatas"]),
+        key=lambda x: x[1].get("timestamp", "")
+    )
+    return latest[0]
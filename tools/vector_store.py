@@ -0,0 +1,123 @@
+import threading
+from config.settings import CHROMA_DIR, EMBEDDING_MODEL, ensure_directories
+from observability.tracing import span
+from observability.metrics import CHROMA_SECONDS
+
+
+_lock = threading.Lock()
+_embeddings = None
+_stores = {}
+
+# Build counters - each model / collection client should only ever be built once
+EMBEDDING_LOADS = {}
+STORE_BUILDS = {}
+
+
+class TracedStore:
+    """
+    Wraps a Chroma store so reads and writes show up as trace spans and latency metrics
+    
+    Everything else is passed straight through to the wrapped store.
+    """
+    
+    TRACED_METHODS = ("get", "similarity_search", "similarity_search_with_score", "add_documents", "add_texts", "delete")
+    
+    def __init__(self, store, collection_name: str):
+        self._store = store
+        self.collection_name = collection_name
+    
+    def __getattr__(self, name):
+        attr = getattr(self._store, name)
+        if name not in self.TRACED_METHODS:
+            return attr
+        
+        def traced_call(*args, **kwargs):
+            with span(f"chroma.{name}", "chroma", collection=self.collection_name):
+                with CHROMA_SECONDS.time(collection=self.collection_name, operation=name):
+                    return attr(*args, **kwargs)
+        
+        return traced_call
+
+
+def get_embeddings():
+    """
+    Returns the process-wide embedding model, loading it on first use
+
+    Returns:
+        Shared HuggingFaceEmbeddings instance
+    """
+    global _embeddings
+
+    if _embeddings is None:
+        with _lock:
+            if _embeddings is None:
+                from langchain_huggingface import HuggingFaceEmbeddings
+                _embeddings = HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL)
+                EMBEDDING_LOADS[EMBEDDING_MODEL] = EMBEDDING_LOADS.get(EMBEDDING_MODEL, 0) + 1
+
+    return _embeddings
+
+
+def set_embeddings(embeddings):
+    """
+    Replaces the process-wide embedding model (e.g. with a fake for offline benchmarks)
+    
+    Must be called before the first get_vector_store(); existing collection
+    clients keep the model they were built with.
+    
+    Args:
+        embeddings: LangChain Embeddings instance
+    """
+    global _embeddings
+    
+    with _lock:
+        _embeddings = embeddings
+
+
+def get_vector_store(collection_name: str):
+    """
+    Returns the shared Chroma client for a collection, creating it on first use
+
+    Args:
+        collection_name: Name of the Chroma collection
+
+    Returns:
+        Shared Chroma vector store (wrapped in a TracedStore)
+    """
+    store = _stores.get(collection_name)
+    if store is not None:
+        return store
+
+    embeddings = get_embeddings()
+
+    with _lock:
+        store = _stores.get(collection_name)
+        if store is None:
+            from langchain_chroma import Chroma
+            ensure_directories()
+            store = TracedStore(
+                Chroma(
+                    collection_name=collection_name,
+                    embedding_function=embeddings,
+                    persist_directory=str(CHROMA_DIR)
+                ),
+                collection_name
+            )
+            _stores[collection_name] = store
+            STORE_BUILDS[collection_name] = STORE_BUILDS.get(collection_name, 0) + 1
+
+    return store
+
+
+def get_registry_stats() -> dict:
+    """
+    Returns build counters for the embedding model and collection clients
+
+    Returns:
+        Dictionary with 'embedding_loads' and 'store_builds'
+    """
+    with _lock:
+        return {
+            "embedding_loads": dict(EMBEDDING_LOADS),
+            "store_builds": dict(STORE_BUILDS)
+        }
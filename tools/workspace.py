@@ -0,0 +1,84 @@
+import shutil
+import tempfile
+from pathlib import Path
+from contextlib import contextmanager
+from contextvars import ContextVar
+from config.settings import TEMP_DIR, ensure_directories
+
+
+# Scratch directory of the job running in the current thread / context
+_current_workspace = ContextVar("job_workspace", default=None)
+
+
+@contextmanager
+def job_workspace(prefix: str = "job-"):
+    """
+    Gives the enclosed work its own scratch directory under TEMP_DIR
+    
+    The directory is removed when the block exits, whether the job
+    finished or failed. Nested calls reuse the outer workspace.
+    
+    Args:
+        prefix: Prefix for the directory name
+        
+    Yields:
+        Path to the job's scratch directory
+    """
+    existing = _current_workspace.get()
+    if existing is not None:
+        yield existing
+        return
+    
+    ensure_directories()
+    path = Path(tempfile.mkdtemp(prefix=prefix, dir=TEMP_DIR))
+    token = _current_workspace.set(path)
+    
+    try:
+        yield path
+    finally:
+        _current_workspace.reset(token)
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def current_workspace():
+    """
+    Returns the active job's scratch directory, or None outside a job
+    """
+    return _current_workspace.get()
+
+
+def scratch_dir(prefix: str = "scratch-") -> Path:
+    """
+    Returns the active job's scratch directory, or a fresh private directory
+    
+    Outside a job the caller owns the returned directory and must remove
+    it with remove_scratch_dir().
+    
+    Args:
+        prefix: Prefix for a directory created outside a job
+        
+    Returns:
+        Path to a directory no other job writes to
+    """
+    path = _current_workspace.get()
+    if path is not None:
+        return path
+    
+    ensure_directories()
+    return Path(tempfile.mkdtemp(prefix=prefix, dir=TEMP_DIR))
+
+
+def remove_scratch_dir(path: Path):
+    """
+    Removes a directory created by scratch_dir() outside a job
+    
+    Only private directories directly under TEMP_DIR are removed; the
+    active job's workspace is left to its `job_workspace()` block.
+    
+    Args:
+        path: Directory returned by scratch_dir()
+    """
+    path = Path(path).resolve()
+    if path.parent != TEMP_DIR.resolve() or path == _current_workspace.get():
+        return
+    shutil.rmtree(path, ignore_errors=True)